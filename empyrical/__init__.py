@@ -28,6 +28,8 @@ from .stats import (
     annual_volatility,
     beta,
     beta_aligned,
+    beta_matrix,
+    bootstrap,
     cagr,
     beta_fragility_heuristic,
     beta_fragility_heuristic_aligned,
@@ -36,14 +38,40 @@ from .stats import (
     calmar_ratio,
     capture,
     conditional_value_at_risk,
+    correlation_matrix,
+    cum_log_returns,
     cum_returns,
     cum_returns_final,
+    deflated_sharpe_ratio,
     down_alpha_beta,
     down_capture,
     downside_risk,
+    drawdown_periods,
+    drawdown_series,
+    ew_annual_volatility,
+    ew_beta,
+    ew_downside_risk,
+    ew_sharpe_ratio,
     excess_sharpe,
+    expanding_alpha,
+    expanding_alpha_beta,
+    expanding_annual_return,
+    expanding_annual_volatility,
+    expanding_beta,
+    expanding_cagr,
+    expanding_calmar_ratio,
+    expanding_downside_risk,
+    expanding_excess_sharpe,
+    expanding_max_drawdown,
+    expanding_sharpe_ratio,
+    expanding_sortino_ratio,
+    log_returns,
     max_drawdown,
+    multi_factor_alpha_beta,
     omega_ratio,
+    period_stats,
+    probabilistic_sharpe_ratio,
+    resample_returns,
     roll_alpha,
     roll_alpha_aligned,
     roll_alpha_beta,
@@ -54,22 +82,31 @@ from .stats import (
     roll_beta_aligned,
     roll_down_capture,
     roll_max_drawdown,
+    roll_multi_factor_beta,
+    roll_omega_ratio,
     roll_sharpe_ratio,
     roll_sortino_ratio,
     roll_up_capture,
     roll_up_down_capture,
     sharpe_ratio,
     simple_returns,
+    simulate_drawdowns,
     sortino_ratio,
     stability_of_timeseries,
     tail_ratio,
+    trailing_returns,
     up_alpha_beta,
     up_capture,
     up_down_capture,
+    up_down_stats,
     value_at_risk,
 )
 
 from .periods import (
+    MINUTELY,
+    FIVE_MINUTELY,
+    HOURLY,
+    INFER,
     DAILY,
     WEEKLY,
     MONTHLY,
@@ -77,6 +114,14 @@ from .periods import (
     YEARLY
 )
 
+from .memoize import (
+    cache,
+    ResultCache,
+)
+
+from .state import MetricsState
+
+from . import raw
 
 from .perf_attrib import (
     perf_attrib,
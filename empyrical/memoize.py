@@ -0,0 +1,268 @@
+"""Opt-in memoization of the results of the statistics."""
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from inspect import Parameter, signature
+from threading import RLock, local
+
+import numpy as np
+import pandas as pd
+
+try:
+    # fast hashing of whole buffers
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Number of elements hashed per array if xxhash is not installed.
+SAMPLE_SIZE = 1024
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_state = local()
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _checksum(array):
+    """Hash the contents of ``array``.
+
+    Without xxhash only up to ``SAMPLE_SIZE`` evenly spaced elements are
+    hashed, so in-place changes of the other elements are not detected.
+    """
+    if array.dtype == object:
+        raise _Uncacheable()
+    flat = array.reshape(-1)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(np.ascontiguousarray(flat).view('u1'))
+    step = max(len(flat) // SAMPLE_SIZE, 1)
+    sample = np.ascontiguousarray(flat[::step])
+    if len(flat):
+        sample = np.append(sample, flat[-1:])
+    return hash(sample.tobytes())
+
+
+def _fingerprint_array(array):
+    return (
+        array.__array_interface__['data'][0],
+        array.shape,
+        array.strides,
+        array.dtype.str,
+        _checksum(array),
+    )
+
+
+def _fingerprint(ob):
+    """A hashable key for an argument of a statistic."""
+    if isinstance(ob, np.ndarray):
+        return (np.ndarray, _fingerprint_array(ob))
+    elif isinstance(ob, (pd.Series, pd.DataFrame)):
+        if isinstance(ob, pd.DataFrame):
+            labels = (_fingerprint(ob.index), _fingerprint(ob.columns))
+        else:
+            labels = (_fingerprint(ob.index), ob.name)
+        return (type(ob), _fingerprint_array(ob.values), labels)
+    elif isinstance(ob, pd.RangeIndex):
+        return (type(ob), ob.start, ob.stop, ob.step)
+    elif isinstance(ob, pd.DatetimeIndex):
+        return (type(ob), str(ob.tz), _fingerprint_array(ob.asi8))
+    elif isinstance(ob, pd.Index):
+        if ob.dtype == object:
+            return (type(ob), tuple(ob))
+        return (type(ob), _fingerprint_array(ob.values))
+    try:
+        hash(ob)
+    except TypeError:
+        raise _Uncacheable()
+    return (type(ob), ob)
+
+
+def _copy(result):
+    if isinstance(result, (np.ndarray, pd.Series, pd.DataFrame)):
+        return result.copy()
+    elif isinstance(result, tuple):
+        return tuple(_copy(r) for r in result)
+    return result
+
+
+class ResultCache(object):
+    """LRU cache of the results of the statistics.
+
+    Entering the cache as a context manager makes the statistics of the
+    current thread look up their results in it, see :func:`cache`. The same
+    cache can be entered by several threads to share the results.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Number of results kept. The least recently used result is evicted
+        when it is exceeded.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = RLock()
+
+    def __enter__(self):
+        stack = getattr(_state, 'caches', None)
+        if stack is None:
+            stack = _state.caches = []
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _state.caches.pop()
+
+    def info(self):
+        """Report the statistics of the cache like ``functools.lru_cache``.
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.maxsize,
+                len(self._results),
+            )
+
+    def clear(self):
+        """Discard all results and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def lookup(self, key):
+        with self._lock:
+            try:
+                result = self._results[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def store(self, key, result):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+
+def cache(maxsize=128):
+    """Memoize the statistics within a ``with`` block.
+
+    Results are keyed by the function, a fingerprint of the input arrays (the
+    address, shape, strides and dtype of their buffer and a checksum of their
+    contents) and the other arguments. Calls with an ``out`` array, a
+    ``workspace`` or unhashable arguments are not cached, and results are
+    returned as copies.
+
+    Usage
+    -----
+    with empyrical.cache(maxsize=256) as results:
+        empyrical.sharpe_ratio(returns)
+        empyrical.sharpe_ratio(returns)  # served from the cache
+    results.info()
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Number of results kept.
+
+    Returns
+    -------
+    cache : ResultCache
+        The cache, which keeps its results after the block is left and may
+        be entered again.
+
+    Note
+    -----
+    Without the optional ``xxhash`` package only a sample of every array is
+    hashed, so an array modified in place may be served a stale result.
+    """
+    return ResultCache(maxsize)
+
+
+def _arguments(bound):
+    """The arguments of a call by name, with the keyword arguments collected
+    by ``**kwargs`` alongside the named ones.
+    """
+    arguments = {}
+    for name, value in bound.arguments.items():
+        kind = bound.signature.parameters[name].kind
+        if kind == Parameter.VAR_KEYWORD:
+            arguments.update(value)
+        else:
+            arguments[name] = value
+    return arguments
+
+
+def memoized(function):
+    """Look up the results of ``function`` in the active cache, if any.
+
+    Only the outermost statistic is cached: calls made while computing it,
+    e.g. ``max_drawdown`` within ``calmar_ratio``, are evaluated directly.
+    The arguments are bound to the signature of ``function``, so ``out``
+    and ``workspace`` are recognized however they are passed, and calls
+    which only differ in spelling out defaults share their results.
+    """
+    function_signature = signature(function)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_state, 'caches', None)
+        if not stack or getattr(_state, 'computing', False):
+            return function(*args, **kwargs)
+
+        try:
+            bound = function_signature.bind(*args, **kwargs)
+        except TypeError:
+            # Let the function report the invalid call.
+            return function(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = _arguments(bound)
+        if (arguments.get('out') is not None or
+                arguments.get('workspace') is not None):
+            return function(*args, **kwargs)
+
+        results = stack[-1]
+        try:
+            key = (
+                function,
+                tuple(
+                    (name, _fingerprint(value))
+                    for name, value in sorted(arguments.items())
+                ),
+            )
+        except _Uncacheable:
+            return function(*args, **kwargs)
+
+        try:
+            return _copy(results.lookup(key))
+        except KeyError:
+            pass
+
+        _state.computing = True
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            _state.computing = False
+        results.store(key, _copy(result))
+        return result
+    return wrapper
@@ -5,13 +5,27 @@ MONTHS_PER_YEAR = 12
 WEEKS_PER_YEAR = 52
 QTRS_PER_YEAR = 4
 
+# Trading time of an A-share session, 9:30-11:30 and 13:00-15:00.
+MINUTES_PER_SESSION = 240
+HOURS_PER_SESSION = 4
+
+MINUTELY = 'minutely'
+FIVE_MINUTELY = 'five_minutely'
+HOURLY = 'hourly'
 DAILY = 'daily'
 WEEKLY = 'weekly'
 MONTHLY = 'monthly'
 QUARTERLY = 'quarterly'
 YEARLY = 'yearly'
 
+# Infer the annualization from the DatetimeIndex of the returns, see
+# empyrical.utils.infer_annualization.
+INFER = 'infer'
+
 ANNUALIZATION_FACTORS = {
+    MINUTELY: MINUTES_PER_SESSION * APPROX_BDAYS_PER_YEAR,
+    FIVE_MINUTELY: MINUTES_PER_SESSION // 5 * APPROX_BDAYS_PER_YEAR,
+    HOURLY: HOURS_PER_SESSION * APPROX_BDAYS_PER_YEAR,
     DAILY: APPROX_BDAYS_PER_YEAR,
     WEEKLY: WEEKS_PER_YEAR,
     MONTHLY: MONTHS_PER_YEAR,
@@ -0,0 +1,900 @@
+"""Statistics on plain ndarrays, without any pandas dispatching.
+
+The functions of this module take float64 ndarrays of shape (T,) or (T, N)
+and reduce over their first axis: 1-D returns give a np.float64 and 2-D
+returns an ndarray with one value per column, or ``out`` if it is passed.
+Under ``precision('float32')`` float32 ndarrays are accepted as well, see
+:class:`precision`.
+Inputs are neither converted nor aligned, and pandas objects are not
+supported, which saves the type sniffing of the functions of
+:mod:`empyrical.stats` when they are called many times on short arrays.
+Those functions convert their inputs and wrap the results of the functions
+below.
+
+Inputs are only validated in debug mode, see :func:`debug`.
+"""
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import division
+
+import numpy as np
+
+from .periods import ANNUALIZATION_FACTORS, DAILY
+
+_debug = False
+_precision = 'float64'
+PRECISIONS = ('float64', 'float32')
+
+# Rows compounded at a time when accumulating float32 returns in float64.
+_BLOCK_ROWS = 512
+
+
+class debug(object):
+    """Validate the inputs of the functions of this module.
+
+    Validation is enabled by calling ``debug()`` and disabled by calling
+    ``debug(False)``. Used as a context manager, the previous mode is
+    restored when the block is left.
+
+    Usage
+    -----
+    with empyrical.raw.debug():
+        empyrical.raw.sharpe_ratio(returns)
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Whether to validate the inputs.
+    """
+    def __init__(self, enabled=True):
+        global _debug
+        self._previous = _debug
+        _debug = enabled
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        global _debug
+        _debug = self._previous
+
+
+class precision(object):
+    """Set the dtype in which float32 returns are evaluated.
+
+    By default (``'float64'``) all returns are converted to float64. With
+    ``'float32'``, float32 returns stay float32 end to end: the results,
+    ``out`` buffers and scratch arrays have the dtype of the returns, which
+    halves the memory of a large panel. Sums, products and compounding are
+    still accumulated in float64, so the results are about as accurate as
+    the float32 inputs. Returns of other dtypes are converted to float64.
+
+    The precision is set by calling ``precision('float32')`` and applies to
+    the functions of :mod:`empyrical.stats` as well. Used as a context
+    manager, the previous precision is restored when the block is left.
+
+    Usage
+    -----
+    with empyrical.raw.precision('float32'):
+        empyrical.max_drawdown(returns.astype('float32'))
+
+    Parameters
+    ----------
+    dtype : str, optional
+        Either 'float64' or 'float32'.
+    """
+    def __init__(self, dtype='float64'):
+        global _precision
+        dtype = np.dtype(dtype).name
+        if dtype not in PRECISIONS:
+            raise ValueError(
+                'dtype must be one of {}, got {}'.format(
+                    ', '.join(PRECISIONS), dtype,
+                ),
+            )
+        self._previous = _precision
+        _precision = dtype
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        global _precision
+        _precision = self._previous
+
+
+def _float_dtype(returns):
+    """The dtype in which ``returns`` are evaluated."""
+    if _precision == 'float64':
+        return np.dtype('float64')
+    dtype = getattr(returns, 'dtype', None)
+    if dtype is None:
+        dtype = np.asarray(returns).dtype
+    if dtype == np.float32:
+        return np.dtype('float32')
+    return np.dtype('float64')
+
+
+def _as_float(returns):
+    """``returns`` as an ndarray of the dtype they are evaluated in."""
+    return np.asarray(returns, dtype=_float_dtype(returns))
+
+
+def _check(returns, factor_returns=None, out=None):
+    for name, array in (('returns', returns),
+                        ('factor_returns', factor_returns)):
+        if array is None:
+            continue
+        if type(array) is not np.ndarray:
+            raise TypeError(
+                '{} must be a np.ndarray, got {}'.format(
+                    name, type(array).__name__,
+                ),
+            )
+        if array.dtype != _float_dtype(array):
+            raise TypeError(
+                '{} must have dtype {}, got {}'.format(
+                    name, _float_dtype(array), array.dtype,
+                ),
+            )
+    if returns.ndim < 1:
+        raise ValueError('returns must have at least one dimension')
+    if factor_returns is not None and len(factor_returns) != len(returns):
+        raise ValueError(
+            'factor_returns must have the {} periods of returns, got '
+            '{}'.format(len(returns), len(factor_returns)),
+        )
+    if out is not None and out.shape != returns.shape[1:]:
+        raise ValueError(
+            'out must have shape {}, got {}'.format(
+                returns.shape[1:], out.shape,
+            ),
+        )
+
+
+class Workspace(object):
+    """Scratch arrays reused by the statistics across calls.
+
+    The statistics of this module allocate their temporaries, e.g. the
+    cumulative returns of :func:`max_drawdown`, from the workspace passed
+    to them. Evaluating statistics repeatedly on inputs of the same shape
+    with the same workspace and ``out`` arrays allocates no arrays after the
+    first call. The workspace holds one array per temporary, which is
+    reallocated when the shape of the inputs changes. It must not be shared
+    between threads.
+    """
+    def __init__(self):
+        self._arrays = {}
+
+    def array(self, name, shape, dtype='float64'):
+        """The scratch array ``name`` with the given shape and dtype."""
+        array = self._arrays.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = self._arrays[name] = np.empty(shape, dtype)
+        return array
+
+    def clear(self):
+        """Release the scratch arrays."""
+        self._arrays.clear()
+
+
+def _scratch(workspace, name, shape, dtype='float64'):
+    if workspace is None:
+        return np.empty(shape, dtype)
+    return workspace.array(name, shape, dtype)
+
+
+def _allocate(returns, out):
+    if out is None:
+        return np.empty(returns.shape[1:], dtype=returns.dtype), True
+    return out, False
+
+
+def _missing(returns, out):
+    out, allocated = _allocate(returns, out)
+    out[()] = np.nan
+    return out[()] if allocated else out
+
+
+def _moments(values, count, valid, workspace, mean, std, ddof):
+    np.sum(values, axis=0, dtype='float64', out=mean)
+    np.divide(mean, count, out=mean)
+    if std is None:
+        return mean
+
+    residuals = _scratch(workspace, 'residuals', values.shape, values.dtype)
+    np.subtract(values, mean, out=residuals)
+    if valid is not None:
+        np.multiply(residuals, valid, out=residuals)
+    np.square(residuals, out=residuals)
+    np.sum(residuals, axis=0, dtype='float64', out=std)
+    if valid is None:
+        np.divide(std, count - ddof, out=std)
+    else:
+        np.subtract(count, ddof, out=count)
+        np.divide(std, np.maximum(count, 0, out=count), out=std)
+    np.sqrt(std, out=std)
+    return mean
+
+
+def _mean_std(arr, workspace, mean, std=None, ddof=1):
+    """Mean and standard deviation over the first axis, skipping nans.
+
+    The results are written to ``mean`` and, if passed, ``std``. Unlike
+    ``np.nanmean`` and ``np.nanstd``, the temporaries come from the
+    workspace and the nan handling is skipped without missing values, which
+    dominates the cost for short arrays.
+    """
+    missing = np.isnan(arr, out=_scratch(workspace, 'missing', arr.shape, '?'))
+    if not missing.any():
+        return _moments(arr, len(arr), None, workspace, mean, std, ddof)
+
+    values = _scratch(workspace, 'values', arr.shape, arr.dtype)
+    np.copyto(values, arr)
+    np.copyto(values, 0, where=missing)
+    valid = np.logical_not(missing, out=missing)
+    count = np.sum(valid, axis=0, out=_scratch(workspace, 'count', mean.shape))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _moments(values, count, valid, workspace, mean, std, ddof)
+
+
+def _adjusted(returns, adjustment, workspace, name):
+    """``returns - adjustment`` in the scratch array ``name``, or ``returns``
+    itself if the adjustment is 0.
+    """
+    if isinstance(adjustment, (float, int)) and adjustment == 0:
+        return returns
+    return np.subtract(
+        returns,
+        adjustment,
+        out=_scratch(workspace, name, returns.shape, returns.dtype),
+    )
+
+
+def _factor_columns(returns, factor_returns):
+    """Broadcast a single factor against every column of ``returns``."""
+    if factor_returns.ndim == 1 and returns.ndim > 1:
+        return factor_returns[:, np.newaxis]
+    return factor_returns
+
+
+def _adjust_returns(returns, adjustment_factor):
+    """
+    Returns the returns series adjusted by adjustment_factor. Optimizes for the
+    case of adjustment_factor being 0 by returning returns itself, not a copy!
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+    adjustment_factor : pd.Series or np.ndarray or float or int
+
+    Returns
+    -------
+    adjusted_returns : array-like
+    """
+    if isinstance(adjustment_factor, (float, int)) and adjustment_factor == 0:
+        return returns
+    return returns - adjustment_factor
+
+
+def annualization_factor(period, annualization):
+    """
+    Return annualization factor from period entered or if a custom
+    value is passed in.
+
+    Parameters
+    ----------
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'minutely': 60480
+            'five_minutely': 12096
+            'hourly': 1008
+            'daily': 252
+            'weekly': 52
+            'monthly':12
+            'quarterly': 4
+            'yearly': 1
+
+        The intraday periodicities assume 240 minutes of trading per session.
+        'infer' is resolved by the functions of :mod:`empyrical.stats`, which
+        see the index of the returns, see
+        :func:`~empyrical.utils.infer_annualization`.
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+
+    Returns
+    -------
+    annualization_factor : float
+    """
+    if annualization is None:
+        try:
+            factor = ANNUALIZATION_FACTORS[period]
+        except KeyError:
+            raise ValueError(
+                "Period cannot be '{}'. "
+                "Can be '{}'.".format(
+                    period, "', '".join(ANNUALIZATION_FACTORS.keys())
+                )
+            )
+    else:
+        factor = annualization
+    return factor
+
+
+def _wealth_blocks(returns, workspace):
+    """Compound ``returns`` in float64, ``_BLOCK_ROWS`` rows at a time.
+
+    Yields the first and last row of every block and the growth of 1 since
+    the first period at the rows of the block. The growth is carried over
+    between the blocks, so float32 returns are compounded in float64 without
+    converting all of them at once.
+    """
+    shape = (min(len(returns), _BLOCK_ROWS),) + returns.shape[1:]
+    block = _scratch(workspace, 'block', shape)
+    missing = _scratch(workspace, 'block_missing', shape, '?')
+    carry = _scratch(workspace, 'carry', returns.shape[1:])
+    for start in range(0, len(returns), _BLOCK_ROWS):
+        stop = min(start + _BLOCK_ROWS, len(returns))
+        wealth = block[:stop - start]
+        np.copyto(wealth, returns[start:stop])
+        np.copyto(
+            wealth,
+            0,
+            where=np.isnan(wealth, out=missing[:stop - start]),
+        )
+        wealth += 1
+        if start:
+            wealth[0] *= carry
+        np.multiply.accumulate(wealth, axis=0, out=wealth)
+        np.copyto(carry, wealth[-1])
+        yield start, stop, wealth
+
+
+def cum_returns(returns, starting_value=0, out=None, workspace=None):
+    """Cumulative returns, see :func:`empyrical.stats.cum_returns`.
+
+    ``out`` has the shape of ``returns``.
+    """
+    if _debug:
+        _check(returns)
+        if out is not None and out.shape != returns.shape:
+            raise ValueError(
+                'out must have shape {}, got {}'.format(
+                    returns.shape, out.shape,
+                ),
+            )
+
+    if out is None:
+        out = np.empty_like(returns)
+
+    if returns.dtype != np.float64:
+        for start, stop, wealth in _wealth_blocks(returns, workspace):
+            if starting_value == 0:
+                wealth -= 1
+            else:
+                wealth *= starting_value
+            np.copyto(out[start:stop], wealth)
+        return out
+
+    # Missing returns do not change the wealth. They are filled in ``out``,
+    # so the returns are never copied.
+    np.add(returns, 1, out=out)
+    np.copyto(
+        out,
+        1,
+        where=np.isnan(
+            out,
+            out=_scratch(workspace, 'missing', returns.shape, '?'),
+        ),
+    )
+    np.multiply.accumulate(out, axis=0, out=out)
+
+    if starting_value == 0:
+        np.subtract(out, 1, out=out)
+    else:
+        np.multiply(out, starting_value, out=out)
+    return out
+
+
+def cum_log_returns(returns, out=None, workspace=None):
+    """Cumulative log returns, see :func:`empyrical.stats.cum_log_returns`.
+
+    ``out`` has the shape of ``returns``.
+    """
+    if _debug:
+        _check(returns)
+        if out is not None and out.shape != returns.shape:
+            raise ValueError(
+                'out must have shape {}, got {}'.format(
+                    returns.shape, out.shape,
+                ),
+            )
+
+    if out is None:
+        out = np.empty_like(returns)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if returns.dtype != np.float64:
+            for start, stop, wealth in _wealth_blocks(returns, workspace):
+                np.log(wealth, out=out[start:stop])
+            return out
+
+        missing = np.isnan(
+            returns,
+            out=_scratch(workspace, 'missing', returns.shape, '?'),
+        )
+        np.log1p(returns, out=out)
+    np.copyto(out, 0, where=missing)
+    np.add.accumulate(out, axis=0, out=out)
+    return out
+
+
+def cum_returns_final(returns, starting_value=0, out=None, workspace=None):
+    """Total returns, see :func:`empyrical.stats.cum_returns_final`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) == 0:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    if returns.dtype != np.float64:
+        for _, _, wealth in _wealth_blocks(returns, workspace):
+            pass
+        final = wealth[-1]
+        if starting_value == 0:
+            final -= 1
+        else:
+            final *= starting_value
+        np.copyto(out, final)
+        return out[()] if allocated else out
+
+    growth = np.add(
+        returns,
+        1,
+        out=_scratch(workspace, 'growth', returns.shape),
+    )
+    # Like np.nanprod, missing returns do not change the wealth.
+    np.copyto(
+        growth,
+        1,
+        where=np.isnan(
+            growth,
+            out=_scratch(workspace, 'missing', returns.shape, '?'),
+        ),
+    )
+    np.prod(growth, axis=0, out=out)
+    if starting_value == 0:
+        out -= 1
+    else:
+        out *= starting_value
+    return out[()] if allocated else out
+
+
+def _drawdown(returns, workspace=None, final=None):
+    """Drawdown of the wealth from its running peak at every period.
+
+    The wealth starts at a peak, which is the first row of the result, so
+    the result has one row more than ``returns``. The final growth of 1 is
+    written to ``final``, if passed, before the wealth is overwritten.
+    """
+    shape = (returns.shape[0] + 1,) + returns.shape[1:]
+    cumulative = _scratch(workspace, 'cumulative', shape, returns.dtype)
+    cumulative[0] = start = 100
+    cum_returns(
+        returns,
+        starting_value=start,
+        out=cumulative[1:],
+        workspace=workspace,
+    )
+    if final is not None:
+        np.divide(cumulative[-1], start, out=final)
+
+    max_return = np.fmax.accumulate(
+        cumulative,
+        axis=0,
+        out=_scratch(workspace, 'peak', shape, returns.dtype),
+    )
+    cumulative -= max_return
+    cumulative /= max_return
+    return cumulative
+
+
+def max_drawdown(returns, out=None, workspace=None):
+    """Maximum drawdown, see :func:`empyrical.stats.max_drawdown`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 1:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    np.fmin.reduce(_drawdown(returns, workspace), axis=0, out=out)
+    return out[()] if allocated else out
+
+
+def annual_return(returns,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  workspace=None):
+    """Compound annual growth rate, see
+    :func:`empyrical.stats.annual_return`.
+    """
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 1:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    num_years = len(returns) / annualization_factor(period, annualization)
+    cum_returns_final(returns, starting_value=1, out=out, workspace=workspace)
+    np.power(out, 1 / num_years, out=out)
+    out -= 1
+    return out[()] if allocated else out
+
+
+cagr = annual_return
+
+
+def annual_volatility(returns,
+                      period=DAILY,
+                      alpha=2.0,
+                      annualization=None,
+                      out=None,
+                      workspace=None):
+    """Annual volatility, see :func:`empyrical.stats.annual_volatility`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    ann_factor = annualization_factor(period, annualization)
+    _mean_std(
+        returns,
+        workspace,
+        _scratch(workspace, 'mean', out.shape),
+        out,
+    )
+    np.multiply(out, ann_factor ** (1.0 / alpha), out=out)
+    return out[()] if allocated else out
+
+
+def calmar_ratio(returns,
+                 period=DAILY,
+                 annualization=None,
+                 out=None,
+                 workspace=None):
+    """Calmar ratio, see :func:`empyrical.stats.calmar_ratio`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 1:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    # The annual return is taken from the final wealth of the drawdowns,
+    # instead of compounding the returns a second time.
+    max_dd = np.fmin.reduce(
+        _drawdown(returns, workspace, final=out),
+        axis=0,
+        out=_scratch(workspace, 'max_drawdown', out.shape),
+    )
+    num_years = len(returns) / annualization_factor(period, annualization)
+    np.power(out, 1 / num_years, out=out)
+    out -= 1
+
+    undefined = np.greater_equal(
+        max_dd,
+        0,
+        out=_scratch(workspace, 'undefined', out.shape, '?'),
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(out, np.abs(max_dd, out=max_dd), out=out)
+    np.copyto(out, np.nan, where=undefined)
+    np.copyto(out, np.nan, where=np.isinf(out, out=undefined))
+    return out[()] if allocated else out
+
+
+def sharpe_ratio(returns,
+                 risk_free=0,
+                 period=DAILY,
+                 annualization=None,
+                 out=None,
+                 workspace=None):
+    """Sharpe ratio, see :func:`empyrical.stats.sharpe_ratio`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    returns_risk_adj = _adjusted(returns, risk_free, workspace, 'adjusted')
+    ann_factor = annualization_factor(period, annualization)
+
+    std = _scratch(workspace, 'std', out.shape)
+    _mean_std(returns_risk_adj, workspace, out, std)
+    np.divide(out, std, out=out)
+    np.multiply(out, np.sqrt(ann_factor), out=out)
+    return out[()] if allocated else out
+
+
+def downside_risk(returns,
+                  required_return=0,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  workspace=None):
+    """Downside deviation, see :func:`empyrical.stats.downside_risk`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 1:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    ann_factor = annualization_factor(period, annualization)
+
+    downside_diff = np.subtract(
+        returns,
+        required_return,
+        out=_scratch(workspace, 'downside', returns.shape, returns.dtype),
+    )
+    np.minimum(downside_diff, 0, out=downside_diff)
+    np.square(downside_diff, out=downside_diff)
+    _mean_std(downside_diff, workspace, out)
+    np.sqrt(out, out=out)
+    np.multiply(out, np.sqrt(ann_factor), out=out)
+    return out[()] if allocated else out
+
+
+def sortino_ratio(returns,
+                  required_return=0,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  workspace=None,
+                  _downside_risk=None):
+    """Sortino ratio, see :func:`empyrical.stats.sortino_ratio`."""
+    if _debug:
+        _check(returns, out=out)
+    if len(returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    adj_returns = _adjusted(returns, required_return, workspace, 'adjusted')
+    ann_factor = annualization_factor(period, annualization)
+
+    _mean_std(adj_returns, workspace, out)
+    np.multiply(out, ann_factor, out=out)
+    if _downside_risk is None:
+        _downside_risk = downside_risk(
+            returns,
+            required_return,
+            period,
+            annualization,
+            out=_scratch(workspace, 'downside_risk', out.shape),
+            workspace=workspace,
+        )
+    np.divide(out, _downside_risk, out=out)
+    return out[()] if allocated else out
+
+
+def excess_sharpe(returns, factor_returns, out=None, workspace=None):
+    """Excess Sharpe ratio, see :func:`empyrical.stats.excess_sharpe`."""
+    if _debug:
+        _check(returns, factor_returns, out=out)
+    if len(returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    active_return = np.subtract(
+        returns,
+        _factor_columns(returns, factor_returns),
+        out=_scratch(workspace, 'active', returns.shape, returns.dtype),
+    )
+    tracking_error = _scratch(workspace, 'std', out.shape)
+    _mean_std(active_return, workspace, out, tracking_error)
+    # The tracking error is missing with fewer than two observations, where
+    # the ratio is undefined rather than infinite.
+    undefined = np.isnan(
+        tracking_error,
+        out=_scratch(workspace, 'undefined', out.shape, '?'),
+    )
+    np.nan_to_num(tracking_error, copy=False)
+    np.divide(out, tracking_error, out=out)
+    np.copyto(out, np.nan, where=undefined)
+    return out[()] if allocated else out
+
+
+def beta(returns, factor_returns, risk_free=0.0, out=None, workspace=None):
+    """Beta, see :func:`empyrical.stats.beta_aligned`."""
+    if _debug:
+        _check(returns, factor_returns, out=out)
+    if len(returns) < 1 or len(factor_returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+
+    # Copy N times as a column vector and fill with nans to have the same
+    # missing value pattern as the dependent variable.
+    independent = _scratch(
+        workspace,
+        'independent',
+        returns.shape,
+        returns.dtype,
+    )
+    np.copyto(independent, _factor_columns(returns, factor_returns))
+    np.copyto(
+        independent,
+        np.nan,
+        where=np.isnan(
+            returns,
+            out=_scratch(workspace, 'missing', returns.shape, '?'),
+        ),
+    )
+
+    # Calculate beta as Cov(X, Y) / Cov(X, X).
+    # https://en.wikipedia.org/wiki/Simple_linear_regression#Fitting_the_regression_line  # noqa
+    #
+    # NOTE: The usual formula for covariance is::
+    #
+    #    mean((X - mean(X)) * (Y - mean(Y)))
+    #
+    # However, we don't actually need to take the mean of both sides of the
+    # product, because of the folllowing equivalence::
+    #
+    # Let X_res = (X - mean(X)).
+    # We have:
+    #
+    #     mean(X_res * (Y - mean(Y))) = mean(X_res * (Y - mean(Y)))
+    #                             (1) = mean((X_res * Y) - (X_res * mean(Y)))
+    #                             (2) = mean(X_res * Y) - mean(X_res * mean(Y))
+    #                             (3) = mean(X_res * Y) - mean(X_res) * mean(Y)
+    #                             (4) = mean(X_res * Y) - 0 * mean(Y)
+    #                             (5) = mean(X_res * Y)
+    #
+    #
+    # The tricky step in the above derivation is step (4). We know that
+    # mean(X_res) is zero because, for any X:
+    #
+    #     mean(X - mean(X)) = mean(X) - mean(X) = 0.
+    #
+    # The upshot of this is that we only have to center one of `independent`
+    # and `dependent` when calculating covariances. Since we need the centered
+    # `independent` to calculate its variance in the next step, we choose to
+    # center `independent`.
+
+    ind_residual = np.subtract(
+        independent,
+        _mean_std(
+            independent,
+            workspace,
+            _scratch(workspace, 'factor_mean', out.shape),
+        ),
+        out=independent,
+    )
+
+    covariances = _mean_std(
+        np.multiply(
+            ind_residual,
+            returns,
+            out=_scratch(workspace, 'product', returns.shape, returns.dtype),
+        ),
+        workspace,
+        _scratch(workspace, 'covariance', out.shape),
+    )
+
+    # We end up with different variances in each column here because each
+    # column may have a different subset of the data dropped due to missing
+    # data in the corresponding dependent column.
+    # shape: (M,)
+    np.square(ind_residual, out=ind_residual)
+    independent_variances = _mean_std(ind_residual, workspace, out)
+    np.copyto(
+        independent_variances,
+        np.nan,
+        where=np.less(
+            independent_variances,
+            1.0e-30,
+            out=_scratch(workspace, 'undefined', out.shape, '?'),
+        ),
+    )
+
+    np.divide(covariances, independent_variances, out=out)
+    return out[()] if allocated else out
+
+
+def alpha(returns,
+          factor_returns,
+          risk_free=0.0,
+          period=DAILY,
+          annualization=None,
+          out=None,
+          workspace=None,
+          _beta=None):
+    """Annualized alpha, see :func:`empyrical.stats.alpha_aligned`."""
+    if _debug:
+        _check(returns, factor_returns, out=out)
+    if len(returns) < 2:
+        return _missing(returns, out)
+
+    out, allocated = _allocate(returns, out)
+    ann_factor = annualization_factor(period, annualization)
+
+    if _beta is None:
+        _beta = beta(
+            returns,
+            factor_returns,
+            risk_free,
+            out=_scratch(workspace, 'beta', out.shape),
+            workspace=workspace,
+        )
+
+    adj_returns = _adjusted(returns, risk_free, workspace, 'adjusted')
+    adj_factor_returns = _adjusted(
+        _factor_columns(returns, factor_returns),
+        risk_free,
+        workspace,
+        'factor_adjusted',
+    )
+    alpha_series = np.multiply(
+        _beta,
+        adj_factor_returns,
+        out=_scratch(
+            workspace,
+            'alpha_series',
+            returns.shape,
+            returns.dtype,
+        ),
+    )
+    np.subtract(adj_returns, alpha_series, out=alpha_series)
+
+    _mean_std(alpha_series, workspace, out)
+    np.add(out, 1, out=out)
+    np.power(out, ann_factor, out=out)
+    np.subtract(out, 1, out=out)
+    return out[()] if allocated else out
+
+
+def alpha_beta(returns,
+               factor_returns,
+               risk_free=0.0,
+               period=DAILY,
+               annualization=None,
+               out=None,
+               workspace=None):
+    """Annualized alpha and beta, see :func:`empyrical.stats.alpha_beta`.
+
+    ``out`` has the shape ``returns.shape[1:] + (2,)``.
+    """
+    if _debug:
+        _check(returns, factor_returns)
+    if out is None:
+        out = np.empty(returns.shape[1:] + (2,), dtype=returns.dtype)
+
+    b = beta(returns, factor_returns, risk_free, out=out[..., 1],
+             workspace=workspace)
+    alpha(
+        returns,
+        factor_returns,
+        risk_free,
+        period,
+        annualization,
+        out=out[..., 0],
+        workspace=workspace,
+        _beta=b,
+    )
+    return out
@@ -0,0 +1,460 @@
+"""Running statistics which are updated as new returns arrive."""
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from .periods import DAILY, INFER
+from .stats import _infer_kwargs, annualization_factor
+
+# Running sums of every strategy, each an array of shape (N,).
+RETURNS_FIELDS = (
+    'count',  # non-missing returns
+    'mean',
+    'm2',  # sum of squared deviations from the mean
+    'downside_sq',  # sum of squared returns below the required return
+    'wealth',  # cumulative growth of 1
+    'peak',  # running maximum of the wealth, starting at 1
+    'max_drawdown',
+)
+FACTOR_FIELDS = (
+    'factor_wealth',
+    'pair_count',  # periods where neither the strategy nor the factor miss
+    'pair_mean',
+    'pair_factor_mean',
+    'pair_cross',  # sum of the products of the deviations from the means
+    'pair_factor_m2',
+    'up_count',
+    'up_wealth',
+    'up_factor_wealth',
+    'down_count',
+    'down_wealth',
+    'down_factor_wealth',
+)
+# Fields which start at 1 rather than 0.
+_WEALTH_FIELDS = (
+    'wealth',
+    'peak',
+    'factor_wealth',
+    'up_wealth',
+    'up_factor_wealth',
+    'down_wealth',
+    'down_factor_wealth',
+)
+
+STATS = (
+    'cum_returns_final',
+    'annual_return',
+    'annual_volatility',
+    'sharpe_ratio',
+    'sortino_ratio',
+    'downside_risk',
+    'max_drawdown',
+)
+FACTOR_STATS = (
+    'alpha',
+    'beta',
+    'capture',
+    'up_capture',
+    'down_capture',
+)
+
+
+def _as_rows(arr, n_columns):
+    arr = np.asarray(arr, dtype='float64')
+    if arr.ndim < 2:
+        arr = arr.reshape(-1, n_columns)
+    return arr
+
+
+def _block_mean(values, valid):
+    count = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, values, 0).sum(axis=0) / count
+    mean[count == 0] = 0
+    return count, mean
+
+
+def _merge_means(count, mean, block_count, block_mean):
+    """Combine the means of the state and of a block of new periods.
+
+    Returns the total count and mean, as well as the deviation of the block
+    mean from the previous one and ``count * block_count / total`` times that
+    deviation, from which the sums of squared deviations are merged.
+    """
+    total = count + block_count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(total > 0, block_count / total, 0)
+    delta = block_mean - mean
+    return total, mean + delta * weight, delta, delta * count * weight
+
+
+def _growth(returns):
+    """Product of ``1 + returns`` of every column, treating NaNs as 0."""
+    return np.prod(1 + np.nan_to_num(returns), axis=0)
+
+
+def _annual_return(wealth, count, ann_factor):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = wealth ** (ann_factor / count) - 1
+    result[count < 1] = np.nan
+    return result
+
+
+class MetricsState(object):
+    """Statistics of many strategies, updated as new returns are appended.
+
+    The state consists of a few running sums per strategy, which are merged
+    with those of the appended periods, so an update costs O(N) per new
+    period instead of recomputing the statistics over the whole history.
+
+    Parameters
+    ----------
+    n_columns : int
+        Number of strategies.
+    factor : bool, optional
+        Whether factor returns are passed along with the returns, which adds
+        alpha, beta and the capture ratios.
+    risk_free : float, optional
+        Constant risk-free return of the Sharpe ratio, alpha and beta.
+    required_return : float, optional
+        Minimum acceptable return of the Sortino ratio and downside risk.
+    period : str, optional
+        Defines the periodicity of the returns for purposes of annualizing.
+        Value ignored if `annualization` parameter is specified. 'infer'
+        is only supported by :meth:`from_returns`, which infers the
+        annualization from the index of the returns.
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        the returns.
+    columns : array-like, optional
+        Labels of the strategies.
+
+    Attributes
+    ----------
+    n_periods : int
+        Number of periods appended so far.
+    sums : dict[str, np.ndarray]
+        The running sums of every strategy.
+
+    Note
+    -----
+    The statistics match those of :mod:`empyrical.stats` over the whole
+    history. Alpha and beta only use the periods where neither the strategy
+    nor the factor is missing.
+    """
+    def __init__(self,
+                 n_columns,
+                 factor=False,
+                 risk_free=0.0,
+                 required_return=0.0,
+                 period=DAILY,
+                 annualization=None,
+                 columns=None):
+        if period == INFER and annualization is None:
+            raise ValueError(
+                "period='infer' requires the dates of the returns, see "
+                "MetricsState.from_returns"
+            )
+        self.ann_factor = annualization_factor(period, annualization)
+        self.risk_free = risk_free
+        self.required_return = required_return
+        self.factor = factor
+        self.columns = (
+            pd.RangeIndex(n_columns) if columns is None else pd.Index(columns)
+        )
+        self.n_periods = 0
+
+        fields = RETURNS_FIELDS + (FACTOR_FIELDS if factor else ())
+        self.sums = {
+            field: np.full(n_columns, 1.0 if field in _WEALTH_FIELDS else 0.0)
+            for field in fields
+        }
+
+    @classmethod
+    def from_returns(cls, returns, factor_returns=None, **kwargs):
+        """Build the state from the history of the returns.
+
+        Parameters
+        ----------
+        returns : pd.Series, pd.DataFrame or np.ndarray
+            Noncumulative returns of one or more strategies.
+        factor_returns : pd.Series, pd.DataFrame or np.ndarray, optional
+            Noncumulative returns of the benchmark, aligned with ``returns``.
+            A 1-D benchmark applies to all strategies.
+        **kwargs
+            Forwarded to :class:`MetricsState`. ``period='infer'`` is
+            resolved from the index of ``returns``.
+
+        Returns
+        -------
+        state : MetricsState
+        """
+        if isinstance(returns, pd.DataFrame):
+            kwargs.setdefault('columns', returns.columns)
+        elif isinstance(returns, pd.Series):
+            kwargs.setdefault('columns', [returns.name])
+
+        _infer_kwargs(returns, kwargs)
+
+        n_columns = 1 if np.ndim(returns) == 1 else np.shape(returns)[1]
+        state = cls(n_columns, factor=factor_returns is not None, **kwargs)
+        returns = _as_rows(returns, n_columns)
+        if factor_returns is not None:
+            factor_returns = _as_rows(
+                factor_returns,
+                1 if np.ndim(factor_returns) == 1 else n_columns,
+            )
+        state._update(returns, factor_returns)
+        return state
+
+    def append(self, returns, factor_returns=None):
+        """Add one or more periods to the state.
+
+        Parameters
+        ----------
+        returns : array-like
+            The returns of a new period, of shape (N,), or of several new
+            periods, of shape (k, N).
+        factor_returns : float or array-like, optional
+            The factor returns of the new periods, required if the state
+            has a factor. Either one value per period, which applies to all
+            strategies, or an array like ``returns``.
+
+        Returns
+        -------
+        stats : pd.DataFrame
+            The updated statistics, see :meth:`stats`.
+        """
+        returns = _as_rows(returns, len(self.columns))
+        if factor_returns is not None:
+            factor_returns = np.asarray(factor_returns, dtype='float64')
+            if factor_returns.shape != returns.shape:
+                factor_returns = factor_returns.reshape(len(returns), 1)
+        self._update(returns, factor_returns)
+        return self.stats()
+
+    def _update(self, returns, factor_returns):
+        if self.factor and factor_returns is None:
+            raise ValueError(
+                "factor_returns are required by a state with a factor"
+            )
+        sums = self.sums
+
+        valid = ~np.isnan(returns)
+        block_count, block_mean = _block_mean(returns, valid)
+        block_m2 = np.square(np.where(valid, returns - block_mean, 0)).sum(
+            axis=0,
+        )
+        sums['count'], sums['mean'], delta, correction = _merge_means(
+            sums['count'], sums['mean'], block_count, block_mean,
+        )
+        sums['m2'] += block_m2 + delta * correction
+
+        downside = np.where(
+            valid,
+            np.minimum(returns - self.required_return, 0),
+            0,
+        )
+        sums['downside_sq'] += np.square(downside).sum(axis=0)
+
+        if len(returns):
+            wealth = sums['wealth'] * np.cumprod(
+                1 + np.nan_to_num(returns),
+                axis=0,
+            )
+            peak = np.maximum(
+                np.maximum.accumulate(wealth, axis=0),
+                sums['peak'],
+            )
+            sums['max_drawdown'] = np.minimum(
+                sums['max_drawdown'],
+                ((wealth - peak) / peak).min(axis=0),
+            )
+            sums['wealth'] = wealth[-1]
+            sums['peak'] = peak[-1]
+
+        if self.factor:
+            self._update_factor(
+                returns,
+                np.broadcast_to(factor_returns, returns.shape),
+            )
+
+        self.n_periods += len(returns)
+
+    def _update_factor(self, returns, factor_returns):
+        sums = self.sums
+        sums['factor_wealth'] *= _growth(factor_returns)
+
+        pairs = ~(np.isnan(returns) | np.isnan(factor_returns))
+        block_count, block_mean = _block_mean(returns, pairs)
+        _, block_factor_mean = _block_mean(factor_returns, pairs)
+        deviations = np.where(pairs, returns - block_mean, 0)
+        factor_deviations = np.where(pairs, factor_returns - block_factor_mean,
+                                     0)
+
+        count = sums['pair_count']
+        _, sums['pair_mean'], delta, correction = _merge_means(
+            count, sums['pair_mean'], block_count, block_mean,
+        )
+        (sums['pair_count'], sums['pair_factor_mean'], factor_delta,
+         factor_correction) = _merge_means(
+            count, sums['pair_factor_mean'], block_count, block_factor_mean,
+        )
+        sums['pair_cross'] += (
+            (deviations * factor_deviations).sum(axis=0) +
+            delta * factor_correction
+        )
+        sums['pair_factor_m2'] += (
+            np.square(factor_deviations).sum(axis=0) +
+            factor_delta * factor_correction
+        )
+
+        for regime, periods in (('up', factor_returns > 0),
+                                ('down', factor_returns < 0)):
+            sums[regime + '_count'] += periods.sum(axis=0)
+            sums[regime + '_wealth'] *= _growth(np.where(periods, returns, 0))
+            sums[regime + '_factor_wealth'] *= _growth(
+                np.where(periods, factor_returns, 0),
+            )
+
+    def stats(self):
+        """The statistics of every strategy over all periods so far.
+
+        Returns
+        -------
+        stats : pd.DataFrame
+            One row per statistic, named like the functions of
+            :mod:`empyrical.stats`, and one column per strategy.
+        """
+        sums = self.sums
+        ann_factor = self.ann_factor
+        count = sums['count']
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(sums['m2'] / (count - 1))
+            std[count < 2] = np.nan
+            downside_risk = np.sqrt(sums['downside_sq'] / count)
+            sortino = (
+                (sums['mean'] - self.required_return) * ann_factor /
+                (downside_risk * np.sqrt(ann_factor))
+            )
+            sortino[count < 2] = np.nan
+
+            stats = {
+                'cum_returns_final': np.where(
+                    self.n_periods > 0,
+                    sums['wealth'] - 1,
+                    np.nan,
+                ),
+                'annual_return': _annual_return(
+                    sums['wealth'],
+                    np.full_like(count, self.n_periods),
+                    ann_factor,
+                ),
+                'annual_volatility': std * np.sqrt(ann_factor),
+                'sharpe_ratio': (
+                    (sums['mean'] - self.risk_free) / std *
+                    np.sqrt(ann_factor)
+                ),
+                'sortino_ratio': sortino,
+                'downside_risk': downside_risk * np.sqrt(ann_factor),
+                'max_drawdown': np.where(
+                    self.n_periods > 0,
+                    sums['max_drawdown'],
+                    np.nan,
+                ),
+            }
+
+            if self.factor:
+                n_periods = np.full_like(count, self.n_periods)
+                factor_variance = sums['pair_factor_m2'].copy()
+                factor_variance[~(factor_variance / sums['pair_count'] >=
+                                  1.0e-30)] = np.nan
+                beta = sums['pair_cross'] / factor_variance
+                alpha_mean = (
+                    sums['pair_mean'] - self.risk_free -
+                    beta * (sums['pair_factor_mean'] - self.risk_free)
+                )
+                stats['alpha'] = np.power(alpha_mean + 1, ann_factor) - 1
+                stats['beta'] = beta
+                stats['capture'] = (
+                    _annual_return(sums['wealth'], n_periods, ann_factor) /
+                    _annual_return(sums['factor_wealth'], n_periods,
+                                   ann_factor)
+                )
+                for regime in ('up', 'down'):
+                    regime_count = sums[regime + '_count']
+                    stats[regime + '_capture'] = (
+                        _annual_return(sums[regime + '_wealth'],
+                                       regime_count, ann_factor) /
+                        _annual_return(sums[regime + '_factor_wealth'],
+                                       regime_count, ann_factor)
+                    )
+
+        names = STATS + (FACTOR_STATS if self.factor else ())
+        return pd.DataFrame(
+            [stats[name] for name in names],
+            index=names,
+            columns=self.columns,
+        )
+
+    def save(self, path):
+        """Save the state to ``path`` with ``np.savez``.
+
+        Labels of the strategies are stored as strings, unless they are
+        numbers.
+        """
+        columns = np.asarray(self.columns)
+        if columns.dtype == object:
+            columns = columns.astype(str)
+        np.savez(
+            path,
+            columns=columns,
+            settings=np.array([
+                self.ann_factor,
+                self.risk_free,
+                self.required_return,
+                self.n_periods,
+                self.factor,
+            ], dtype='float64'),
+            **self.sums
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a state saved with :meth:`save`.
+
+        Returns
+        -------
+        state : MetricsState
+        """
+        with np.load(path) as saved:
+            ann_factor, risk_free, required_return, n_periods, factor = (
+                saved['settings']
+            )
+            state = cls(
+                len(saved['columns']),
+                factor=bool(factor),
+                risk_free=risk_free,
+                required_return=required_return,
+                annualization=ann_factor,
+                columns=saved['columns'],
+            )
+            state.n_periods = int(n_periods)
+            for field in state.sums:
+                state.sums[field] = saved[field]
+        return state
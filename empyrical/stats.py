@@ -15,21 +15,413 @@
 
 from __future__ import division
 
-import math
+from functools import partial
 import pandas as pd
 import numpy as np
 from math import pow
 from scipy import stats, optimize
+from scipy.linalg import LinAlgError, cho_factor, cho_solve
+from scipy.signal import lfilter
 from six import iteritems
 from sys import float_info
 
-from .utils import nanmean, nanstd, nanmin, up, down, roll, rolling_window
-from .periods import ANNUALIZATION_FACTORS, APPROX_BDAYS_PER_YEAR
-from .periods import DAILY, WEEKLY, MONTHLY, QUARTERLY, YEARLY
+from . import raw
+from .memoize import memoized
+from .raw import (
+    _adjust_returns,
+    _as_float,
+    _drawdown,
+    _float_dtype,
+    _scratch,
+    annualization_factor,
+)
+from .utils import (
+    nanmin,
+    up,
+    down,
+    roll,
+    rolling_window,
+    map_chunks,
+    parallel_columns,
+    is_time_window,
+    time_window_starts,
+    window_offset,
+    infer_annualization,
+)
+from .periods import APPROX_BDAYS_PER_YEAR
+from .periods import DAILY, WEEKLY, MONTHLY, QUARTERLY, YEARLY, INFER
+
+
+# Rough number of window-sized temporaries the vectorized statistics allocate
+# on top of the strided view, e.g. the cumulative returns, running maximum and
+# drawdowns in ``max_drawdown``. Used to turn ``max_memory`` into a chunk size.
+ROLL_TEMPORARIES = 4
+
+# Number of values of the windows of varying width copied at a time when
+# neither ``chunk_size`` nor ``max_memory`` is passed.
+ROLL_CHUNK_ELEMENTS = 2 ** 20
+
+
+def _roll_chunk_size(arrays, window, chunk_size, max_memory):
+    if chunk_size is None and max_memory is not None:
+        window_bytes = window * sum(
+            a.itemsize * int(np.prod(a.shape[1:])) for a in arrays
+        )
+        chunk_size = int(max_memory // (ROLL_TEMPORARIES * window_bytes))
+    return chunk_size
+
+
+def _vectorized_roll(function,
+                     arrays,
+                     window,
+                     out,
+                     chunk_size,
+                     max_memory,
+                     kwargs):
+    """Evaluate ``function`` on rolling windows of ``arrays`` in blocks.
+
+    Each block of ``chunk_size`` consecutive windows is restrided from the
+    inputs and written straight into its slice of ``out``, so the temporaries
+    allocated by ``function`` are bounded by the block instead of by the
+    length of the inputs.
+    """
+    n_windows = len(arrays[0]) - window + 1
+    chunk_size = _roll_chunk_size(arrays, window, chunk_size, max_memory)
+
+    if chunk_size is None or chunk_size >= n_windows:
+        return function(
+            *[rolling_window(a, window).T for a in arrays],
+            out=out,
+            **kwargs
+        )
+
+    chunk_size = max(chunk_size, 1)
+    for start in range(0, n_windows, chunk_size):
+        stop = min(start + chunk_size, n_windows)
+        views = [
+            rolling_window(a[start:stop + window - 1], window).T
+            for a in arrays
+        ]
+        if out is None:
+            block = function(*views, **kwargs)
+            out = np.empty((n_windows,) + block.shape[1:], dtype=block.dtype)
+            out[start:stop] = block
+        else:
+            function(*views, out=out[start:stop], **kwargs)
+
+    return out
+
+
+def _vectorized_bounded_roll(function,
+                             arrays,
+                             starts,
+                             out,
+                             chunk_size,
+                             max_memory,
+                             kwargs):
+    """Evaluate ``function`` on windows of varying width.
+
+    The window ending at row ``i`` covers the rows ``starts[i]`` through
+    ``i``. Each block of windows is copied out of a strided view as wide as
+    the widest window into a buffer reused across the blocks, with the rows
+    before the start of every window set to NaN, which the statistics skip
+    like any other missing value. Without ``chunk_size`` or ``max_memory``
+    the blocks hold about ``ROLL_CHUNK_ELEMENTS`` values, so the copies stay
+    bounded for long inputs. Statistics which depend on the number of
+    periods, like ``annual_return``, must be evaluated by a kernel of
+    ``_ROLLING_KERNELS`` instead.
+    """
+    n = len(arrays[0])
+    widths = np.arange(1, n + 1) - starts
+    length = int(widths.max())
+    chunk_size = _roll_chunk_size(arrays, length, chunk_size, max_memory)
+    if chunk_size is None:
+        chunk_size = ROLL_CHUNK_ELEMENTS // (length * sum(
+            int(np.prod(a.shape[1:])) for a in arrays
+        ))
+    chunk_size = min(max(chunk_size, 1), n)
+
+    padded = [
+        np.concatenate([np.full((length - 1,) + a.shape[1:], np.nan), a])
+        for a in arrays
+    ]
+    buffers = [
+        np.empty((chunk_size, length) + a.shape[1:], dtype=a.dtype)
+        for a in padded
+    ]
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        outside = (
+            np.arange(length) < (length - widths[start:stop])[:, np.newaxis]
+        )
+        views = []
+        for a, buffer in zip(padded, buffers):
+            block = buffer[:stop - start]
+            np.copyto(
+                block,
+                rolling_window(a[start:stop + length - 1], length),
+            )
+            block[outside] = np.nan
+            views.append(block.T)
+        if out is None:
+            block = function(*views, **kwargs)
+            out = np.empty((n,) + block.shape[1:], dtype=block.dtype)
+            out[start:stop] = block
+        else:
+            function(*views, out=out[start:stop], **kwargs)
+
+    return out
+
+
+def _is_window_list(window):
+    return isinstance(window, (list, tuple, np.ndarray, pd.Index))
+
+
+def _as_columns(arr, n_columns=None):
+    """View ``arr`` as a float64 array of shape (T, N).
+
+    1-D inputs become a single column, which is repeated ``n_columns`` times
+    if passed, e.g. to broadcast a benchmark against many strategies.
+    """
+    arr = np.asarray(arr, dtype='float64')
+    if arr.ndim == 1:
+        arr = arr[:, np.newaxis]
+    elif arr.ndim > 2:
+        arr = arr.reshape(len(arr), -1)
+    if n_columns is not None and arr.shape[1] != n_columns:
+        arr = np.broadcast_to(arr, (len(arr), n_columns))
+    return arr
+
+
+def _window_sums(terms, bounds):
+    """Sum each term over many windows from a single cumulative sum.
+
+    Parameters
+    ----------
+    terms : iterable[np.ndarray]
+        Arrays of shape (T, N) without NaNs.
+    bounds : list[(np.ndarray, np.ndarray)]
+        Pairs of ``(starts, ends)`` row positions, each window covering the
+        half-open range ``[start, end)``.
+
+    Returns
+    -------
+    sums : list[list[np.ndarray]]
+        For every pair of bounds, the windowed sums of every term.
+    """
+    sums = [[] for _ in bounds]
+    for term in terms:
+        prefix = np.empty((len(term) + 1,) + term.shape[1:])
+        prefix[0] = 0
+        np.cumsum(term, axis=0, out=prefix[1:])
+        for window_sums, (starts, ends) in zip(sums, bounds):
+            window_sums.append(prefix[ends] - prefix[starts])
+    return sums
+
+
+def _centered(arr, valid=None):
+    """Subtract the mean of each column and zero out missing values.
+
+    Centering keeps the cumulative sums used by the windowed kernels small,
+    which limits the cancellation when two of them are subtracted.
+    """
+    if valid is None:
+        valid = ~np.isnan(arr)
+    count = valid.sum(axis=0)
+    centered = np.where(valid, arr, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = centered.sum(axis=0) / count
+    center[count == 0] = 0
+    centered -= center
+    centered[~valid] = 0
+    return valid, centered, center
+
+
+def _sum_sq_tolerance(squares):
+    """Rounding error expected from differencing the cumulative sums of
+    ``squares``. Windowed sums of squared deviations below it are zero.
+    """
+    eps = np.finfo('float64').eps
+    return np.sqrt(len(squares)) * eps * squares.sum(axis=0)
+
+
+def _window_mean_var(count, total, total_sq, center, tolerance, ddof=1):
+    """Mean and variance of windows from their sums of centered values."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        sum_sq_dev = total_sq - total * mean
+        sum_sq_dev[sum_sq_dev < tolerance] = 0
+        var = sum_sq_dev / (count - ddof)
+    var[count <= ddof] = np.nan
+    return mean + center, var
+
+
+def _time_index(arr):
+    if isinstance(arr, (pd.Series, pd.DataFrame)):
+        return arr.index
+    raise ValueError(
+        "Time-based windows require a pd.Series or pd.DataFrame indexed "
+        "by a DatetimeIndex"
+    )
+
+
+def _annualization(returns, period, annualization):
+    """``annualization``, or the annualization inferred from the index of
+    ``returns`` if ``period`` is 'infer'.
+    """
+    if period != INFER or annualization is not None:
+        return annualization
+    return infer_annualization(getattr(returns, 'index', None))
+
+
+def _infer_kwargs(returns, kwargs):
+    """Resolve ``period='infer'`` before ``returns`` lose their index."""
+    if kwargs.get('period') == INFER:
+        kwargs['annualization'] = _annualization(
+            returns,
+            INFER,
+            kwargs.get('annualization'),
+        )
+
+
+def _roll_multiple_windows(function,
+                           arrays,
+                           windows,
+                           out,
+                           chunk_size,
+                           max_memory,
+                           kwargs,
+                           squeeze=False):
+    """Evaluate a rolling statistic for several windows at once.
+
+    Statistics registered in ``_ROLLING_KERNELS`` are computed from windowed
+    sums of a single cumulative pass, so the cost does not depend on the
+    window sizes. Other statistics are evaluated once per window.
+
+    Windows are either all a number of periods or all time spans. With
+    numbers of periods the result has one row per window end, starting at the
+    end of the shortest window, and rows for which a window does not fit into
+    the data are NaN. Time spans have a window ending at every row, which
+    covers the rows within the span. The result has one column per window,
+    unless ``squeeze`` is set for a single window.
+    """
+    windows = list(windows)
+    if not windows:
+        raise ValueError("Must pass at least one window")
+
+    values = [_flatten(a) for a in arrays]
+    n = min(len(v) for v in values)
+    time_based = is_time_window(windows[0])
+
+    if time_based:
+        index = _time_index(arrays[0])[:n]
+        n_rows = n
+        ends = np.arange(1, n + 1)
+        bounds = [(time_window_starts(index, w), ends) for w in windows]
+        first_rows = [0] * len(windows)
+    else:
+        windows = [int(w) for w in windows]
+        if min(windows) < 1:
+            raise ValueError("Window sizes must be positive")
+        n_rows = max(n - min(windows) + 1, 0)
+        ends = np.arange(n - n_rows + 1, n + 1)
+        bounds = [(np.maximum(ends - w, 0), ends) for w in windows]
+        first_rows = [max(w - min(windows), 0) for w in windows]
+
+    allocated_output = out is None
+    kernel = _ROLLING_KERNELS.get(function)
+
+    results = []
+    if n_rows and kernel is not None:
+        kwargs.pop('n_jobs', None)
+        for result, first_row in zip(
+                kernel(bounds, *[v[:n] for v in values], **kwargs),
+                first_rows):
+            if values[0].ndim == 1:
+                result = result[:, 0]
+            result[:first_row] = np.nan
+            results.append(result)
+    elif n_rows:
+        for w, (starts, _) in zip(windows, bounds):
+            if time_based:
+                result = _vectorized_bounded_roll(
+                    function,
+                    [v[:n] for v in values],
+                    starts,
+                    None,
+                    chunk_size,
+                    max_memory,
+                    kwargs,
+                )
+            elif w <= n:
+                result = _vectorized_roll(
+                    function,
+                    [v[:n] for v in values],
+                    w,
+                    None,
+                    chunk_size,
+                    max_memory,
+                    kwargs,
+                )
+            else:
+                result = None
+            results.append(result)
+
+    extra_shape = ()
+    for result in results:
+        if result is not None:
+            extra_shape = result.shape[1:]
+            break
+
+    if allocated_output:
+        out = np.empty((n_rows, len(windows)) + extra_shape)
+        if squeeze:
+            out = out[:, 0]
+    out[()] = np.nan
+    for i, result in enumerate(results):
+        if result is not None:
+            target = out if squeeze else out[:, i]
+            target[n_rows - len(result):] = result
+
+    if allocated_output and isinstance(arrays[0], pd.DataFrame):
+        # One column per window and column of the input, and per value of
+        # statistics with several values, like alpha and beta.
+        levels = [arrays[0].columns] + [range(d) for d in out.shape[3:]]
+        if not squeeze:
+            levels.insert(0, windows)
+        out = pd.DataFrame(
+            out.reshape(n_rows, -1),
+            index=arrays[0].index[n - n_rows:n],
+            columns=levels[0] if len(levels) == 1
+            else pd.MultiIndex.from_product(levels),
+        )
+    elif allocated_output and isinstance(arrays[0], pd.Series):
+        index = arrays[0].index[n - n_rows:n]
+        if out.ndim == 1:
+            out = pd.Series(out, index=index)
+        elif squeeze:
+            out = pd.DataFrame(out, index=index)
+        elif out.ndim == 2:
+            out = pd.DataFrame(out, index=index, columns=windows)
+        elif out.ndim == 3:
+            out = pd.DataFrame(
+                out.reshape(n_rows, -1),
+                index=index,
+                columns=pd.MultiIndex.from_product(
+                    [windows, range(out.shape[2])],
+                ),
+            )
+
+    return out
 
 
 def _create_unary_vectorized_roll_function(function):
-    def unary_vectorized_roll(arr, window, out=None, **kwargs):
+    def unary_vectorized_roll(arr,
+                              window,
+                              out=None,
+                              chunk_size=None,
+                              max_memory=None,
+                              **kwargs):
         """
         Computes the {human_readable} measure over a rolling window.
 
@@ -37,11 +429,23 @@ def _create_unary_vectorized_roll_function(function):
         ----------
         arr : array-like
             The array to compute the rolling {human_readable} over.
-        window : int
+        window : int, str, timedelta or list
             Size of the rolling window in terms of the periodicity of the data.
+            A time span such as '90D' or '6M' selects the periods within that
+            span before each date of a DatetimeIndex instead, see
+            :func:`~empyrical.utils.window_offset`. If a list of windows is
+            passed, the result has one column per window and all windows are
+            served from a single pass over the data where possible.
         out : array-like, optional
             Array to use as output buffer.
             If not passed, a new array will be created.
+        chunk_size : int, optional
+            Number of windows to evaluate at a time. By default all windows
+            are evaluated at once, which allocates temporaries of shape
+            ``(window, len(arr) - window + 1)``.
+        max_memory : int, optional
+            Approximate bound in bytes on the temporaries allocated per block
+            of windows. Ignored if ``chunk_size`` is passed.
         **kwargs
             Forwarded to :func:`~empyrical.{name}`.
 
@@ -50,13 +454,30 @@ def _create_unary_vectorized_roll_function(function):
         rolling_{name} : array-like
             The rolling {human_readable}.
         """
+        _infer_kwargs(arr, kwargs)
+        if _is_window_list(window) or is_time_window(window):
+            return _roll_multiple_windows(
+                function,
+                (arr,),
+                window if _is_window_list(window) else [window],
+                out,
+                chunk_size,
+                max_memory,
+                kwargs,
+                squeeze=not _is_window_list(window),
+            )
+
         allocated_output = out is None
 
         if len(arr):
-            out = function(
-                rolling_window(_flatten(arr), min(len(arr), window)).T,
-                out=out,
-                **kwargs
+            out = _vectorized_roll(
+                function,
+                (_flatten(arr),),
+                min(len(arr), window),
+                out,
+                chunk_size,
+                max_memory,
+                kwargs,
             )
         else:
             out = np.empty(0, dtype='float64')
@@ -75,7 +496,13 @@ def _create_unary_vectorized_roll_function(function):
 
 
 def _create_binary_vectorized_roll_function(function):
-    def binary_vectorized_roll(lhs, rhs, window, out=None, **kwargs):
+    def binary_vectorized_roll(lhs,
+                               rhs,
+                               window,
+                               out=None,
+                               chunk_size=None,
+                               max_memory=None,
+                               **kwargs):
         """
         Computes the {human_readable} measure over a rolling window.
 
@@ -85,11 +512,23 @@ def _create_binary_vectorized_roll_function(function):
             The first array to pass to the rolling {human_readable}.
         rhs : array-like
             The second array to pass to the rolling {human_readable}.
-        window : int
+        window : int, str, timedelta or list
             Size of the rolling window in terms of the periodicity of the data.
+            A time span such as '90D' or '6M' selects the periods within that
+            span before each date of a DatetimeIndex instead, see
+            :func:`~empyrical.utils.window_offset`. If a list of windows is
+            passed, the result has one column per window and all windows are
+            served from a single pass over the data where possible.
         out : array-like, optional
             Array to use as output buffer.
             If not passed, a new array will be created.
+        chunk_size : int, optional
+            Number of windows to evaluate at a time. By default all windows
+            are evaluated at once, which allocates temporaries of shape
+            ``(window, len(lhs) - window + 1)``.
+        max_memory : int, optional
+            Approximate bound in bytes on the temporaries allocated per block
+            of windows. Ignored if ``chunk_size`` is passed.
         **kwargs
             Forwarded to :func:`~empyrical.{name}`.
 
@@ -98,14 +537,30 @@ def _create_binary_vectorized_roll_function(function):
         rolling_{name} : array-like
             The rolling {human_readable}.
         """
+        _infer_kwargs(lhs, kwargs)
+        if _is_window_list(window) or is_time_window(window):
+            return _roll_multiple_windows(
+                function,
+                (lhs, rhs),
+                window if _is_window_list(window) else [window],
+                out,
+                chunk_size,
+                max_memory,
+                kwargs,
+                squeeze=not _is_window_list(window),
+            )
+
         allocated_output = out is None
 
         if window >= 1 and len(lhs) and len(rhs):
-            out = function(
-                rolling_window(_flatten(lhs), min(len(lhs), window)).T,
-                rolling_window(_flatten(rhs), min(len(rhs), window)).T,
-                out=out,
-                **kwargs
+            out = _vectorized_roll(
+                function,
+                (_flatten(lhs), _flatten(rhs)),
+                min(len(lhs), len(rhs), window),
+                out,
+                chunk_size,
+                max_memory,
+                kwargs,
             )
         elif allocated_output:
             out = np.empty(0, dtype='float64')
@@ -131,68 +586,59 @@ def _flatten(arr):
     return arr if not isinstance(arr, pd.Series) else arr.values
 
 
-def _adjust_returns(returns, adjustment_factor):
+def _write_out(result, out):
+    """Write ``result`` to ``out``, if passed, and return it."""
+    if out is not None:
+        out[()] = result
+    return result
+
+
+def simple_returns(prices):
     """
-    Returns the returns series adjusted by adjustment_factor. Optimizes for the
-    case of adjustment_factor being 0 by returning returns itself, not a copy!
+    Compute simple returns from a timeseries of prices.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
-    adjustment_factor : pd.Series or np.ndarray or float or int
+    prices : pd.Series, pd.DataFrame or np.ndarray
+        Prices of assets in wide-format, with assets as columns,
+        and indexed by datetimes.
 
     Returns
     -------
-    adjusted_returns : array-like
+    returns : array-like
+        Returns of assets in wide-format, with assets as columns,
+        and index coerced to be tz-aware.
     """
-    if isinstance(adjustment_factor, (float, int)) and adjustment_factor == 0:
-        return returns
-    return returns - adjustment_factor
-
+    if isinstance(prices, (pd.DataFrame, pd.Series)):
+        values = _as_float(prices.values)
+        if np.isnan(values).any() or prices.index.has_duplicates:
+            # pct_change pads missing prices.
+            return prices.pct_change().iloc[1:]
+        out = _price_returns(values)
+        if isinstance(prices, pd.DataFrame):
+            return pd.DataFrame(
+                out, index=prices.index[1:], columns=prices.columns,
+            )
+        return pd.Series(out, index=prices.index[1:], name=prices.name)
 
-def annualization_factor(period, annualization):
-    """
-    Return annualization factor from period entered or if a custom
-    value is passed in.
+    # Assume np.ndarray
+    return _price_returns(_as_float(prices))
 
-    Parameters
-    ----------
-    period : str, optional
-        Defines the periodicity of the 'returns' data for purposes of
-        annualizing. Value ignored if `annualization` parameter is specified.
-        Defaults are::
 
-            'monthly':12
-            'weekly': 52
-            'daily': 252
+def _price_returns(prices):
+    """Simple returns of a price ndarray, computed in one buffer."""
+    out = np.subtract(prices[1:], prices[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(out, prices[:-1], out=out)
+    return out
 
-    annualization : int, optional
-        Used to suppress default values available in `period` to convert
-        returns into annual returns. Value should be the annual frequency of
-        `returns`.
 
-    Returns
-    -------
-    annualization_factor : float
+def log_returns(prices):
     """
-    if annualization is None:
-        try:
-            factor = ANNUALIZATION_FACTORS[period]
-        except KeyError:
-            raise ValueError(
-                "Period cannot be '{}'. "
-                "Can be '{}'.".format(
-                    period, "', '".join(ANNUALIZATION_FACTORS.keys())
-                )
-            )
-    else:
-        factor = annualization
-    return factor
+    Compute log returns from a timeseries of prices.
 
-
-def simple_returns(prices):
-    """
-    Compute simple returns from a timeseries of prices.
+    Log returns add up over time, so the log return over several periods is
+    the sum of the log returns of the periods.
 
     Parameters
     ----------
@@ -203,20 +649,18 @@ def simple_returns(prices):
     Returns
     -------
     returns : array-like
-        Returns of assets in wide-format, with assets as columns,
-        and index coerced to be tz-aware.
+        Log returns of assets in wide-format, with assets as columns.
+        Like :func:`simple_returns`, the first period is dropped.
     """
-    if isinstance(prices, (pd.DataFrame, pd.Series)):
-        out = prices.pct_change().iloc[1:]
-    else:
-        # Assume np.ndarray
-        out = np.diff(prices, axis=0)
-        np.divide(out, prices[:-1], out=out)
-
-    return out
+    returns = simple_returns(prices)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if isinstance(returns, (pd.DataFrame, pd.Series)):
+            return np.log1p(returns)
+        return np.log1p(returns, out=returns)
 
 
-def cum_returns(returns, starting_value=0, out=None):
+@memoized
+def cum_returns(returns, starting_value=0, out=None, workspace=None):
     """
     Compute cumulative returns from simple returns.
 
@@ -240,6 +684,9 @@ def cum_returns(returns, starting_value=0, out=None):
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -249,25 +696,62 @@ def cum_returns(returns, starting_value=0, out=None):
     if len(returns) < 1:
         return returns.copy()
 
-    nanmask = np.isnan(returns)
-    if np.any(nanmask):
-        returns = returns.copy()
-        returns[nanmask] = 0
-
     allocated_output = out is None
+    out = raw.cum_returns(
+        _as_float(returns),
+        starting_value,
+        out=out,
+        workspace=workspace,
+    )
+
     if allocated_output:
-        out = np.empty_like(returns)
+        if returns.ndim == 1 and isinstance(returns, pd.Series):
+            out = pd.Series(out, index=returns.index)
+        elif isinstance(returns, pd.DataFrame):
+            out = pd.DataFrame(
+                out, index=returns.index, columns=returns.columns,
+            )
+
+    return out
 
-    np.add(returns, 1, out=out)
-    out.cumprod(axis=0, out=out)
 
-    if starting_value == 0:
-        np.subtract(out, 1, out=out)
-    else:
-        np.multiply(out, starting_value, out=out)
+@memoized
+def cum_log_returns(returns, out=None, workspace=None):
+    """
+    Compute the cumulative log returns, i.e. the log of the wealth grown
+    from 1, from simple returns.
+
+    The log wealth serves every statistic of compounded returns: the total
+    return until any period is ``np.expm1`` of it, and the drawdowns are its
+    differences from its running maximum. Missing returns are treated as 0,
+    like in :func:`cum_returns`.
+
+    Parameters
+    ----------
+    returns : pd.Series, np.ndarray, or pd.DataFrame
+        Returns of the strategy as a percentage, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
+    Returns
+    -------
+    cumulative_log_returns : array-like
+        Cumulative log returns, -inf after a return of -100% and nan after a
+        return below -100%.
+    """
+    if len(returns) < 1:
+        return returns.copy()
+
+    allocated_output = out is None
+    out = raw.cum_log_returns(_as_float(returns), out=out, workspace=workspace)
 
     if allocated_output:
-        if returns.ndim == 1 and isinstance(returns, pd.Series):
+        if isinstance(returns, pd.Series):
             out = pd.Series(out, index=returns.index)
         elif isinstance(returns, pd.DataFrame):
             out = pd.DataFrame(
@@ -277,7 +761,8 @@ def cum_returns(returns, starting_value=0, out=None):
     return out
 
 
-def cum_returns_final(returns, starting_value=0):
+@memoized
+def cum_returns_final(returns, starting_value=0, out=None, workspace=None):
     """
     Compute total returns from simple returns.
 
@@ -287,6 +772,12 @@ def cum_returns_final(returns, starting_value=0):
        Noncumulative simple returns of one or more timeseries.
     starting_value : float, optional
        The starting returns.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -298,19 +789,124 @@ def cum_returns_final(returns, starting_value=0):
         is a 1D array containing cumulative returns for each column of input.
     """
     if len(returns) == 0:
-        return np.nan
+        return _write_out(np.nan, out)
 
-    if isinstance(returns, pd.DataFrame):
-        result = (returns + 1).prod()
-    else:
-        result = np.nanprod(returns + 1, axis=0)
+    result = raw.cum_returns_final(
+        _as_float(returns),
+        starting_value,
+        out=out,
+        workspace=workspace,
+    )
+    if returns.ndim == 1:
+        result = result[()]
+    elif out is None and isinstance(returns, pd.DataFrame):
+        result = pd.Series(result, index=returns.columns)
+    return result
+
+
+# Horizons which start at the beginning of the calendar period of the date
+# at which the trailing returns are evaluated.
+_TO_DATE_HORIZONS = {
+    'WTD': 'W',
+    'MTD': 'M',
+    'QTD': 'Q',
+    'YTD': 'A',
+}
+TRAILING_HORIZONS = ('MTD', 'QTD', 'YTD', '1M', '3M', '6M', '1Y', '3Y', 'ITD')
+
+
+def _horizon_start(index, as_of, horizon):
+    """The first position of ``index`` within a trailing horizon."""
+    if isinstance(horizon, str) and horizon.upper() == 'ITD':
+        return 0
+    elif isinstance(horizon, str) and horizon.upper() in _TO_DATE_HORIZONS:
+        freq = _TO_DATE_HORIZONS[horizon.upper()]
+        start = as_of.tz_localize(None).to_period(freq).start_time
+        if as_of.tz is not None:
+            start = start.tz_localize(as_of.tz)
+        return index.searchsorted(start, side='left')
+    return index.searchsorted(as_of - window_offset(horizon), side='right')
+
+
+def trailing_returns(returns, horizons=TRAILING_HORIZONS, as_of=None):
+    """
+    Compute the cumulative returns over several trailing horizons.
 
-    if starting_value == 0:
-        result -= 1
+    Parameters
+    ----------
+    returns : pd.Series or pd.DataFrame
+        Noncumulative returns of one or more strategies, indexed by a sorted
+        DatetimeIndex.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    horizons : list, optional
+        The horizons, each either 'WTD', 'MTD', 'QTD' or 'YTD' for the
+        returns since the start of the current calendar period, 'ITD' for
+        all returns, or a time span such as '1M', '3Y' or '90D' for the
+        returns within that span before ``as_of``, see
+        :func:`~empyrical.utils.window_offset`.
+    as_of : datetime-like, optional
+        The date at which the horizons end. Defaults to the last date of
+        ``returns``.
+
+    Returns
+    -------
+    trailing_returns : pd.Series or pd.DataFrame
+        The cumulative return of every horizon, with a row per horizon and,
+        for a pd.DataFrame of returns, a column per strategy.
+
+    Note
+    -----
+    The returns of all horizons are differences of a single cumulative sum
+    of the log returns, located with ``searchsorted`` on the index. Horizons
+    which reach back before the first date cover all returns, like slicing
+    ``returns`` would.
+    """
+    index = returns.index
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("returns must be indexed by a DatetimeIndex")
+
+    horizons = list(horizons)
+    values = _as_columns(returns.values)
+    if len(index) == 0:
+        end = 0
+        starts = np.zeros(len(horizons), dtype=int)
     else:
-        result *= starting_value
+        if as_of is None:
+            as_of = index[-1]
+        else:
+            as_of = pd.Timestamp(as_of)
+            if index.tz is not None and as_of.tz is None:
+                as_of = as_of.tz_localize(index.tz)
+        end = index.searchsorted(as_of, side='right')
+        starts = np.array([
+            min(_horizon_start(index, as_of, horizon), end)
+            for horizon in horizons
+        ], dtype=int)
+
+    growth = 1 + np.nan_to_num(values)
+    # A return of -100% or less has no logarithm. It is left out of the
+    # cumulative sum, so that it does not spoil the horizons after it, and
+    # the horizons which contain it are evaluated directly.
+    total_loss = growth <= 0
+    log_wealth = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(
+        np.log(np.where(total_loss, 1, growth)),
+        axis=0,
+        out=log_wealth[1:],
+    )
+    result = np.expm1(log_wealth[end] - log_wealth[starts])
 
-    return result
+    wiped_out = np.concatenate(
+        [[0], np.cumsum(total_loss.any(axis=1))],
+    )
+    for i in np.flatnonzero(wiped_out[end] > wiped_out[starts]):
+        result[i] = np.prod(growth[starts[i]:end], axis=0) - 1
+    if not len(values):
+        result[()] = np.nan
+
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(result, index=horizons, columns=returns.columns)
+    return pd.Series(result[:, 0], index=horizons, name=returns.name)
 
 
 def aggregate_returns(returns, convert_to):
@@ -330,91 +926,282 @@ def aggregate_returns(returns, convert_to):
     aggregated_returns : pd.Series
     """
 
-    def cumulate_returns(x):
-        return cum_returns(x).iloc[-1]
-
+    index = returns.index
     if convert_to == WEEKLY:
-        grouping = [lambda x: x.year, lambda x: x.isocalendar()[1]]
+        keys = [index.year, index.isocalendar().week.values]
     elif convert_to == MONTHLY:
-        grouping = [lambda x: x.year, lambda x: x.month]
+        keys = [index.year, index.month]
     elif convert_to == QUARTERLY:
-        grouping = [lambda x: x.year, lambda x: int(math.ceil(x.month/3.))]
+        keys = [index.year, index.quarter]
     elif convert_to == YEARLY:
-        grouping = [lambda x: x.year]
+        keys = [index.year]
     else:
         raise ValueError(
             'convert_to must be {}, {} or {}'.format(WEEKLY, MONTHLY, YEARLY)
         )
 
-    return returns.groupby(grouping).apply(cumulate_returns)
+    # Sort the periods by their groups, like groupby, and compound every
+    # run of periods of the same group at once.
+    codes = np.asarray(keys[0], dtype='int64') * 100
+    if len(keys) > 1:
+        codes += np.asarray(keys[1], dtype='int64')
+    groups, inverse = np.unique(codes, return_inverse=True)
+    order = np.argsort(inverse, kind='mergesort')
+    starts = np.searchsorted(inverse[order], np.arange(len(groups)))
+    result = _compound_segments(_flatten(returns.values)[order], starts)
+
+    if len(keys) > 1:
+        labels = pd.MultiIndex.from_arrays([groups // 100, groups % 100])
+    else:
+        labels = pd.Index(groups // 100)
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(result, index=labels, columns=returns.columns)
+    return pd.Series(result, index=labels, name=returns.name)
+
+
+_PERIOD_FREQUENCIES = {
+    DAILY: 'D',
+    WEEKLY: 'W',
+    MONTHLY: 'M',
+    QUARTERLY: 'Q',
+    YEARLY: 'A',
+}
+_PERIOD_ALIASES = {
+    'day': DAILY,
+    'week': WEEKLY,
+    'month': MONTHLY,
+    'quarter': QUARTERLY,
+    'year': YEARLY,
+}
+PERIOD_STATS = (
+    'cum_returns_final',
+    'annual_return',
+    'annual_volatility',
+    'sharpe_ratio',
+    'sortino_ratio',
+    'downside_risk',
+    'max_drawdown',
+    'calmar_ratio',
+)
+
+
+_NS_PER_DAY = 24 * 60 * 60 * 10 ** 9
 
 
-def max_drawdown(returns, out=None):
+def _calendar_codes(stamps, convert_to):
+    """Number the calendar periods of nanosecond timestamps, consecutively
+    for consecutive periods. Weeks start on Monday like pandas' 'W'.
     """
-    Determines the maximum drawdown of a strategy.
+    if convert_to == DAILY:
+        return stamps // _NS_PER_DAY
+    elif convert_to == WEEKLY:
+        # 1970-01-01 was a Thursday.
+        return (stamps // _NS_PER_DAY + 3) // 7
+    elif convert_to == YEARLY:
+        return stamps.view('M8[ns]').astype('M8[Y]').view('int64')
+    months = stamps.view('M8[ns]').astype('M8[M]').view('int64')
+    if convert_to == QUARTERLY:
+        return months // 3
+    return months
 
-    Parameters
-    ----------
-    returns : pd.Series or np.ndarray
-        Daily returns of the strategy, noncumulative.
-        - See full explanation in :func:`~empyrical.stats.cum_returns`.
-    out : array-like, optional
-        Array to use as output buffer.
-        If not passed, a new array will be created.
+
+def _calendar_segments(index, by):
+    """Split a DatetimeIndex into runs of periods of the same calendar
+    day, week, month, quarter or year.
 
     Returns
     -------
-    max_drawdown : float
-
-    Note
-    -----
-    See https://en.wikipedia.org/wiki/Drawdown_(economics) for more details.
+    order : np.ndarray or None
+        Positions which sort ``index``, or None if it is already sorted.
+    starts : np.ndarray
+        The first (sorted) position of every run.
+    labels : pd.PeriodIndex
+        The calendar period of every run.
     """
-    allocated_output = out is None
-    if allocated_output:
-        out = np.empty(returns.shape[1:])
+    convert_to = _PERIOD_ALIASES.get(by, by)
+    if convert_to not in _PERIOD_FREQUENCIES:
+        raise ValueError(
+            'by must be one of {}'.format(', '.join(_PERIOD_ALIASES))
+        )
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("returns must be indexed by a DatetimeIndex")
+
+    order = None
+    if not index.is_monotonic_increasing:
+        order = np.argsort(index.asi8, kind='mergesort')
+        index = index[order]
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    codes = _calendar_codes(index.asi8, convert_to)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    return order, starts, index[starts].to_period(
+        _PERIOD_FREQUENCIES[convert_to],
+    )
 
-    returns_1d = returns.ndim == 1
 
-    if len(returns) < 1:
-        out[()] = np.nan
-        if returns_1d:
-            out = out.item()
-        return out
+def _compound_segments(returns, starts):
+    """The total return of every run of rows beginning at ``starts``.
 
-    returns_array = np.asanyarray(returns)
+    The returns are compounded by segmented sums of their ``log1p``, so all
+    runs are served by a single pass over the data. Missing returns count
+    as 0, like in :func:`cum_returns`.
+    """
+    if not len(starts):
+        return np.empty((0,) + returns.shape[1:])
+
+    log_growth = np.nan_to_num(returns, nan=0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.log1p(log_growth, out=log_growth)
+        result = np.add.reduceat(log_growth, starts, axis=0)
+    np.expm1(result, out=result)
+
+    # A return below -100% has no logarithm, so those runs are compounded
+    # directly. Missing returns were zeroed, so only they are nan.
+    ends = np.r_[starts[1:], len(returns)]
+    for position in zip(*np.nonzero(np.isnan(result))):
+        run = returns[(slice(starts[position[0]], ends[position[0]]),) +
+                      position[1:]]
+        result[position] = np.prod(1 + np.nan_to_num(run)) - 1
+    return result
 
-    cumulative = np.empty(
-        (returns.shape[0] + 1,) + returns.shape[1:],
-        dtype='float64',
-    )
-    cumulative[0] = start = 100
-    cum_returns(returns_array, starting_value=start, out=cumulative[1:])
 
-    max_return = np.fmax.accumulate(cumulative, axis=0)
+def resample_returns(returns, to=DAILY, index=None):
+    """
+    Compound returns into daily, weekly, monthly, quarterly or yearly
+    returns, e.g. to evaluate the daily statistics of minute bars.
 
-    nanmin((cumulative - max_return) / max_return, axis=0, out=out)
-    if returns_1d:
-        out = out.item()
-    elif allocated_output and isinstance(returns, pd.DataFrame):
-        out = pd.Series(out)
+    The periods are grouped by calendar day, week (Monday to Sunday), month,
+    quarter or year in the local time of the index. The groups are found
+    with one pass over the integer timestamps, and all groups of all columns
+    are compounded at once with segmented sums of ``log1p``, instead of
+    calling :func:`cum_returns` per group.
 
-    return out
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Noncumulative returns of one or more strategies, with a row per
+        period.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    to : str, optional
+        The calendar period, one of :mod:`empyrical.periods` DAILY, WEEKLY,
+        MONTHLY, QUARTERLY and YEARLY, or one of 'day', 'week', 'month',
+        'quarter' and 'year'.
+    index : pd.DatetimeIndex, optional
+        The dates of the periods of an ndarray of ``returns``. Defaults to
+        the index of pandas ``returns``.
+
+    Returns
+    -------
+    resampled_returns : pd.Series, pd.DataFrame or np.ndarray
+        The compounded return of every calendar period with returns, in
+        chronological order. pandas results are indexed by the date of the
+        last period of every calendar period.
+    """
+    if index is None:
+        if not isinstance(returns, (pd.Series, pd.DataFrame)):
+            raise ValueError("index is required for ndarray returns")
+        index = returns.index
+    if len(index) != len(returns):
+        raise ValueError(
+            'index must have the {} periods of returns, got {}'.format(
+                len(returns), len(index),
+            ),
+        )
 
+    values = np.asarray(_flatten(returns), dtype='float64')
+    if not len(index):
+        result = np.empty((0,) + values.shape[1:])
+        last = index
+    else:
+        order, starts, _ = _calendar_segments(index, to)
+        if order is not None:
+            values = values[order]
+            index = index[order]
+        result = _compound_segments(values, starts)
+        last = index[np.r_[starts[1:], len(index)] - 1]
 
-roll_max_drawdown = _create_unary_vectorized_roll_function(max_drawdown)
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(result, index=last, columns=returns.columns)
+    elif isinstance(returns, pd.Series):
+        return pd.Series(result, index=last, name=returns.name)
+    return result
 
 
-def annual_return(returns, period=DAILY, annualization=None):
+def _segmented_max_drawdown(returns, starts):
+    """The max drawdown of every run of rows beginning at ``starts``.
+
+    Running maxima of the log wealth restart at every run by adding an
+    offset per run which exceeds the range of the log wealth, so that a
+    single ``np.maximum.accumulate`` serves all runs. Returns of -100% or
+    less have no finite log, so the runs containing them are evaluated
+    directly by :func:`max_drawdown`.
     """
-    Determines the mean annual growth rate of returns. This is equivilent
-    to the compound annual growth rate.
+    total_loss = np.less_equal(returns, -1, where=~np.isnan(returns),
+                               out=np.zeros(returns.shape, dtype=bool))
+    log_wealth = np.where(total_loss, 0, returns)
+    raw.cum_log_returns(log_wealth, out=log_wealth)
+
+    segment = np.repeat(
+        np.arange(len(starts)),
+        np.diff(np.r_[starts, len(log_wealth)]),
+    )
+    # Log wealth relative to the end of the previous run.
+    previous = np.vstack([np.zeros((1,) + log_wealth.shape[1:]),
+                          log_wealth[starts[1:] - 1]])
+    log_wealth -= previous[segment]
+
+    offset = np.max(np.abs(log_wealth), axis=0) * 2 + 1
+    offset = offset * segment[:, np.newaxis]
+    log_wealth += offset
+    # Every run starts at its initial wealth, which is part of the peak.
+    # Differences are taken with the offsets, so new peaks are exactly 0.
+    peak = np.maximum(np.maximum.accumulate(log_wealth, axis=0), offset)
+    result = np.minimum.reduceat(np.expm1(log_wealth - peak), starts)
+
+    ends = np.r_[starts[1:], len(returns)]
+    for run, column in zip(*np.nonzero(
+            np.logical_or.reduceat(total_loss, starts))):
+        result[run, column] = raw.max_drawdown(
+            returns[starts[run]:ends[run], column],
+        )
+    return result
+
+
+def period_stats(returns,
+                 by=YEARLY,
+                 stats=('annual_return',
+                        'annual_volatility',
+                        'sharpe_ratio',
+                        'max_drawdown'),
+                 risk_free=0.0,
+                 required_return=0.0,
+                 period=DAILY,
+                 annualization=None):
+    """Computes statistics of every calendar year, quarter, month or week.
+
+    All periods are evaluated at once from segmented reductions over the
+    runs of returns in the same period, instead of calling the statistics
+    per group.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
-        Periodic returns of the strategy, noncumulative.
+    returns : pd.Series or pd.DataFrame
+        Daily returns of one or more strategies, noncumulative, indexed by
+        a DatetimeIndex.
         - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    by : str, optional
+        The calendar period, one of 'year', 'quarter', 'month' or 'week',
+        or the corresponding period of :mod:`empyrical.periods`.
+    stats : list[str], optional
+        Names of the statistics, which are evaluated like the function of
+        the same name. Any of 'cum_returns_final', 'annual_return',
+        'annual_volatility', 'sharpe_ratio', 'sortino_ratio',
+        'downside_risk', 'max_drawdown' and 'calmar_ratio'.
+    risk_free : int, float, optional
+        Constant risk-free return of the Sharpe ratio.
+    required_return : float, optional
+        Minimum acceptable return of the Sortino ratio and downside risk.
     period : str, optional
         Defines the periodicity of the 'returns' data for purposes of
         annualizing. Value ignored if `annualization` parameter is specified.
@@ -431,23 +1218,395 @@ def annual_return(returns, period=DAILY, annualization=None):
 
     Returns
     -------
-    annual_return : float
-        Annual Return as CAGR (Compounded Annual Growth Rate).
+    period_stats : pd.DataFrame
+        One row per calendar period and one column per statistic. For a
+        pd.DataFrame of returns, the columns are pairs of a statistic and a
+        strategy.
+    """
+    annualization = _annualization(returns, period, annualization)
+    stats = list(stats)
+    unknown = set(stats) - set(PERIOD_STATS)
+    if unknown:
+        raise ValueError(
+            'Unknown statistics: {}'.format(', '.join(sorted(unknown)))
+        )
+
+    order, starts, labels = _calendar_segments(returns.index, by)
+    values = _as_columns(returns.values)
+    if order is not None:
+        values = values[order]
+    ann_factor = annualization_factor(period, annualization)
+    lengths = np.diff(np.r_[starts, len(values)])[:, np.newaxis]
+
+    def segment_sums(*terms):
+        return [np.add.reduceat(term, starts, axis=0) for term in terms]
+
+    def mean_var(adjustment):
+        valid, centered, center = _centered(values - adjustment)
+        squares = np.square(centered)
+        count, total, total_sq = segment_sums(valid, centered, squares)
+        return _window_mean_var(
+            count, total, total_sq, center, _sum_sq_tolerance(squares),
+        )
+
+    def downside_risk_():
+        valid, _, _, downside = _downside_terms(values, required_return)
+        count, total_sq = segment_sums(valid, downside)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(total_sq / count) * np.sqrt(ann_factor)
+
+    def annual_return_():
+        wealth = np.multiply.reduceat(1 + np.nan_to_num(values), starts)
+        return wealth ** (ann_factor / lengths) - 1
+
+    max_drawdowns = []
+
+    def max_drawdown_():
+        # Computed once for the max drawdown and the Calmar ratio.
+        if not max_drawdowns:
+            max_drawdowns.append(_segmented_max_drawdown(values, starts))
+        return max_drawdowns[0]
+
+    def calmar_ratio_():
+        max_dd = max_drawdown_()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = annual_return_() / np.abs(max_dd)
+        result[~(max_dd < 0) | np.isinf(result)] = np.nan
+        return result
+
+    def sharpe_ratio_():
+        mean, var = mean_var(risk_free)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return mean / np.sqrt(var) * np.sqrt(ann_factor)
+
+    def sortino_ratio_():
+        mean, _ = mean_var(required_return)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = mean * ann_factor / downside_risk_()
+        result[np.broadcast_to(lengths < 2, result.shape)] = np.nan
+        return result
+
+    evaluate = {
+        'cum_returns_final': lambda: np.multiply.reduceat(
+            1 + np.nan_to_num(values), starts,
+        ) - 1,
+        'annual_return': annual_return_,
+        'annual_volatility': lambda: np.sqrt(mean_var(0)[1] * ann_factor),
+        'sharpe_ratio': sharpe_ratio_,
+        'sortino_ratio': sortino_ratio_,
+        'downside_risk': downside_risk_,
+        'max_drawdown': max_drawdown_,
+        'calmar_ratio': calmar_ratio_,
+    }
+    results = [evaluate[name]() for name in stats]
+    results = np.hstack(results) if results else np.empty((len(starts), 0))
+
+    if isinstance(returns, pd.DataFrame):
+        columns = pd.MultiIndex.from_product([stats, returns.columns])
+    else:
+        columns = stats
+    return pd.DataFrame(results, index=labels, columns=columns)
+
+
+@memoized
+def max_drawdown(returns, out=None, n_jobs=1, workspace=None):
+    """
+    Determines the maximum drawdown of a strategy.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Daily returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
+    Returns
+    -------
+    max_drawdown : float
 
+    Note
+    -----
+    See https://en.wikipedia.org/wiki/Drawdown_(economics) for more details.
     """
+    allocated_output = out is None
+    if allocated_output:
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
+
+    returns_1d = returns.ndim == 1
 
     if len(returns) < 1:
-        return np.nan
+        out[()] = np.nan
+        if returns_1d:
+            out = out.item()
+        return out
 
-    ann_factor = annualization_factor(period, annualization)
-    num_years = len(returns) / ann_factor
-    # Pass array to ensure index -1 looks up successfully.
-    ending_value = cum_returns_final(returns, starting_value=1)
+    if n_jobs != 1 and not returns_1d:
+        parallel_columns(max_drawdown, out, n_jobs, returns)
+    else:
+        raw.max_drawdown(
+            _as_float(returns),
+            out=out,
+            workspace=workspace,
+        )
+
+    if returns_1d:
+        out = out.item()
+    elif allocated_output and isinstance(returns, pd.DataFrame):
+        out = pd.Series(out)
+
+    return out
+
+
+roll_max_drawdown = _create_unary_vectorized_roll_function(max_drawdown)
+
+
+def drawdown_series(returns, out=None):
+    """
+    Determines the drawdown of a strategy from its running peak at every
+    period, i.e. the underwater curve.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    drawdown : array-like
+        The drawdown at every period, which is 0 at new highs and negative
+        otherwise, indexed like ``returns``. Its minimum is
+        :func:`~empyrical.stats.max_drawdown`.
+    """
+    drawdown = _drawdown(_as_float(returns))[1:]
+
+    if out is not None:
+        out[()] = drawdown
+        return out
+
+    if isinstance(returns, pd.Series):
+        return pd.Series(drawdown, index=returns.index, name=returns.name)
+    elif isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(
+            drawdown,
+            index=returns.index,
+            columns=returns.columns,
+        )
+    return drawdown
+
+
+DRAWDOWN_PERIOD_DTYPE = np.dtype([
+    ('column', 'int64'),
+    ('peak', 'int64'),
+    ('valley', 'int64'),
+    ('recovery', 'int64'),
+    ('depth', 'float64'),
+    ('duration', 'int64'),
+])
+
+
+def _drawdown_periods(drawdown):
+    """Locate the episodes below the running peak of every column.
+
+    Parameters
+    ----------
+    drawdown : np.ndarray
+        The (T + 1, N) drawdown of ``_drawdown``, which starts at a peak.
+
+    Returns
+    -------
+    periods : np.ndarray[DRAWDOWN_PERIOD_DTYPE]
+        One record per episode, ordered by column and time. Positions refer
+        to the rows of the returns; a peak of -1 is the initial wealth, and
+        a recovery of -1 means the episode lasts until the last period.
+    """
+    n_rows, n_columns = drawdown.shape
+    width = n_rows + 1
+    # Lay the columns out one after another, each followed by a new high,
+    # so that every episode closes within its column.
+    flat = np.zeros((n_columns, width))
+    flat[:, :n_rows] = drawdown.T
+    flat = flat.ravel()
+
+    underwater = (flat < 0).view('int8')
+    changes = np.diff(underwater)
+    starts = np.flatnonzero(changes == 1) + 1
+    ends = np.flatnonzero(changes == -1) + 1
+
+    periods = np.empty(len(starts), dtype=DRAWDOWN_PERIOD_DTYPE)
+    if not len(starts):
+        return periods
+
+    column, start = np.divmod(starts, width)
+    end = ends - column * width
+
+    depth = np.minimum.reduceat(
+        flat,
+        np.column_stack([starts, ends]).ravel(),
+    )[::2]
+    # The first position of every episode at which its depth is attained.
+    episode = np.cumsum(np.r_[0, changes] == 1) - 1
+    at_depth = np.flatnonzero(underwater.astype(bool) &
+                              (flat == depth[episode]))
+    _, first = np.unique(episode[at_depth], return_index=True)
+    valley = at_depth[first] - column * width
+
+    recovered = end < n_rows
+    periods['column'] = column
+    periods['peak'] = start - 2
+    periods['valley'] = valley - 1
+    periods['recovery'] = np.where(recovered, end - 1, -1)
+    periods['depth'] = depth
+    periods['duration'] = np.where(recovered, end, n_rows) - start
+    return periods
+
+
+def drawdown_periods(returns, top=None):
+    """
+    Finds the drawdown episodes of one or more strategies.
+
+    An episode starts at a peak of the wealth, reaches its deepest point at
+    the valley and ends when the wealth recovers to the peak.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    top : int, optional
+        Number of deepest episodes kept per strategy. By default all
+        episodes are returned.
+
+    Returns
+    -------
+    drawdown_periods : np.ndarray or pd.DataFrame
+        One record per episode, ordered by strategy and then depth, with the
+        fields
+
+        - column: the position of the strategy.
+        - peak, valley, recovery: positions of the last period at the peak,
+          of the deepest period and of the first period back at the peak. A
+          peak of -1 is the initial wealth before the first period and a
+          recovery of -1 marks an episode which has not recovered.
+        - depth: the drawdown at the valley, see
+          :func:`~empyrical.stats.max_drawdown`.
+        - duration: number of periods below the peak, i.e. strictly between
+          the peak and the recovery (``recovery - peak - 1``), or from the
+          first period below the peak through the last period if it has not
+          recovered.
+
+        For pandas inputs, a pd.DataFrame with the dates of the peak, valley
+        and recovery (NaT for -1) and, for a pd.DataFrame, the label of the
+        strategy instead of its position.
+    """
+    values = np.asanyarray(returns, dtype='float64')
+    drawdown = _drawdown(_as_columns(values))
+    periods = _drawdown_periods(drawdown)
+
+    order = np.lexsort((periods['depth'], periods['column']))
+    periods = periods[order]
+    if top is not None:
+        columns = periods['column']
+        first = np.searchsorted(columns, columns, side='left')
+        periods = periods[np.arange(len(periods)) - first < top]
+
+    if not isinstance(returns, (pd.Series, pd.DataFrame)):
+        return periods
+
+    index = returns.index
+    result = pd.DataFrame({'duration': periods['duration']})
+    for field in ('peak', 'valley', 'recovery'):
+        positions = periods[field]
+        dates = index[np.maximum(positions, 0)] if len(index) else index
+        result[field] = pd.Series(dates).where(positions >= 0)
+    result['depth'] = periods['depth']
+    result = result[['peak', 'valley', 'recovery', 'depth', 'duration']]
+    if isinstance(returns, pd.DataFrame):
+        result.insert(0, 'column', returns.columns[periods['column']])
+    return result
+
+
+@memoized
+def annual_return(returns,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  workspace=None):
+    """
+    Determines the mean annual growth rate of returns. This is equivilent
+    to the compound annual growth rate.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Periodic returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
+    Returns
+    -------
+    annual_return : float
+        Annual Return as CAGR (Compounded Annual Growth Rate).
+
+    """
+    annualization = _annualization(returns, period, annualization)
+    allocated_output = out is None
+    if allocated_output:
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
+
+    returns_1d = returns.ndim == 1
 
-    return ending_value ** (1 / num_years) - 1
+    if len(returns) < 1:
+        out[()] = np.nan
+        if returns_1d:
+            out = out.item()
+        return out
+
+    raw.annual_return(
+        _as_float(returns),
+        period,
+        annualization,
+        out=out,
+        workspace=workspace,
+    )
+    if returns_1d:
+        out = out.item()
+    elif allocated_output and isinstance(returns, pd.DataFrame):
+        out = pd.Series(out, index=returns.columns)
+    return out
 
 
-def cagr(returns, period=DAILY, annualization=None):
+@memoized
+def cagr(returns, period=DAILY, annualization=None, out=None, workspace=None):
     """
     Compute compound annual growth rate. Alias function for
     :func:`~empyrical.stats.annual_return`
@@ -471,6 +1630,12 @@ def cagr(returns, period=DAILY, annualization=None):
         returns into annual returns. Value should be the annual frequency of
         `returns`.
         - See full explanation in :func:`~empyrical.stats.annual_return`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -478,17 +1643,20 @@ def cagr(returns, period=DAILY, annualization=None):
         The CAGR value.
 
     """
-    return annual_return(returns, period, annualization)
+    return annual_return(returns, period, annualization, out, workspace)
 
 
 roll_cagr = _create_unary_vectorized_roll_function(cagr)
 
 
+@memoized
 def annual_volatility(returns,
                       period=DAILY,
                       alpha=2.0,
                       annualization=None,
-                      out=None):
+                      out=None,
+                      n_jobs=1,
+                      workspace=None):
     """
     Determines the annual volatility of a strategy.
 
@@ -515,14 +1683,21 @@ def annual_volatility(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
     annual_volatility : float
     """
+    annualization = _annualization(returns, period, annualization)
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:])
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     returns_1d = returns.ndim == 1
 
@@ -532,9 +1707,20 @@ def annual_volatility(returns,
             out = out.item()
         return out
 
-    ann_factor = annualization_factor(period, annualization)
-    nanstd(returns, ddof=1, axis=0, out=out)
-    out = np.multiply(out, ann_factor ** (1.0 / alpha), out=out)
+    if n_jobs != 1 and not returns_1d:
+        return parallel_columns(
+            annual_volatility, out, n_jobs, returns,
+            period=period, alpha=alpha, annualization=annualization,
+        )
+
+    raw.annual_volatility(
+        _as_float(returns),
+        period,
+        alpha,
+        annualization,
+        out=out,
+        workspace=workspace,
+    )
     if returns_1d:
         out = out.item()
     return out
@@ -545,7 +1731,12 @@ roll_annual_volatility = _create_unary_vectorized_roll_function(
 )
 
 
-def calmar_ratio(returns, period=DAILY, annualization=None):
+@memoized
+def calmar_ratio(returns,
+                 period=DAILY,
+                 annualization=None,
+                 out=None,
+                 workspace=None):
     """
     Determines the Calmar ratio, or drawdown ratio, of a strategy.
 
@@ -567,7 +1758,12 @@ def calmar_ratio(returns, period=DAILY, annualization=None):
         Used to suppress default values available in `period` to convert
         returns into annual returns. Value should be the annual frequency of
         `returns`.
-
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -579,34 +1775,46 @@ def calmar_ratio(returns, period=DAILY, annualization=None):
     -----
     See https://en.wikipedia.org/wiki/Calmar_ratio for more details.
     """
+    annualization = _annualization(returns, period, annualization)
+    allocated_output = out is None
+    if allocated_output:
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
-    max_dd = max_drawdown(returns=returns)
-    if max_dd < 0:
-        temp = annual_return(
-            returns=returns,
-            period=period,
-            annualization=annualization
-        ) / abs(max_dd)
-    else:
-        return np.nan
+    returns_1d = returns.ndim == 1
 
-    if np.isinf(temp):
-        return np.nan
+    if len(returns) < 1:
+        out[()] = np.nan
+        if returns_1d:
+            out = out.item()
+        return out
 
-    return temp
+    raw.calmar_ratio(
+        _as_float(returns),
+        period,
+        annualization,
+        out=out,
+        workspace=workspace,
+    )
+    if returns_1d:
+        out = out.item()
+    elif allocated_output and isinstance(returns, pd.DataFrame):
+        out = pd.Series(out, index=returns.columns)
+    return out
 
 
+@memoized
 def omega_ratio(returns, risk_free=0.0, required_return=0.0,
-                annualization=APPROX_BDAYS_PER_YEAR):
+                annualization=APPROX_BDAYS_PER_YEAR, out=None, workspace=None):
     """Determines the Omega ratio of a strategy.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
+    returns : pd.Series, pd.DataFrame or np.ndarray
         Daily returns of the strategy, noncumulative.
         - See full explanation in :func:`~empyrical.stats.cum_returns`.
-    risk_free : int, float
-        Constant risk-free return throughout the period
+    risk_free : int, float or array-like
+        Risk-free return, either constant throughout the period or one per
+        period of ``returns``.
     required_return : float, optional
         Minimum acceptance return of the investor. Threshold over which to
         consider positive vs negative returns. It will be converted to a
@@ -616,44 +1824,144 @@ def omega_ratio(returns, risk_free=0.0, required_return=0.0,
     annualization : int, optional
         Factor used to convert the required_return into a daily
         value. Enter 1 if no time period conversion is necessary.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
-    omega_ratio : float
+    omega_ratio : float, np.ndarray or pd.Series
+        For 2-D returns, the Omega ratio of every column.
 
     Note
     -----
     See https://en.wikipedia.org/wiki/Omega_ratio for more details.
 
     """
+    values = np.asarray(returns, dtype='float64')
+
+    if len(values) < 2:
+        result = np.full(values.shape[1:], np.nan)
+    else:
+        returns_less_thresh = np.subtract(
+            values,
+            _column_aligned(risk_free, values.ndim),
+            out=_scratch(workspace, 'adjusted', values.shape),
+        )
+        returns_less_thresh -= _omega_threshold(
+            required_return,
+            annualization,
+        )
+
+        # fmax and fmin skip the missing returns like the comparisons did.
+        numer = np.fmax(
+            returns_less_thresh,
+            0.0,
+            out=_scratch(workspace, 'gains', values.shape),
+        ).sum(axis=0)
+        denom = -np.fmin(
+            returns_less_thresh,
+            0.0,
+            out=returns_less_thresh,
+        ).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(denom > 0.0, numer / denom, np.nan)
+
+    return _column_result(returns, result, out)
+
+
+def _column_result(returns, result, out):
+    """Wrap a statistic of every column of ``returns`` like the input: a
+    scalar for 1-D returns, a Series for a DataFrame, else an ndarray or
+    ``out``.
+    """
+    if result.ndim == 0:
+        return _write_out(result[()], out)
+    elif out is not None:
+        out[()] = result
+        return out
+    elif isinstance(returns, pd.DataFrame):
+        return pd.Series(result, index=returns.columns)
+    return result
 
-    if len(returns) < 2:
-        return np.nan
 
+def _omega_threshold(required_return, annualization):
+    """The threshold of the Omega ratio per period, NaN if undefined."""
     if annualization == 1:
-        return_threshold = required_return
+        return required_return
     elif required_return <= -1:
         return np.nan
-    else:
-        return_threshold = (1 + required_return) ** \
-            (1. / annualization) - 1
+    return (1 + required_return) ** (1. / annualization) - 1
+
+
+def _column_aligned(arr, ndim):
+    """``arr`` with one row per period, broadcastable against returns of
+    ``ndim`` dimensions."""
+    arr = np.asarray(_flatten(arr), dtype='float64')
+    if arr.ndim == 1 and ndim == 2:
+        return arr[:, np.newaxis]
+    return arr
+
 
-    returns_less_thresh = returns - risk_free - return_threshold
+def roll_omega_ratio(returns, window, out=None, **kwargs):
+    """
+    Computes the Omega ratio over a rolling window.
+
+    The gains and losses over the threshold are summed over every window
+    from a single cumulative sum of each, so the cost does not depend on
+    the size of the window.
 
-    numer = sum(returns_less_thresh[returns_less_thresh > 0.0])
-    denom = -1.0 * sum(returns_less_thresh[returns_less_thresh < 0.0])
+    Parameters
+    ----------
+    returns : array-like
+        Daily returns of one or more strategies, noncumulative.
+    window : int, str, timedelta or list
+        Size of the rolling window in terms of the periodicity of the data.
+        A time span such as '90D' or '6M' selects the periods within that
+        span before each date of a DatetimeIndex instead, see
+        :func:`~empyrical.utils.window_offset`. If a list of windows is
+        passed, the result has one column per window.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    **kwargs
+        Forwarded to :func:`~empyrical.omega_ratio`, e.g. a ``risk_free``
+        return per period of ``returns``.
 
-    if denom > 0.0:
-        return numer / denom
+    Returns
+    -------
+    rolling_omega_ratio : array-like
+        The rolling Omega ratio.
+    """
+    if _is_window_list(window):
+        windows = window
+    elif is_time_window(window) or not len(returns):
+        windows = [window]
     else:
-        return np.nan
+        windows = [min(len(returns), window)]
+    return _roll_multiple_windows(
+        omega_ratio,
+        (returns,),
+        windows,
+        out,
+        None,
+        None,
+        kwargs,
+        squeeze=not _is_window_list(window),
+    )
 
 
+@memoized
 def sharpe_ratio(returns,
                  risk_free=0,
                  period=DAILY,
                  annualization=None,
-                 out=None):
+                 out=None,
+                 n_jobs=1,
+                 workspace=None):
     """
     Determines the Sharpe ratio of a strategy.
 
@@ -680,6 +1988,12 @@ def sharpe_ratio(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -691,9 +2005,10 @@ def sharpe_ratio(returns,
     See https://en.wikipedia.org/wiki/Sharpe_ratio for more details.
 
     """
+    annualization = _annualization(returns, period, annualization)
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:])
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     return_1d = returns.ndim == 1
 
@@ -703,17 +2018,19 @@ def sharpe_ratio(returns,
             out = out.item()
         return out
 
-    returns_risk_adj = np.asanyarray(_adjust_returns(returns, risk_free))
-    ann_factor = annualization_factor(period, annualization)
+    if n_jobs != 1 and not return_1d:
+        return parallel_columns(
+            sharpe_ratio, out, n_jobs, returns,
+            risk_free=risk_free, period=period, annualization=annualization,
+        )
 
-    np.multiply(
-        np.divide(
-            nanmean(returns_risk_adj, axis=0),
-            nanstd(returns_risk_adj, ddof=1, axis=0),
-            out=out,
-        ),
-        np.sqrt(ann_factor),
+    raw.sharpe_ratio(
+        _as_float(returns),
+        _flatten(risk_free),
+        period,
+        annualization,
         out=out,
+        workspace=workspace,
     )
     if return_1d:
         out = out.item()
@@ -724,30 +2041,257 @@ def sharpe_ratio(returns,
 roll_sharpe_ratio = _create_unary_vectorized_roll_function(sharpe_ratio)
 
 
-def sortino_ratio(returns,
-                  required_return=0,
-                  period=DAILY,
-                  annualization=None,
-                  out=None,
-                  _downside_risk=None):
-    """
-    Determines the Sortino ratio of a strategy.
+def _sharpe_moments(returns, risk_free=0.0):
+    """The moments the Sharpe ratio tests of every column depend on.
+
+    The mean is removed once and the second, third and fourth central
+    moments are accumulated from the same residuals, without temporaries
+    beyond the residuals and their squares.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray or pd.DataFrame
-        Daily returns of the strategy, noncumulative.
-        - See full explanation in :func:`~empyrical.stats.cum_returns`.
-    required_return: float / series
-        minimum acceptable return
-    period : str, optional
-        Defines the periodicity of the 'returns' data for purposes of
-        annualizing. Value ignored if `annualization` parameter is specified.
-        Defaults are::
+    returns : np.ndarray
+        The (T, N) returns.
+    risk_free : float or np.ndarray
+        The risk-free return, subtracted from ``returns``.
 
-            'monthly':12
-            'weekly': 52
-            'daily': 252
+    Returns
+    -------
+    moments : np.ndarray
+        The (N, 4) number of observations, Sharpe ratio per period (with the
+        sample standard deviation, like :func:`sharpe_ratio`), skewness and
+        kurtosis (not excess) of every column.
+    """
+    adjusted = np.asanyarray(_adjust_returns(returns, risk_free))
+    missing = np.isnan(adjusted)
+    n = len(adjusted) - np.count_nonzero(missing, axis=0).astype('float64')
+    moments = np.empty((adjusted.shape[1], 4))
+    moments[:, 0] = n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Missing returns have no residual, so that plain sums skip them.
+        residuals = np.where(missing, 0, adjusted)
+        mean = residuals.sum(axis=0) / n
+        residuals -= mean
+        residuals[missing] = 0
+        squares = np.square(residuals)
+        m2 = squares.sum(axis=0) / n
+        m3 = np.einsum('ij,ij->j', squares, residuals) / n
+        m4 = np.einsum('ij,ij->j', squares, squares) / n
+
+        moments[:, 1] = mean / np.sqrt(m2 * n / (n - 1))
+        moments[:, 2] = m3 / m2 ** 1.5
+        moments[:, 3] = m4 / m2 ** 2
+    moments[n < 2, 1:] = np.nan
+    return moments
+
+
+def _psr(moments, benchmark_sharpe):
+    n, sharpe, skew, kurtosis = moments.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (sharpe - benchmark_sharpe) * np.sqrt(n - 1) / np.sqrt(
+            1 - skew * sharpe + (kurtosis - 1) / 4 * sharpe ** 2
+        )
+    return stats.norm.cdf(z)
+
+
+def _moments_2d(returns, risk_free, n_jobs):
+    returns = np.asanyarray(returns)
+    returns_2d = returns if returns.ndim == 2 else returns[:, np.newaxis]
+    out = np.empty((returns_2d.shape[1], 4))
+    if len(returns_2d) < 2:
+        out[:] = np.nan
+        out[:, 0] = len(returns_2d)
+        return out
+    if n_jobs != 1 and returns_2d.shape[1] > 1:
+        return parallel_columns(
+            _sharpe_moments, out, n_jobs, returns_2d, risk_free=risk_free,
+        )
+    out[:] = _sharpe_moments(returns_2d, risk_free)
+    return out
+
+
+def _write_probabilities(probabilities, returns, out):
+    return _column_result(
+        returns,
+        probabilities.reshape(np.shape(returns)[1:]),
+        out,
+    )
+
+
+def probabilistic_sharpe_ratio(returns,
+                               risk_free=0,
+                               benchmark_sharpe=0.0,
+                               period=DAILY,
+                               annualization=None,
+                               out=None,
+                               n_jobs=1):
+    """
+    Determines the probabilistic Sharpe ratio of a strategy.
+
+    This is the probability that the true Sharpe ratio exceeds
+    ``benchmark_sharpe``, given the length of the track record and the
+    skewness and kurtosis of the returns (Bailey and Lopez de Prado, 2012).
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Daily returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    risk_free : int, float
+        Constant daily risk-free return throughout the period.
+    benchmark_sharpe : float, optional
+        The annualized Sharpe ratio to test against.
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+
+    Returns
+    -------
+    probabilistic_sharpe_ratio : float, pd.Series or np.ndarray
+        The probability of every strategy, nan if there are fewer than two
+        returns.
+
+    Note
+    -----
+    See https://papers.ssrn.com/sol3/papers.cfm?abstract_id=1821643 for
+    more details.
+    """
+    annualization = _annualization(returns, period, annualization)
+    ann_factor = annualization_factor(period, annualization)
+    moments = _moments_2d(returns, risk_free, n_jobs)
+    return _write_probabilities(
+        _psr(moments, benchmark_sharpe / np.sqrt(ann_factor)),
+        returns,
+        out,
+    )
+
+
+def deflated_sharpe_ratio(returns,
+                          risk_free=0,
+                          n_trials=None,
+                          sharpe_variance=None,
+                          period=DAILY,
+                          annualization=None,
+                          out=None,
+                          n_jobs=1):
+    """
+    Determines the deflated Sharpe ratio of one or more strategies.
+
+    This is the probabilistic Sharpe ratio against the Sharpe ratio expected
+    from the best of ``n_trials`` unskilled strategies, which corrects for
+    selecting the strategy among many backtests (Bailey and Lopez de Prado,
+    2014).
+
+    Parameters
+    ----------
+    returns : pd.DataFrame or np.ndarray
+        Daily returns of the strategies, noncumulative, one per column.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    risk_free : int, float
+        Constant daily risk-free return throughout the period.
+    n_trials : int, optional
+        Number of strategies tried. Defaults to the number of columns of
+        ``returns``.
+    sharpe_variance : float, optional
+        Variance of the annualized Sharpe ratios of the trials. Defaults to
+        the variance of the Sharpe ratios of the columns of ``returns``.
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+
+    Returns
+    -------
+    deflated_sharpe_ratio : float, pd.Series or np.ndarray
+        The probability of every strategy.
+
+    Note
+    -----
+    See https://papers.ssrn.com/sol3/papers.cfm?abstract_id=2460551 for
+    more details.
+    """
+    annualization = _annualization(returns, period, annualization)
+    ann_factor = annualization_factor(period, annualization)
+    moments = _moments_2d(returns, risk_free, n_jobs)
+
+    if n_trials is None:
+        n_trials = len(moments)
+    if n_trials < 2:
+        raise ValueError(
+            'deflated_sharpe_ratio needs n_trials of at least 2, got '
+            '{!r}'.format(n_trials),
+        )
+    if sharpe_variance is None:
+        sharpe_variance = np.nanvar(moments[:, 1], ddof=1)
+    else:
+        sharpe_variance = sharpe_variance / ann_factor
+
+    # The expected maximum of n_trials Sharpe ratios with zero mean.
+    expected_max = np.sqrt(sharpe_variance) * (
+        (1 - np.euler_gamma) * stats.norm.ppf(1 - 1.0 / n_trials) +
+        np.euler_gamma * stats.norm.ppf(1 - 1.0 / (n_trials * np.e))
+    )
+    return _write_probabilities(_psr(moments, expected_max), returns, out)
+
+
+@memoized
+def sortino_ratio(returns,
+                  required_return=0,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  _downside_risk=None,
+                  n_jobs=1,
+                  workspace=None):
+    """
+    Determines the Sortino ratio of a strategy.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray or pd.DataFrame
+        Daily returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    required_return: float / series
+        minimum acceptable return
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
 
     annualization : int, optional
         Used to suppress default values available in `period` to convert
@@ -759,6 +2303,12 @@ def sortino_ratio(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -774,9 +2324,10 @@ def sortino_ratio(returns,
     Mag_Sortino_0213.pdf>`__ for more details.
 
     """
+    annualization = _annualization(returns, period, annualization)
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:])
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     return_1d = returns.ndim == 1
 
@@ -786,17 +2337,24 @@ def sortino_ratio(returns,
             out = out.item()
         return out
 
-    adj_returns = np.asanyarray(_adjust_returns(returns, required_return))
-
-    ann_factor = annualization_factor(period, annualization)
+    if n_jobs != 1 and not return_1d and _downside_risk is None:
+        parallel_columns(
+            sortino_ratio, out, n_jobs, returns,
+            required_return=required_return,
+            period=period,
+            annualization=annualization,
+        )
+    else:
+        raw.sortino_ratio(
+            _as_float(returns),
+            _flatten(required_return),
+            period,
+            annualization,
+            out=out,
+            workspace=workspace,
+            _downside_risk=_downside_risk,
+        )
 
-    average_annual_return = nanmean(adj_returns, axis=0) * ann_factor
-    annualized_downside_risk = (
-        _downside_risk
-        if _downside_risk is not None else
-        downside_risk(returns, required_return, period, annualization)
-    )
-    np.divide(average_annual_return, annualized_downside_risk, out=out)
     if return_1d:
         out = out.item()
     elif isinstance(returns, pd.DataFrame):
@@ -808,11 +2366,14 @@ def sortino_ratio(returns,
 roll_sortino_ratio = _create_unary_vectorized_roll_function(sortino_ratio)
 
 
+@memoized
 def downside_risk(returns,
                   required_return=0,
                   period=DAILY,
                   annualization=None,
-                  out=None):
+                  out=None,
+                  n_jobs=1,
+                  workspace=None):
     """
     Determines the downside deviation below a threshold
 
@@ -839,6 +2400,12 @@ def downside_risk(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -853,9 +2420,10 @@ def downside_risk(returns,
     Mag_Sortino_0213.pdf>`__ for more details, specifically why using the
     standard deviation of the negative returns is not correct.
     """
+    annualization = _annualization(returns, period, annualization)
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:])
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     returns_1d = returns.ndim == 1
 
@@ -865,21 +2433,22 @@ def downside_risk(returns,
             out = out.item()
         return out
 
-    ann_factor = annualization_factor(period, annualization)
-
-    downside_diff = np.clip(
-        _adjust_returns(
-            np.asanyarray(returns),
+    if n_jobs != 1 and not returns_1d:
+        parallel_columns(
+            downside_risk, out, n_jobs, returns,
+            required_return=required_return,
+            period=period,
+            annualization=annualization,
+        )
+    else:
+        raw.downside_risk(
+            _as_float(returns),
             np.asanyarray(required_return),
-        ),
-        np.NINF,
-        0,
-    )
-
-    np.square(downside_diff, out=downside_diff)
-    nanmean(downside_diff, axis=0, out=out)
-    np.sqrt(out, out=out)
-    np.multiply(out, np.sqrt(ann_factor), out=out)
+            period,
+            annualization,
+            out=out,
+            workspace=workspace,
+        )
 
     if returns_1d:
         out = out.item()
@@ -891,7 +2460,12 @@ def downside_risk(returns,
 roll_downsize_risk = _create_unary_vectorized_roll_function(downside_risk)
 
 
-def excess_sharpe(returns, factor_returns, out=None):
+@memoized
+def excess_sharpe(returns,
+                  factor_returns,
+                  out=None,
+                  n_jobs=1,
+                  workspace=None):
     """
     Determines the Excess Sharpe of a strategy.
 
@@ -905,6 +2479,12 @@ def excess_sharpe(returns, factor_returns, out=None):
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -917,7 +2497,7 @@ def excess_sharpe(returns, factor_returns, out=None):
     """
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:])
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     returns_1d = returns.ndim == 1
 
@@ -927,13 +2507,16 @@ def excess_sharpe(returns, factor_returns, out=None):
             out = out.item()
         return out
 
-    active_return = _adjust_returns(returns, factor_returns)
-    tracking_error = np.nan_to_num(nanstd(active_return, ddof=1, axis=0))
+    if n_jobs != 1 and not returns_1d:
+        return parallel_columns(
+            excess_sharpe, out, n_jobs, returns, factor_returns,
+        )
 
-    out = np.divide(
-        nanmean(active_return, axis=0, out=out),
-        tracking_error,
+    raw.excess_sharpe(
+        _as_float(returns),
+        _as_float(factor_returns),
         out=out,
+        workspace=workspace,
     )
     if returns_1d:
         out = out.item()
@@ -1001,12 +2584,15 @@ def _aligned_series(*many_series):
     )
 
 
+@memoized
 def alpha_beta(returns,
                factor_returns,
                risk_free=0.0,
                period=DAILY,
                annualization=None,
-               out=None):
+               out=None,
+               n_jobs=1,
+               workspace=None):
     """Calculates annualized alpha and beta.
 
     Parameters
@@ -1037,6 +2623,12 @@ def alpha_beta(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -1052,6 +2644,8 @@ def alpha_beta(returns,
         period=period,
         annualization=annualization,
         out=out,
+        n_jobs=n_jobs,
+        workspace=workspace,
     )
 
 
@@ -1083,12 +2677,15 @@ def roll_alpha_beta(returns, factor_returns, window=10, **kwargs):
     )
 
 
+@memoized
 def alpha_beta_aligned(returns,
                        factor_returns,
                        risk_free=0.0,
                        period=DAILY,
                        annualization=None,
-                       out=None):
+                       out=None,
+                       n_jobs=1,
+                       workspace=None):
     """Calculates annualized alpha and beta.
 
     If they are pd.Series, expects returns and factor_returns have already
@@ -1123,16 +2720,35 @@ def alpha_beta_aligned(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
     alpha : float
     beta : float
     """
+    annualization = _annualization(returns, period, annualization)
     if out is None:
-        out = np.empty(returns.shape[1:] + (2,), dtype='float64')
+        out = np.empty(returns.shape[1:] + (2,), dtype=_float_dtype(returns))
+
+    if n_jobs != 1 and returns.ndim == 2:
+        return parallel_columns(
+            alpha_beta_aligned, out, n_jobs, returns, factor_returns,
+            risk_free=risk_free, period=period, annualization=annualization,
+        )
 
-    b = beta_aligned(returns, factor_returns, risk_free, out=out[..., 1])
+    b = beta_aligned(
+        returns,
+        factor_returns,
+        risk_free,
+        out=out[..., 1],
+        workspace=workspace,
+    )
     alpha_aligned(
         returns,
         factor_returns,
@@ -1141,6 +2757,7 @@ def alpha_beta_aligned(returns,
         annualization,
         out=out[..., 0],
         _beta=b,
+        workspace=workspace,
     )
 
     return out
@@ -1151,13 +2768,16 @@ roll_alpha_beta_aligned = _create_binary_vectorized_roll_function(
 )
 
 
+@memoized
 def alpha(returns,
           factor_returns,
           risk_free=0.0,
           period=DAILY,
           annualization=None,
           out=None,
-          _beta=None):
+          _beta=None,
+          n_jobs=1,
+          workspace=None):
     """Calculates annualized alpha.
 
     Parameters
@@ -1192,6 +2812,12 @@ def alpha(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -1209,20 +2835,25 @@ def alpha(returns,
         period=period,
         annualization=annualization,
         out=out,
-        _beta=_beta
+        _beta=_beta,
+        n_jobs=n_jobs,
+        workspace=workspace,
     )
 
 
 roll_alpha = _create_binary_vectorized_roll_function(alpha)
 
 
+@memoized
 def alpha_aligned(returns,
                   factor_returns,
                   risk_free=0.0,
                   period=DAILY,
                   annualization=None,
                   out=None,
-                  _beta=None):
+                  _beta=None,
+                  n_jobs=1,
+                  workspace=None):
     """Calculates annualized alpha.
 
     If they are pd.Series, expects returns and factor_returns have already
@@ -1261,14 +2892,21 @@ def alpha_aligned(returns,
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
     alpha : float
     """
+    annualization = _annualization(returns, period, annualization)
     allocated_output = out is None
     if allocated_output:
-        out = np.empty(returns.shape[1:], dtype='float64')
+        out = np.empty(returns.shape[1:], dtype=_float_dtype(returns))
 
     if len(returns) < 2:
         out[()] = np.nan
@@ -1276,28 +2914,22 @@ def alpha_aligned(returns,
             out = out.item()
         return out
 
-    ann_factor = annualization_factor(period, annualization)
-
-    if _beta is None:
-        _beta = beta_aligned(returns, factor_returns, risk_free)
-
-    adj_returns = _adjust_returns(returns, risk_free)
-    adj_factor_returns = _adjust_returns(factor_returns, risk_free)
-    alpha_series = adj_returns - (_beta * adj_factor_returns)
-
-    out = np.subtract(
-        np.power(
-            np.add(
-                nanmean(alpha_series, axis=0, out=out),
-                1,
-                out=out
-            ),
-            ann_factor,
-            out=out
-        ),
-        1,
-        out=out
-    )
+    if n_jobs != 1 and returns.ndim == 2 and _beta is None:
+        parallel_columns(
+            alpha_aligned, out, n_jobs, returns, factor_returns,
+            risk_free=risk_free, period=period, annualization=annualization,
+        )
+    else:
+        raw.alpha(
+            _as_float(returns),
+            _as_float(factor_returns),
+            _flatten(risk_free),
+            period,
+            annualization,
+            out=out,
+            workspace=workspace,
+            _beta=_beta,
+        )
 
     if allocated_output and isinstance(returns, pd.DataFrame):
         out = pd.Series(out)
@@ -1311,7 +2943,13 @@ def alpha_aligned(returns,
 roll_alpha_aligned = _create_binary_vectorized_roll_function(alpha_aligned)
 
 
-def beta(returns, factor_returns, risk_free=0.0, out=None):
+@memoized
+def beta(returns,
+         factor_returns,
+         risk_free=0.0,
+         out=None,
+         n_jobs=1,
+         workspace=None):
     """Calculates beta.
 
     Parameters
@@ -1329,6 +2967,12 @@ def beta(returns, factor_returns, risk_free=0.0, out=None):
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
@@ -1343,13 +2987,21 @@ def beta(returns, factor_returns, risk_free=0.0, out=None):
         factor_returns,
         risk_free=risk_free,
         out=out,
+        n_jobs=n_jobs,
+        workspace=workspace,
     )
 
 
 roll_beta = _create_binary_vectorized_roll_function(beta)
 
 
-def beta_aligned(returns, factor_returns, risk_free=0.0, out=None):
+@memoized
+def beta_aligned(returns,
+                 factor_returns,
+                 risk_free=0.0,
+                 out=None,
+                 n_jobs=1,
+                 workspace=None):
     """Calculates beta.
 
     If they are pd.Series, expects returns and factor_returns have already
@@ -1371,15 +3023,20 @@ def beta_aligned(returns, factor_returns, risk_free=0.0, out=None):
     out : array-like, optional
         Array to use as output buffer.
         If not passed, a new array will be created.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads used to evaluate the columns of 2-D ``returns``.
+        See :func:`~empyrical.utils.map_chunks`.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
     beta : float
         Beta.
     """
-    # Cache these as locals since we're going to call them multiple times.
-    nan = np.nan
-    isnan = np.isnan
+    returns = _as_float(returns)
+    factor_returns = _as_float(factor_returns)
 
     returns_1d = returns.ndim == 1
     if returns_1d:
@@ -1391,73 +3048,24 @@ def beta_aligned(returns, factor_returns, risk_free=0.0, out=None):
     N, M = returns.shape
 
     if out is None:
-        out = np.full(M, nan)
+        out = np.full(M, np.nan, dtype=returns.dtype)
     elif out.ndim == 0:
         out = out[np.newaxis]
 
     if len(returns) < 1 or len(factor_returns) < 2:
-        out[()] = nan
+        out[()] = np.nan
         if returns_1d:
             out = out.item()
         return out
 
-    # Copy N times as a column vector and fill with nans to have the same
-    # missing value pattern as the dependent variable.
-    #
-    # PERF_TODO: We could probably avoid the space blowup by doing this in
-    # Cython.
-
-    # shape: (N, M)
-    independent = np.where(
-        isnan(returns),
-        nan,
-        factor_returns,
-    )
+    if n_jobs != 1 and M > 1:
+        return parallel_columns(
+            beta_aligned, out, n_jobs, returns, factor_returns,
+            risk_free=risk_free,
+        )
 
-    # Calculate beta as Cov(X, Y) / Cov(X, X).
-    # https://en.wikipedia.org/wiki/Simple_linear_regression#Fitting_the_regression_line  # noqa
-    #
-    # NOTE: The usual formula for covariance is::
-    #
-    #    mean((X - mean(X)) * (Y - mean(Y)))
-    #
-    # However, we don't actually need to take the mean of both sides of the
-    # product, because of the folllowing equivalence::
-    #
-    # Let X_res = (X - mean(X)).
-    # We have:
-    #
-    #     mean(X_res * (Y - mean(Y))) = mean(X_res * (Y - mean(Y)))
-    #                             (1) = mean((X_res * Y) - (X_res * mean(Y)))
-    #                             (2) = mean(X_res * Y) - mean(X_res * mean(Y))
-    #                             (3) = mean(X_res * Y) - mean(X_res) * mean(Y)
-    #                             (4) = mean(X_res * Y) - 0 * mean(Y)
-    #                             (5) = mean(X_res * Y)
-    #
-    #
-    # The tricky step in the above derivation is step (4). We know that
-    # mean(X_res) is zero because, for any X:
-    #
-    #     mean(X - mean(X)) = mean(X) - mean(X) = 0.
-    #
-    # The upshot of this is that we only have to center one of `independent`
-    # and `dependent` when calculating covariances. Since we need the centered
-    # `independent` to calculate its variance in the next step, we choose to
-    # center `independent`.
-
-    ind_residual = independent - nanmean(independent, axis=0)
-
-    covariances = nanmean(ind_residual * returns, axis=0)
-
-    # We end up with different variances in each column here because each
-    # column may have a different subset of the data dropped due to missing
-    # data in the corresponding dependent column.
-    # shape: (M,)
-    np.square(ind_residual, out=ind_residual)
-    independent_variances = nanmean(ind_residual, axis=0)
-    independent_variances[independent_variances < 1.0e-30] = np.nan
-
-    np.divide(covariances, independent_variances, out=out)
+    raw.beta(returns, factor_returns, risk_free, out=out,
+             workspace=workspace)
 
     if returns_1d:
         out = out.item()
@@ -1468,78 +3076,92 @@ def beta_aligned(returns, factor_returns, risk_free=0.0, out=None):
 roll_beta_aligned = _create_binary_vectorized_roll_function(beta_aligned)
 
 
-def stability_of_timeseries(returns):
-    """Determines R-squared of a linear fit to the cumulative
-    log returns. Computes an ordinary least squares linear fit,
-    and returns R-squared.
-
-    Parameters
-    ----------
-    returns : pd.Series or np.ndarray
-        Daily returns of the strategy, noncumulative.
-        - See full explanation in :func:`~empyrical.stats.cum_returns`.
-
-    Returns
-    -------
-    float
-        R-squared.
-
-    """
-    if len(returns) < 2:
-        return np.nan
-
-    returns = np.asanyarray(returns)
-    returns = returns[~np.isnan(returns)]
-
-    cum_log_returns = np.log1p(returns).cumsum()
-    rhat = stats.linregress(np.arange(len(cum_log_returns)),
-                            cum_log_returns)[2]
-
-    return rhat ** 2
-
+def _factor_design(factor_returns, risk_free):
+    """Risk-adjusted (T, k) factor returns and the names of the factors."""
+    factors = _window_adjusted(factor_returns, risk_free)
+    if isinstance(factor_returns, pd.DataFrame):
+        names = factor_returns.columns
+    elif isinstance(factor_returns, pd.Series):
+        names = pd.Index([factor_returns.name])
+    else:
+        names = pd.RangeIndex(factors.shape[1])
+    return factors, names
 
-def tail_ratio(returns):
-    """Determines the ratio between the right (95%) and left tail (5%).
 
-    For example, a ratio of 0.25 means that losses are four times
-    as bad as profits.
+def _multi_factor_lstsq(returns, factors):
+    """Regress every column of ``returns`` on the same factors.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
-        Daily returns of the strategy, noncumulative.
-         - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    returns : np.ndarray
+        Array of shape (T, N), which may contain NaNs.
+    factors : np.ndarray
+        Array of shape (T, k), which may contain NaNs.
 
     Returns
     -------
-    tail_ratio : float
-    """
+    coefficients : np.ndarray
+        Array of shape (N, k + 1) with the intercept of every regression
+        followed by its slopes. Regressions with fewer complete periods than
+        coefficients, or with collinear factors, are NaN.
 
-    if len(returns) < 1:
-        return np.nan
-
-    returns = np.asanyarray(returns)
-    # Be tolerant of nan's
-    returns = returns[~np.isnan(returns)]
-    if len(returns) < 1:
-        return np.nan
+    Notes
+    -----
+    Each column uses the periods where neither it nor any factor is missing.
+    Columns are grouped by that pattern and every group is solved as a
+    single least squares problem with many right-hand sides, so the cost
+    depends on the number of distinct patterns rather than of columns.
+    """
+    n_coefficients = factors.shape[1] + 1
+    design = np.empty((len(factors), n_coefficients))
+    design[:, 0] = 1
+    design[:, 1:] = factors
+
+    valid = ~np.isnan(returns) & ~np.isnan(factors).any(axis=1)[:, np.newaxis]
+    coefficients = np.full((returns.shape[1], n_coefficients), np.nan)
+    if not returns.size:
+        return coefficients
+
+    patterns, groups = np.unique(valid.T, axis=0, return_inverse=True)
+    for group, rows in enumerate(patterns):
+        if rows.sum() < n_coefficients:
+            continue
+        columns = np.flatnonzero(groups.ravel() == group)
+        solution, _, rank, _ = np.linalg.lstsq(
+            design[rows],
+            returns[rows][:, columns],
+            rcond=None,
+        )
+        if rank == n_coefficients:
+            coefficients[columns] = solution.T
+    return coefficients
 
-    return np.abs(np.percentile(returns, 95)) / \
-        np.abs(np.percentile(returns, 5))
 
+@memoized
+def multi_factor_alpha_beta(returns,
+                            factor_returns,
+                            risk_free=0.0,
+                            period=DAILY,
+                            annualization=None,
+                            out=None):
+    """Calculates annualized alpha and the betas to several factors.
 
-def capture(returns, factor_returns, period=DAILY):
-    """Compute capture ratio.
+    Every strategy is regressed on all factors at once, e.g. the Fama-French
+    factors, instead of on a single benchmark as in
+    :func:`~empyrical.stats.alpha_beta`.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
-        Returns of the strategy, noncumulative.
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
         - See full explanation in :func:`~empyrical.stats.cum_returns`.
-    factor_returns : pd.Series or np.ndarray
-        Noncumulative returns of the factor to which beta is
-        computed. Usually a benchmark such as the market.
-        - This is in the same style as returns.
+    factor_returns : pd.DataFrame or np.ndarray
+        Daily noncumulative returns of the factors, one column per factor.
+        Pandas inputs are aligned on their index, otherwise ``returns`` and
+        ``factor_returns`` must have the same length.
+    risk_free : int, float, optional
+        Constant risk-free return throughout the period. For example, the
+        interest rate on a three month us treasury bill.
     period : str, optional
         Defines the periodicity of the 'returns' data for purposes of
         annualizing. Value ignored if `annualization` parameter is specified.
@@ -1549,36 +3171,549 @@ def capture(returns, factor_returns, period=DAILY):
             'weekly': 52
             'daily': 252
 
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+        - See full explanation in :func:`~empyrical.stats.annual_return`.
+    out : array-like, optional
+        Array to use as output buffer, of shape (k + 1,) for 1-D ``returns``
+        and (N, k + 1) otherwise.
+        If not passed, a new array will be created.
+
     Returns
     -------
-    capture_ratio : float
+    alpha_beta : array-like
+        The annualized alpha followed by the beta to every factor. For a
+        pd.Series of returns, a pd.Series indexed by ``'alpha'`` and the
+        factor names; for a pd.DataFrame, a pd.DataFrame with one row per
+        strategy and those columns.
 
     Note
-    ----
-    See http://www.investopedia.com/terms/u/up-market-capture-ratio.asp for
-    details.
+    -----
+    Each strategy is fit on the periods where neither it nor any factor is
+    missing. Alpha is the intercept of the regression, annualized like
+    :func:`~empyrical.stats.alpha_aligned`.
     """
-    return (annual_return(returns, period=period) /
-            annual_return(factor_returns, period=period))
+    annualization = _annualization(returns, period, annualization)
+    if (isinstance(returns, (pd.Series, pd.DataFrame)) and
+            isinstance(factor_returns, (pd.Series, pd.DataFrame))):
+        returns, factor_returns = returns.align(factor_returns, axis=0)
+
+    factors, names = _factor_design(factor_returns, risk_free)
+    coefficients = _multi_factor_lstsq(
+        _window_adjusted(returns, risk_free),
+        factors,
+    )
+
+    ann_factor = annualization_factor(period, annualization)
+    coefficients[:, 0] = np.power(coefficients[:, 0] + 1, ann_factor) - 1
 
+    if np.ndim(returns) == 1:
+        coefficients = coefficients[0]
 
-def beta_fragility_heuristic(returns, factor_returns):
-    """Estimate fragility to drops in beta.
+    if out is not None:
+        out[()] = coefficients
+        return out
+
+    columns = pd.Index(['alpha']).append(pd.Index(names))
+    if isinstance(returns, pd.Series):
+        return pd.Series(coefficients, index=columns, name=returns.name)
+    elif isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(
+            coefficients,
+            index=returns.columns,
+            columns=columns,
+        )
+    return coefficients
+
+
+def roll_multi_factor_beta(returns,
+                           factor_returns,
+                           window,
+                           risk_free=0.0,
+                           refactor_every=None,
+                           out=None):
+    """Computes the betas to several factors over a rolling window.
+
+    The normal equations of consecutive windows differ by the period which
+    enters and the period which leaves, so ``X'X`` and ``X'y`` are updated
+    with two rank-one terms per step and solved with a Cholesky
+    factorization, at a cost of O(k ** 2 * N) per step instead of
+    O(window * k ** 2 * N) for refitting every window.
 
     Parameters
     ----------
-    returns : pd.Series or np.ndarray
-        Daily returns of the strategy, noncumulative.
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
         - See full explanation in :func:`~empyrical.stats.cum_returns`.
-    factor_returns : pd.Series or np.ndarray
-         Daily noncumulative returns of the factor to which beta is
-         computed. Usually a benchmark such as the market.
-         - This is in the same style as returns.
+    factor_returns : pd.DataFrame or np.ndarray
+        Daily noncumulative returns of the factors, one column per factor.
+        Pandas inputs are aligned on their index, otherwise ``returns`` and
+        ``factor_returns`` must already be aligned.
+    window : int
+        Size of the rolling window in terms of the periodicity of the data.
+    risk_free : int, float, optional
+        Constant risk-free return throughout the period.
+    refactor_every : int, optional
+        Number of steps after which ``X'X`` and ``X'y`` are recomputed from
+        the data of the window, which discards the rounding errors of the
+        updates. Defaults to ``window``.
+    out : array-like, optional
+        Array to use as output buffer, of shape
+        (len(returns) - window + 1, N, k), without the N axis for 1-D
+        ``returns``.
+        If not passed, a new array will be created.
 
     Returns
     -------
-    float, np.nan
-        The beta fragility of the strategy.
+    rolling_multi_factor_beta : array-like
+        The betas of every window, which is labeled by the date it ends at.
+        For a pd.Series of returns, a pd.DataFrame with one column per
+        factor; for a pd.DataFrame, a pd.DataFrame with a column for every
+        pair of strategy and factor.
+
+    Note
+    -----
+    Windows in which a strategy or the factors have missing periods are
+    solved from scratch like :func:`~empyrical.stats.multi_factor_alpha_beta`
+    for the affected strategies.
+    """
+    if (isinstance(returns, (pd.Series, pd.DataFrame)) and
+            isinstance(factor_returns, (pd.Series, pd.DataFrame))):
+        returns, factor_returns = returns.align(factor_returns, axis=0)
+
+    factors, names = _factor_design(factor_returns, risk_free)
+    dependent = _window_adjusted(returns, risk_free)
+    n = min(len(factors), len(dependent))
+    # Shifting the data changes the intercepts but not the betas, and keeps
+    # the sums of the normal equations small.
+    valid_factors, factors, _ = _centered(factors[:n])
+    valid, dependent, _ = _centered(dependent[:n])
+    missing_factors = ~valid_factors.all(axis=1)
+    missing = ~valid
+    raw_factors = np.where(missing_factors[:, np.newaxis], np.nan, factors)
+    raw_dependent = np.where(missing, np.nan, dependent)
+
+    n_strategies, n_factors = dependent.shape[1], factors.shape[1]
+    n_windows = max(n - window + 1, 0) if window >= 1 else 0
+    if refactor_every is None:
+        refactor_every = window
+
+    design = np.empty((n, n_factors + 1))
+    design[:, 0] = 1
+    design[:, 1:] = factors
+    design[missing_factors] = 0
+    dependent[missing_factors] = 0
+
+    missing_factors = np.concatenate([[0], np.cumsum(missing_factors)])
+    missing = np.concatenate(
+        [np.zeros((1, n_strategies), dtype=int), np.cumsum(missing, axis=0)],
+    )
+
+    eps = np.finfo('float64').eps
+    betas = np.full((n_windows, n_strategies, n_factors), np.nan)
+    for start in range(n_windows):
+        end = start + window
+        if start % refactor_every == 0:
+            xtx = design[start:end].T.dot(design[start:end])
+            xty = design[start:end].T.dot(dependent[start:end])
+        else:
+            xtx += (np.outer(design[end - 1], design[end - 1]) -
+                    np.outer(design[start - 1], design[start - 1]))
+            xty += (np.outer(design[end - 1], dependent[end - 1]) -
+                    np.outer(design[start - 1], dependent[start - 1]))
+
+        if missing_factors[end] > missing_factors[start]:
+            incomplete = np.ones(n_strategies, dtype=bool)
+        else:
+            incomplete = missing[end] > missing[start]
+            complete = ~incomplete
+            if complete.any():
+                try:
+                    factorization = cho_factor(xtx)
+                except LinAlgError:
+                    factorization = None
+                # Tiny pivots mean (nearly) collinear factors, which the
+                # rank revealing solver of the fallback reports as NaN.
+                if (factorization is None or
+                        np.diag(factorization[0]).min() ** 2 <=
+                        window * eps * np.diag(xtx).max()):
+                    incomplete[()] = True
+                else:
+                    betas[start, complete] = cho_solve(
+                        factorization,
+                        xty[:, complete],
+                    )[1:].T
+
+        if incomplete.any():
+            betas[start, incomplete] = _multi_factor_lstsq(
+                raw_dependent[start:end, incomplete],
+                raw_factors[start:end],
+            )[:, 1:]
+
+    if np.ndim(returns) == 1:
+        betas = betas[:, 0]
+
+    if out is not None:
+        out[()] = betas
+        return out
+
+    if isinstance(returns, pd.Series):
+        return pd.DataFrame(
+            betas,
+            index=returns.index[n - n_windows:n],
+            columns=names,
+        )
+    elif isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(
+            betas.reshape(n_windows, -1),
+            index=returns.index[n - n_windows:n],
+            columns=pd.MultiIndex.from_product([returns.columns, names]),
+        )
+    return betas
+
+
+def _pairwise_moments(returns, factor_returns):
+    """Moments of every pair of a returns column and a factor column.
+
+    Each pair only uses the periods where neither is missing. The sums over
+    those periods are matrix products of the zero filled data with the
+    masks of the other panel, so all pairs cost a few GEMMs.
+
+    Returns
+    -------
+    count, covariance, returns_variance, factor_variance : np.ndarray
+        Arrays of shape (N, K). The (co)variances have ``ddof=0``.
+    """
+    returns_valid, returns, _ = _centered(returns)
+    factor_valid, factor_returns, _ = _centered(factor_returns)
+    returns_valid = returns_valid.astype('float64')
+    factor_valid = factor_valid.astype('float64')
+    returns_sq = np.square(returns)
+    factor_sq = np.square(factor_returns)
+
+    count = returns_valid.T.dot(factor_valid)
+    returns_total = returns.T.dot(factor_valid)
+    factor_total = returns_valid.T.dot(factor_returns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns_mean = returns_total / count
+        factor_mean = factor_total / count
+        covariance = (
+            returns.T.dot(factor_returns) / count - returns_mean * factor_mean
+        )
+
+        returns_sum_sq_dev = (
+            returns_sq.T.dot(factor_valid) - returns_total * returns_mean
+        )
+        returns_sum_sq_dev[
+            returns_sum_sq_dev < _sum_sq_tolerance(returns_sq)[:, np.newaxis]
+        ] = 0
+        factor_sum_sq_dev = (
+            returns_valid.T.dot(factor_sq) - factor_total * factor_mean
+        )
+        factor_sum_sq_dev[factor_sum_sq_dev < _sum_sq_tolerance(factor_sq)] = 0
+        return (
+            count,
+            covariance,
+            returns_sum_sq_dev / count,
+            factor_sum_sq_dev / count,
+        )
+
+
+def _pairwise_matrix(function, returns, factor_returns, risk_free):
+    """Evaluate ``function`` on the pairwise moments and label the result
+    like the inputs, dropping the axes of 1-D inputs.
+    """
+    if (isinstance(returns, (pd.Series, pd.DataFrame)) and
+            isinstance(factor_returns, (pd.Series, pd.DataFrame))):
+        returns, factor_returns = returns.align(factor_returns, axis=0)
+
+    result = function(*_pairwise_moments(
+        _window_adjusted(returns, risk_free),
+        _window_adjusted(factor_returns, risk_free),
+    ))
+
+    returns_1d = np.ndim(returns) == 1
+    factor_1d = np.ndim(factor_returns) == 1
+    if returns_1d and factor_1d:
+        return result.item()
+    elif returns_1d:
+        result = result[0]
+        if isinstance(factor_returns, pd.DataFrame):
+            result = pd.Series(
+                result,
+                index=factor_returns.columns,
+                name=getattr(returns, 'name', None),
+            )
+    elif factor_1d:
+        result = result[:, 0]
+        if isinstance(returns, pd.DataFrame):
+            result = pd.Series(
+                result,
+                index=returns.columns,
+                name=getattr(factor_returns, 'name', None),
+            )
+    elif isinstance(returns, pd.DataFrame):
+        result = pd.DataFrame(
+            result,
+            index=returns.columns,
+            columns=getattr(factor_returns, 'columns', None),
+        )
+    return result
+
+
+def _beta_from_moments(count, covariance, _, factor_variance):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factor_variance[~(factor_variance >= 1.0e-30)] = np.nan
+        return covariance / factor_variance
+
+
+def _correlation_from_moments(count, covariance, returns_variance,
+                              factor_variance):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = covariance / np.sqrt(returns_variance * factor_variance)
+    result[count < 2] = np.nan
+    return np.clip(result, -1, 1, out=result)
+
+
+def beta_matrix(returns, factor_returns, risk_free=0.0):
+    """Calculates the beta of every strategy to every factor.
+
+    Unlike :func:`~empyrical.stats.beta_aligned`, which regresses the columns
+    of ``returns`` on a single factor, every pair of a strategy and a factor
+    is a separate single factor regression, e.g. for the betas of a panel of
+    stocks to several indices.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily noncumulative returns of one or more factors, e.g. benchmark
+        indices. Pandas inputs are aligned on their index, otherwise
+        ``returns`` and ``factor_returns`` must have the same length.
+    risk_free : int, float, optional
+        Constant risk-free return throughout the period.
+
+    Returns
+    -------
+    beta_matrix : array-like
+        Array of shape (N, K) with the beta of every strategy to every
+        factor, labeled by the columns of the inputs. The axis of a 1-D input
+        is dropped.
+
+    Note
+    -----
+    Each pair only uses the periods where neither input is missing.
+    """
+    return _pairwise_matrix(
+        _beta_from_moments,
+        returns,
+        factor_returns,
+        risk_free,
+    )
+
+
+def correlation_matrix(returns, factor_returns, risk_free=0.0):
+    """Calculates the correlation of every strategy with every factor.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily noncumulative returns of one or more factors, e.g. benchmark
+        indices. Pandas inputs are aligned on their index, otherwise
+        ``returns`` and ``factor_returns`` must have the same length.
+    risk_free : int, float, optional
+        Constant risk-free return throughout the period.
+
+    Returns
+    -------
+    correlation_matrix : array-like
+        Array of shape (N, K) with the Pearson correlation of every strategy
+        with every factor, labeled by the columns of the inputs. The axis of
+        a 1-D input is dropped.
+
+    Note
+    -----
+    Each pair only uses the periods where neither input is missing, like
+    ``pd.DataFrame.corr``.
+    """
+    return _pairwise_matrix(
+        _correlation_from_moments,
+        returns,
+        factor_returns,
+        risk_free,
+    )
+
+
+@memoized
+def stability_of_timeseries(returns, out=None):
+    """Determines R-squared of a linear fit to the cumulative
+    log returns. Computes an ordinary least squares linear fit,
+    and returns R-squared.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Daily returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    float
+        R-squared.
+
+    """
+    if len(returns) < 2:
+        return _write_out(np.nan, out)
+
+    returns = np.asanyarray(returns)
+    returns = returns[~np.isnan(returns)]
+
+    cum_log_returns = np.log1p(returns).cumsum()
+    rhat = stats.linregress(np.arange(len(cum_log_returns)),
+                            cum_log_returns)[2]
+
+    return _write_out(rhat ** 2, out)
+
+
+@memoized
+def tail_ratio(returns, out=None, workspace=None):
+    """Determines the ratio between the right (95%) and left tail (5%).
+
+    For example, a ratio of 0.25 means that losses are four times
+    as bad as profits.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Daily returns of the strategy, noncumulative.
+         - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
+    Returns
+    -------
+    tail_ratio : float
+    """
+
+    if len(returns) < 1:
+        return _write_out(np.nan, out)
+
+    returns = np.asarray(returns, dtype='float64').ravel()
+    # Be tolerant of nan's
+    valid = np.isnan(
+        returns,
+        out=_scratch(workspace, 'missing', returns.shape, '?'),
+    )
+    np.logical_not(valid, out=valid)
+    n = np.count_nonzero(valid)
+    if n < 1:
+        return _write_out(np.nan, out)
+
+    values = _scratch(workspace, 'values', returns.shape)
+    np.copyto(values, returns)
+    left, right = _partition_percentiles(values, n, (5, 95))
+    return _write_out(np.abs(right) / np.abs(left), out)
+
+
+def _partition_percentiles(values, n, percentiles):
+    """The percentiles of the ``n`` valid elements of ``values``, linearly
+    interpolated like ``np.percentile``.
+
+    ``values`` is partitioned in place, which sorts the missing values to
+    its end, instead of compressing a copy of the valid values first.
+    """
+    positions = np.asarray(percentiles, dtype='float64') / 100 * (n - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, n - 1)
+    values.partition(np.unique(np.r_[lower, upper]))
+    a, b = values[lower], values[upper]
+    t = positions - lower
+    # Interpolate from the nearer end, like numpy.
+    return np.where(t < 0.5, a + (b - a) * t, b - (b - a) * (1 - t))
+
+
+@memoized
+def capture(returns, factor_returns, period=DAILY, out=None, workspace=None):
+    """Compute capture ratio.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series or np.ndarray
+        Noncumulative returns of the factor to which beta is
+        computed. Usually a benchmark such as the market.
+        - This is in the same style as returns.
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
+    Returns
+    -------
+    capture_ratio : float
+
+    Note
+    ----
+    See http://www.investopedia.com/terms/u/up-market-capture-ratio.asp for
+    details.
+    """
+    # The workspace is kept for the returns, whose scratch arrays would
+    # otherwise be replaced by those of the benchmark on every call.
+    factor_return = annual_return(factor_returns, period=period)
+    return _write_out(
+        annual_return(
+            returns,
+            period=period,
+            out=out,
+            workspace=workspace,
+        ) / factor_return,
+        out,
+    )
+
+
+def beta_fragility_heuristic(returns, factor_returns):
+    """Estimate fragility to drops in beta.
+
+    Parameters
+    ----------
+    returns : pd.Series or np.ndarray
+        Daily returns of the strategy, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series or np.ndarray
+         Daily noncumulative returns of the factor to which beta is
+         computed. Usually a benchmark such as the market.
+         - This is in the same style as returns.
+
+    Returns
+    -------
+    float, np.nan
+        The beta fragility of the strategy.
 
     Note
     ----
@@ -1884,7 +4019,13 @@ def gpd_loglikelihood_scale_only(scale, price_data):
     return result
 
 
-def up_capture(returns, factor_returns, **kwargs):
+@memoized
+def up_capture(returns,
+               factor_returns,
+               period=DAILY,
+               annualization=None,
+               out=None,
+               workspace=None):
     """
     Compute the capture ratio for periods when the benchmark return is positive
 
@@ -1906,6 +4047,17 @@ def up_capture(returns, factor_returns, **kwargs):
             'weekly': 52
             'daily': 252
 
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
     Returns
     -------
     up_capture : float
@@ -1915,10 +4067,26 @@ def up_capture(returns, factor_returns, **kwargs):
     See http://www.investopedia.com/terms/u/up-market-capture-ratio.asp for
     more information.
     """
-    return up(returns, factor_returns, function=capture, **kwargs)
+    return _column_result(
+        returns,
+        _regime_captures(
+            returns,
+            factor_returns,
+            period=period,
+            annualization=annualization,
+            workspace=workspace,
+        )[0],
+        out,
+    )
 
 
-def down_capture(returns, factor_returns, **kwargs):
+@memoized
+def down_capture(returns,
+                 factor_returns,
+                 period=DAILY,
+                 annualization=None,
+                 out=None,
+                 workspace=None):
     """
     Compute the capture ratio for periods when the benchmark return is negative
 
@@ -1940,6 +4108,17 @@ def down_capture(returns, factor_returns, **kwargs):
             'weekly': 52
             'daily': 252
 
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
     Returns
     -------
     down_capture : float
@@ -1949,10 +4128,26 @@ def down_capture(returns, factor_returns, **kwargs):
     See http://www.investopedia.com/terms/d/down-market-capture-ratio.asp for
     more information.
     """
-    return down(returns, factor_returns, function=capture, **kwargs)
+    return _column_result(
+        returns,
+        _regime_captures(
+            returns,
+            factor_returns,
+            period=period,
+            annualization=annualization,
+            workspace=workspace,
+        )[1],
+        out,
+    )
 
 
-def up_down_capture(returns, factor_returns, **kwargs):
+@memoized
+def up_down_capture(returns,
+                    factor_returns,
+                    period=DAILY,
+                    annualization=None,
+                    out=None,
+                    workspace=None):
     """
     Computes the ratio of up_capture to down_capture.
 
@@ -1974,47 +4169,294 @@ def up_down_capture(returns, factor_returns, **kwargs):
             'weekly': 52
             'daily': 252
 
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
+
     Returns
     -------
     up_down_capture : float
         the updown capture ratio
     """
-    return (up_capture(returns, factor_returns, **kwargs) /
-            down_capture(returns, factor_returns, **kwargs))
+    up_capture, down_capture = _regime_captures(
+        returns,
+        factor_returns,
+        period=period,
+        annualization=annualization,
+        workspace=workspace,
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _column_result(returns, up_capture / down_capture, out)
 
 
-def up_alpha_beta(returns, factor_returns, **kwargs):
+def _regime_factor(returns, factor_returns):
+    """The benchmark on the periods of ``returns``, aligned on the index if
+    both are pandas objects. Periods of ``returns`` without a benchmark
+    return belong to neither regime.
     """
-    Computes alpha and beta for periods when the benchmark return is positive.
+    if (isinstance(returns, (pd.Series, pd.DataFrame)) and
+            isinstance(factor_returns, pd.Series)):
+        return factor_returns.reindex(returns.index)
+    return factor_returns
 
-    Parameters
-    ----------
-    see documentation for `alpha_beta`.
 
-    Returns
-    -------
-    float
-        Alpha.
-    float
-        Beta.
+def _regimes(factor_returns):
+    """The benchmark with missing returns as 0, and the masks of its up and
+    down periods as rows of floats, which select periods in matrix products.
+    """
+    factor = np.array(_flatten(factor_returns), dtype='float64')
+    regimes = np.empty((2, len(factor)))
+    with np.errstate(invalid='ignore'):
+        np.greater(factor, 0, out=regimes[0])
+        np.less(factor, 0, out=regimes[1])
+    np.copyto(factor, 0, where=np.isnan(factor))
+    return factor, regimes
+
+
+def _regime_annual_returns(returns, regimes, ann_factor, workspace=None):
+    """The annual return of ``returns`` over the periods of every regime,
+    from sums of the log growth instead of filtered copies of the returns.
+    Missing returns count as 0 like in :func:`annual_return`.
     """
-    return up(returns, factor_returns, function=alpha_beta_aligned, **kwargs)
+    returns = np.asarray(returns, dtype='float64')
+    mask = _scratch(workspace, 'missing', returns.shape, '?')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if not np.less_equal(returns, -1, out=mask).any():
+            log_growth = np.log1p(
+                returns,
+                out=_scratch(workspace, 'log_growth', returns.shape),
+            )
+            np.copyto(log_growth, 0, where=np.isnan(log_growth, out=mask))
+            total = regimes.dot(log_growth)
+        else:
+            # Returns of -100% or less have no finite log, so the wealth of
+            # every regime is compounded directly.
+            growth = 1 + np.where(np.isnan(returns), 0, returns)
+            total = np.log(np.stack([
+                np.prod(
+                    np.where(_column_aligned(mask, growth.ndim) > 0,
+                             growth, 1),
+                    axis=0,
+                )
+                for mask in regimes
+            ]))
+        num_years = regimes.sum(axis=1) / ann_factor
+        return np.expm1(
+            total / num_years.reshape((2,) + (1,) * (returns.ndim - 1))
+        )
+
+
+def _regime_captures(returns,
+                     factor_returns,
+                     period=DAILY,
+                     annualization=None,
+                     workspace=None):
+    """The up and down capture of every column of ``returns``."""
+    annualization = _annualization(returns, period, annualization)
+    ann_factor = annualization_factor(period, annualization)
+    factor, regimes = _regimes(_regime_factor(returns, factor_returns))
+    annual = _regime_annual_returns(returns, regimes, ann_factor, workspace)
+    factor_annual = _regime_annual_returns(factor, regimes, ann_factor)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return annual / factor_annual.reshape((2,) + (1,) * (annual.ndim - 1))
+
+
+UP_DOWN_STATS = (
+    'up_capture',
+    'down_capture',
+    'up_down_capture',
+    'up_alpha',
+    'up_beta',
+    'down_alpha',
+    'down_beta',
+    'up_hit_rate',
+    'down_hit_rate',
+)
 
 
-def down_alpha_beta(returns, factor_returns, **kwargs):
+def up_down_stats(returns,
+                  factor_returns,
+                  risk_free=0.0,
+                  period=DAILY,
+                  annualization=None):
     """
-    Computes alpha and beta for periods when the benchmark return is negative.
+    Compute the capture ratios, alpha and beta and the hit rates of one or
+    more strategies for the periods when the benchmark return is positive
+    and negative.
+
+    The periods are classified once, and every statistic is computed from
+    sums over the periods of each regime, taken as matrix products with the
+    masks of the regimes, instead of filtering copies of the returns for
+    every statistic like :func:`~empyrical.utils.up` and
+    :func:`~empyrical.utils.down`. Periods with a missing benchmark return
+    belong to neither regime.
 
     Parameters
     ----------
-    see documentation for `alpha_beta`.
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series or np.ndarray
+        Noncumulative returns of the benchmark. A pd.Series is aligned on
+        the index of pandas ``returns``, else it must match their periods.
+    risk_free : int, float
+        Constant risk-free return throughout the period.
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+
+    Returns
+    -------
+    up_down_stats : pd.Series or pd.DataFrame
+        The statistics of :data:`UP_DOWN_STATS`. The capture ratios, alphas
+        and betas match :func:`up_capture`, :func:`down_capture`,
+        :func:`up_down_capture`, :func:`up_alpha_beta` and
+        :func:`down_alpha_beta`. The hit rates are the fractions of the
+        periods with a return in which the strategy outperformed the
+        benchmark. For 2-D returns, one row per strategy.
+    """
+    annualization = _annualization(returns, period, annualization)
+    ann_factor = annualization_factor(period, annualization)
+    values = _as_columns(_flatten(returns))
+    factor, regimes = _regimes(_regime_factor(returns, factor_returns))
+    n_periods = regimes.sum(axis=1)[:, np.newaxis]
+
+    captures = _regime_captures(
+        values,
+        factor,
+        period=period,
+        annualization=annualization,
+    )
+
+    # Sums over the periods of every regime where the strategy has a
+    # return. The benchmark is centered on its mean within every regime to
+    # limit the cancellation in the variances.
+    valid = ~np.isnan(values)
+    dependent = np.where(valid, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = np.nan_to_num(regimes.dot(factor) / n_periods[:, 0])
+    independent = regimes * (factor - center[:, np.newaxis])
+    count, ind_total, ind_sq_total = np.split(
+        np.vstack([regimes, independent, np.square(independent)]).dot(valid),
+        3,
+    )
+    dep_total, cross_total = np.split(
+        np.vstack([regimes, independent]).dot(dependent),
+        2,
+    )
+    with np.errstate(invalid='ignore'):
+        hits = regimes.dot(values > factor[:, np.newaxis])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ind_mean = ind_total / count
+        dep_mean = dep_total / count
+        covariance = cross_total / count - ind_mean * dep_mean
+        variance = ind_sq_total / count - np.square(ind_mean)
+        variance[~(variance >= 1.0e-30)] = np.nan
+        beta = covariance / variance
+        alpha_mean = dep_mean - risk_free - beta * (
+            ind_mean + center[:, np.newaxis] - risk_free
+        )
+        alpha = (alpha_mean + 1) ** ann_factor - 1
+        hit_rate = hits / count
+        up_down = captures[0] / captures[1]
+    alpha[np.broadcast_to(n_periods < 2, alpha.shape)] = np.nan
+    beta[np.broadcast_to(n_periods < 2, beta.shape)] = np.nan
+
+    result = np.vstack([
+        captures, up_down, alpha[0], beta[0], alpha[1], beta[1], hit_rate,
+    ])
+    if np.ndim(returns) == 1:
+        return pd.Series(result[:, 0], index=UP_DOWN_STATS)
+    columns = returns.columns if isinstance(returns, pd.DataFrame) else None
+    return pd.DataFrame(result.T, index=columns, columns=UP_DOWN_STATS)
+
+
+def up_alpha_beta(returns,
+                  factor_returns,
+                  risk_free=0.0,
+                  period=DAILY,
+                  annualization=None,
+                  out=None,
+                  workspace=None):
+    """
+    Computes alpha and beta for periods when the benchmark return is positive.
+
+    Parameters
+    ----------
+    see documentation for `alpha_beta`.
+
+    Returns
+    -------
+    float
+        Alpha.
+    float
+        Beta.
+    """
+    # The annualization is inferred from all dates, not from those of the
+    # regime.
+    annualization = _annualization(returns, period, annualization)
+    return up(
+        returns,
+        factor_returns,
+        function=alpha_beta_aligned,
+        risk_free=risk_free,
+        period=period,
+        annualization=annualization,
+        out=out,
+        workspace=workspace,
+    )
+
+
+def down_alpha_beta(returns,
+                    factor_returns,
+                    risk_free=0.0,
+                    period=DAILY,
+                    annualization=None,
+                    out=None,
+                    workspace=None):
+    """
+    Computes alpha and beta for periods when the benchmark return is negative.
+
+    Parameters
+    ----------
+    see documentation for `alpha_beta`.
 
     Returns
     -------
     alpha : float
     beta : float
     """
-    return down(returns, factor_returns, function=alpha_beta_aligned, **kwargs)
+    # The annualization is inferred from all dates, not from those of the
+    # regime.
+    annualization = _annualization(returns, period, annualization)
+    return down(
+        returns,
+        factor_returns,
+        function=alpha_beta_aligned,
+        risk_free=risk_free,
+        period=period,
+        annualization=annualization,
+        out=out,
+        workspace=workspace,
+    )
 
 
 def roll_up_capture(returns, factor_returns, window=10, **kwargs):
@@ -2034,10 +4476,12 @@ def roll_up_capture(returns, factor_returns, window=10, **kwargs):
         computed. Usually a benchmark such as the market.
         - This is in the same style as returns.
 
-    window : int, required
+    window : int or list of int, required
         Size of the rolling window in terms of the periodicity of the data.
         - eg window = 60, periodicity=DAILY, represents a rolling 60 day window
+        A list of windows gives one column per window.
     """
+    _infer_kwargs(returns, kwargs)
     return roll(returns, factor_returns, window=window, function=up_capture,
                 **kwargs)
 
@@ -2059,10 +4503,12 @@ def roll_down_capture(returns, factor_returns, window=10, **kwargs):
         computed. Usually a benchmark such as the market.
         - This is in the same style as returns.
 
-    window : int, required
+    window : int or list of int, required
         Size of the rolling window in terms of the periodicity of the data.
         - eg window = 60, periodicity=DAILY, represents a rolling 60 day window
+        A list of windows gives one column per window.
     """
+    _infer_kwargs(returns, kwargs)
     return roll(returns, factor_returns, window=window, function=down_capture,
                 **kwargs)
 
@@ -2084,35 +4530,52 @@ def roll_up_down_capture(returns, factor_returns, window=10, **kwargs):
         computed. Usually a benchmark such as the market.
         - This is in the same style as returns.
 
-    window : int, required
+    window : int or list of int, required
         Size of the rolling window in terms of the periodicity of the data.
         - eg window = 60, periodicity=DAILY, represents a rolling 60 day window
+        A list of windows gives one column per window.
     """
+    _infer_kwargs(returns, kwargs)
     return roll(returns, factor_returns, window=window,
                 function=up_down_capture, **kwargs)
 
 
-def value_at_risk(returns, cutoff=0.05):
+@memoized
+def value_at_risk(returns, cutoff=0.05, out=None, workspace=None):
     """
     Value at risk (VaR) of a returns stream.
 
     Parameters
     ----------
-    returns : pandas.Series or 1-D numpy.array
-        Non-cumulative daily returns.
+    returns : pandas.Series, pandas.DataFrame or numpy.array
+        Non-cumulative daily returns of one or more strategies.
     cutoff : float, optional
         Decimal representing the percentage cutoff for the bottom percentile of
         returns. Defaults to 0.05.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
-    VaR : float
-        The VaR value.
+    VaR : float, pd.Series or np.ndarray
+        The VaR value of every strategy.
     """
-    return np.percentile(returns, 100 * cutoff)
+    values = _scratch(workspace, 'values', np.shape(returns))
+    np.copyto(values, returns)
+    return _column_result(
+        returns,
+        np.percentile(values, 100 * cutoff, axis=0, overwrite_input=True),
+        out,
+    )
 
 
-def conditional_value_at_risk(returns, cutoff=0.05):
+@memoized
+def conditional_value_at_risk(returns, cutoff=0.05, out=None,
+                              workspace=None):
     """
     Conditional value at risk (CVaR) of a returns stream.
 
@@ -2122,23 +4585,1198 @@ def conditional_value_at_risk(returns, cutoff=0.05):
 
     Parameters
     ----------
-    returns : pandas.Series or 1-D numpy.array
-        Non-cumulative daily returns.
+    returns : pandas.Series, pandas.DataFrame or numpy.array
+        Non-cumulative daily returns of one or more strategies.
     cutoff : float, optional
         Decimal representing the percentage cutoff for the bottom percentile of
         returns. Defaults to 0.05.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+    workspace : empyrical.raw.Workspace, optional
+        Scratch arrays reused across calls, see
+        :class:`~empyrical.raw.Workspace`.
 
     Returns
     -------
-    CVaR : float
-        The CVaR value.
+    CVaR : float, pd.Series or np.ndarray
+        The CVaR value of every strategy.
     """
     # PERF: Instead of using the 'value_at_risk' function to find the cutoff
     # value, which requires a call to numpy.percentile, determine the cutoff
     # index manually and partition out the lowest returns values. The value at
     # the cutoff index should be included in the partition.
     cutoff_index = int((len(returns) - 1) * cutoff)
-    return np.mean(np.partition(returns, cutoff_index)[:cutoff_index + 1])
+    values = _scratch(workspace, 'values', np.shape(returns))
+    np.copyto(values, returns)
+    values.partition(cutoff_index, axis=0)
+    return _column_result(
+        returns,
+        np.mean(values[:cutoff_index + 1], axis=0),
+        out,
+    )
+
+
+def _window_adjusted(returns, adjustment):
+    """``returns - adjustment`` as a new (T, N) float64 array."""
+    returns = _as_columns(returns)
+    adjustment = np.asarray(adjustment, dtype='float64')
+    if adjustment.ndim:
+        adjustment = _as_columns(adjustment)
+    return returns - adjustment
+
+
+def _sharpe_ratio_kernel(bounds,
+                         returns,
+                         risk_free=0,
+                         period=DAILY,
+                         annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    valid, centered, center = _centered(_window_adjusted(returns, risk_free))
+    squares = np.square(centered)
+    tolerance = _sum_sq_tolerance(squares)
+
+    results = []
+    for count, total, total_sq in _window_sums(
+            (valid, centered, squares), bounds):
+        mean, var = _window_mean_var(count, total, total_sq, center, tolerance)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results.append(mean / np.sqrt(var) * np.sqrt(ann_factor))
+    return results
+
+
+def _annual_volatility_kernel(bounds,
+                              returns,
+                              period=DAILY,
+                              alpha=2.0,
+                              annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    valid, centered, center = _centered(_as_columns(returns))
+    squares = np.square(centered)
+    tolerance = _sum_sq_tolerance(squares)
+
+    results = []
+    for count, total, total_sq in _window_sums(
+            (valid, centered, squares), bounds):
+        _, var = _window_mean_var(count, total, total_sq, center, tolerance)
+        results.append(np.sqrt(var) * ann_factor ** (1.0 / alpha))
+    return results
+
+
+def _annual_return_kernel(bounds,
+                          returns,
+                          period=DAILY,
+                          annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    returns = _as_columns(returns)
+    # Returns of -100% or less have no finite log, so the windows containing
+    # them are evaluated directly.
+    total_loss = np.less_equal(returns, -1, where=~np.isnan(returns),
+                               out=np.zeros(returns.shape, dtype=bool))
+    log_growth = np.log1p(np.where(total_loss | np.isnan(returns), 0, returns))
+
+    results = []
+    for (starts, ends), (n_losses, total) in zip(
+            bounds, _window_sums((total_loss, log_growth), bounds)):
+        num_years = (ends - starts)[:, np.newaxis] / ann_factor
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.expm1(total / num_years)
+        for row, column in zip(*np.nonzero(n_losses)):
+            result[row, column] = raw.annual_return(
+                returns[starts[row]:ends[row], column],
+                annualization=ann_factor,
+            )
+        results.append(result)
+    return results
+
+
+def _downside_terms(returns, required_return):
+    adj_returns = _window_adjusted(returns, required_return)
+    valid, centered, center = _centered(adj_returns)
+    downside = np.minimum(adj_returns, 0)
+    downside[~valid] = 0
+    np.square(downside, out=downside)
+    return valid, centered, center, downside
+
+
+def _downside_risk_kernel(bounds,
+                          returns,
+                          required_return=0,
+                          period=DAILY,
+                          annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    valid, _, _, downside = _downside_terms(returns, required_return)
+
+    results = []
+    for count, total_sq in _window_sums((valid, downside), bounds):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results.append(np.sqrt(total_sq / count) * np.sqrt(ann_factor))
+    return results
+
+
+def _sortino_ratio_kernel(bounds,
+                          returns,
+                          required_return=0,
+                          period=DAILY,
+                          annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    valid, centered, center, downside = _downside_terms(
+        returns,
+        required_return,
+    )
+
+    results = []
+    for (starts, ends), (count, total, total_sq) in zip(
+            bounds, _window_sums((valid, centered, downside), bounds)):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average_annual_return = (total / count + center) * ann_factor
+            annualized_downside_risk = (
+                np.sqrt(total_sq / count) * np.sqrt(ann_factor)
+            )
+            result = average_annual_return / annualized_downside_risk
+        # Like sortino_ratio, windows shorter than two periods are undefined.
+        result[ends - starts < 2] = np.nan
+        results.append(result)
+    return results
+
+
+def _excess_sharpe_kernel(bounds, returns, factor_returns):
+    valid, centered, center = _centered(
+        _window_adjusted(returns, factor_returns),
+    )
+    squares = np.square(centered)
+    tolerance = _sum_sq_tolerance(squares)
+
+    results = []
+    for count, total, total_sq in _window_sums(
+            (valid, centered, squares), bounds):
+        mean, var = _window_mean_var(count, total, total_sq, center, tolerance)
+        tracking_error = np.nan_to_num(np.sqrt(var))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = mean / tracking_error
+        result[count < 2] = np.nan
+        results.append(result)
+    return results
+
+
+def _omega_ratio_kernel(bounds,
+                        returns,
+                        risk_free=0.0,
+                        required_return=0.0,
+                        annualization=APPROX_BDAYS_PER_YEAR):
+    returns_less_thresh = _window_adjusted(returns, risk_free)
+    returns_less_thresh -= _omega_threshold(required_return, annualization)
+    gains = np.fmax(returns_less_thresh, 0.0)
+    losses = -np.fmin(returns_less_thresh, 0.0)
+
+    results = []
+    for (starts, ends), (n_gains, total_gains, n_losses, total_losses) in zip(
+            bounds,
+            _window_sums((gains > 0, gains, losses > 0, losses), bounds)):
+        # Windows without gains or losses are exactly 0, instead of the
+        # rounding error of differencing the cumulative sums.
+        total_gains[n_gains == 0] = 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = total_gains / total_losses
+        result[(n_losses == 0) | (ends - starts < 2)[:, np.newaxis]] = np.nan
+        results.append(result)
+    return results
+
+
+def _window_alpha_beta(bounds, returns, factor_returns, risk_free):
+    """Mean alpha series and beta of every window, see ``beta_aligned``.
+
+    Both only use the periods where neither input is missing.
+    """
+    dependent = _window_adjusted(returns, risk_free)
+    independent = _as_columns(
+        _window_adjusted(factor_returns, risk_free),
+        dependent.shape[1],
+    )
+    pairs = ~(np.isnan(dependent) | np.isnan(independent))
+    _, independent, ind_center = _centered(independent, pairs)
+    _, dependent, dep_center = _centered(dependent, pairs)
+    cross = independent * dependent
+    squares = np.square(independent)
+    tolerance = _sum_sq_tolerance(squares)
+
+    for count, ind_total, dep_total, cross_total, sq_total in _window_sums(
+            (pairs, independent, dependent, cross, squares), bounds):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ind_mean = ind_total / count
+            dep_mean = dep_total / count
+            covariance = cross_total / count - ind_mean * dep_mean
+
+            sum_sq_dev = sq_total - ind_total * ind_mean
+            sum_sq_dev[sum_sq_dev < tolerance] = 0
+            variance = sum_sq_dev / count
+            variance[~(variance >= 1.0e-30)] = np.nan
+
+            beta = covariance / variance
+            alpha_mean = (dep_mean + dep_center) - beta * (
+                ind_mean + ind_center
+            )
+        yield alpha_mean, beta
+
+
+def _beta_kernel(bounds, returns, factor_returns, risk_free=0.0):
+    return [
+        beta for _, beta in
+        _window_alpha_beta(bounds, returns, factor_returns, risk_free)
+    ]
+
+
+def _alpha_kernel(bounds,
+                  returns,
+                  factor_returns,
+                  risk_free=0.0,
+                  period=DAILY,
+                  annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    return [
+        np.power(alpha_mean + 1, ann_factor) - 1 for alpha_mean, _ in
+        _window_alpha_beta(bounds, returns, factor_returns, risk_free)
+    ]
+
+
+def _alpha_beta_kernel(bounds,
+                       returns,
+                       factor_returns,
+                       risk_free=0.0,
+                       period=DAILY,
+                       annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    return [
+        np.stack([np.power(alpha_mean + 1, ann_factor) - 1, beta], axis=-1)
+        for alpha_mean, beta in
+        _window_alpha_beta(bounds, returns, factor_returns, risk_free)
+    ]
+
+
+# Statistics which can be computed for many windows from windowed sums of a
+# single cumulative pass. Each kernel takes a list of ``(starts, ends)``
+# window bounds followed by the arguments of the statistic and returns one
+# (n_windows, N, ...) array per pair of bounds.
+_ROLLING_KERNELS = {
+    annual_return: _annual_return_kernel,
+    cagr: _annual_return_kernel,
+    sharpe_ratio: _sharpe_ratio_kernel,
+    annual_volatility: _annual_volatility_kernel,
+    downside_risk: _downside_risk_kernel,
+    sortino_ratio: _sortino_ratio_kernel,
+    excess_sharpe: _excess_sharpe_kernel,
+    omega_ratio: _omega_ratio_kernel,
+    alpha: _alpha_kernel,
+    alpha_aligned: _alpha_kernel,
+    beta: _beta_kernel,
+    beta_aligned: _beta_kernel,
+    alpha_beta_aligned: _alpha_beta_kernel,
+}
+
+
+def _expanding_bounds(n):
+    ends = np.arange(1, n + 1)
+    return [(np.zeros_like(ends), ends)]
+
+
+def _expanding_from_rolling_kernel(kernel):
+    """Evaluate a kernel of ``_ROLLING_KERNELS`` over the windows which
+    start at the first period and end at every period.
+    """
+    def expanding_kernel(returns, *args, **kwargs):
+        return kernel(_expanding_bounds(len(returns)), returns, *args,
+                      **kwargs)[0]
+    return expanding_kernel
+
+
+def _expanding_max_drawdown_kernel(returns):
+    return np.fmin.accumulate(_drawdown(_as_columns(returns)), axis=0)[1:]
+
+
+def _expanding_annual_return_kernel(returns, period=DAILY, annualization=None):
+    returns = _as_columns(returns)
+    ann_factor = annualization_factor(period, annualization)
+    ending_value = np.empty_like(returns)
+    cum_returns(returns, starting_value=1, out=ending_value)
+    num_years = np.arange(1, len(returns) + 1) / ann_factor
+    return ending_value ** (1 / num_years[:, np.newaxis]) - 1
+
+
+def _expanding_calmar_ratio_kernel(returns, period=DAILY, annualization=None):
+    max_dd = _expanding_max_drawdown_kernel(returns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = _expanding_annual_return_kernel(
+            returns,
+            period=period,
+            annualization=annualization,
+        ) / np.abs(max_dd)
+    result[~(max_dd < 0) | np.isinf(result)] = np.nan
+    return result
+
+
+def _statistic_series(kernel, arrays, out, kwargs):
+    """Evaluate a statistic at every period and wrap it like the input."""
+    values = [_flatten(a) for a in arrays]
+    n = min(len(v) for v in values)
+    if not n:
+        result = np.empty((0,) + np.shape(values[0])[1:])
+    else:
+        result = kernel(*[v[:n] for v in values], **kwargs)
+        if np.ndim(values[0]) == 1:
+            result = result[:, 0]
+
+    if out is not None:
+        out[()] = result
+        return out
+
+    head = arrays[0]
+    if isinstance(head, pd.Series):
+        index = head.index[:n]
+        if result.ndim == 1:
+            result = pd.Series(result, index=index)
+        else:
+            result = pd.DataFrame(result, index=index)
+    elif isinstance(head, pd.DataFrame):
+        index = head.index[:n]
+        if result.ndim == 2:
+            result = pd.DataFrame(result, index=index, columns=head.columns)
+        else:
+            result = pd.DataFrame(
+                result.reshape(n, -1),
+                index=index,
+                columns=pd.MultiIndex.from_product(
+                    [head.columns, range(result.shape[2])],
+                ),
+            )
+    return result
+
+
+def _create_unary_expanding_function(function, kernel):
+    def unary_expanding(returns, out=None, **kwargs):
+        """
+        Computes the {human_readable} measure since inception at every period.
+
+        The windows are served by a single cumulative pass over the data, so
+        the cost is linear in the number of periods.
+
+        Parameters
+        ----------
+        returns : pd.Series, pd.DataFrame or np.ndarray
+            Noncumulative returns of one or more strategies.
+        out : array-like, optional
+            Array to use as output buffer.
+            If not passed, a new array will be created.
+        **kwargs
+            Forwarded to :func:`~empyrical.{name}`.
+
+        Returns
+        -------
+        expanding_{name} : array-like
+            The {human_readable} of ``returns[:i + 1]`` at every row ``i``,
+            indexed like ``returns``.
+        """
+        _infer_kwargs(returns, kwargs)
+        return _statistic_series(kernel, (returns,), out, kwargs)
+
+    unary_expanding.__doc__ = unary_expanding.__doc__.format(
+        name=function.__name__,
+        human_readable=function.__name__.replace('_', ' '),
+    )
+    unary_expanding.__name__ = 'expanding_' + function.__name__
+
+    return unary_expanding
+
+
+def _create_binary_expanding_function(function, kernel):
+    def binary_expanding(returns, factor_returns, out=None, **kwargs):
+        """
+        Computes the {human_readable} measure since inception at every period.
+
+        The windows are served by a single cumulative pass over the data, so
+        the cost is linear in the number of periods.
+
+        Parameters
+        ----------
+        returns : pd.Series, pd.DataFrame or np.ndarray
+            Noncumulative returns of one or more strategies.
+        factor_returns : pd.Series or np.ndarray
+            Noncumulative returns of the factor to which beta is computed.
+            Two pd.Series are aligned on their index first, otherwise the
+            inputs must already be aligned.
+        out : array-like, optional
+            Array to use as output buffer.
+            If not passed, a new array will be created.
+        **kwargs
+            Forwarded to :func:`~empyrical.{name}`.
+
+        Returns
+        -------
+        expanding_{name} : array-like
+            The {human_readable} of ``returns[:i + 1]`` at every row ``i``,
+            indexed like ``returns``.
+        """
+        if (isinstance(returns, pd.Series) and
+                isinstance(factor_returns, pd.Series)):
+            returns, factor_returns = _aligned_series(returns, factor_returns)
+        _infer_kwargs(returns, kwargs)
+        return _statistic_series(
+            kernel,
+            (returns, factor_returns),
+            out,
+            kwargs,
+        )
+
+    binary_expanding.__doc__ = binary_expanding.__doc__.format(
+        name=function.__name__,
+        human_readable=function.__name__.replace('_', ' '),
+    )
+    binary_expanding.__name__ = 'expanding_' + function.__name__
+
+    return binary_expanding
+
+
+expanding_max_drawdown = _create_unary_expanding_function(
+    max_drawdown,
+    _expanding_max_drawdown_kernel,
+)
+expanding_annual_return = _create_unary_expanding_function(
+    annual_return,
+    _expanding_annual_return_kernel,
+)
+expanding_cagr = _create_unary_expanding_function(
+    cagr,
+    _expanding_annual_return_kernel,
+)
+expanding_calmar_ratio = _create_unary_expanding_function(
+    calmar_ratio,
+    _expanding_calmar_ratio_kernel,
+)
+expanding_annual_volatility = _create_unary_expanding_function(
+    annual_volatility,
+    _expanding_from_rolling_kernel(_annual_volatility_kernel),
+)
+expanding_sharpe_ratio = _create_unary_expanding_function(
+    sharpe_ratio,
+    _expanding_from_rolling_kernel(_sharpe_ratio_kernel),
+)
+expanding_sortino_ratio = _create_unary_expanding_function(
+    sortino_ratio,
+    _expanding_from_rolling_kernel(_sortino_ratio_kernel),
+)
+expanding_downside_risk = _create_unary_expanding_function(
+    downside_risk,
+    _expanding_from_rolling_kernel(_downside_risk_kernel),
+)
+expanding_excess_sharpe = _create_binary_expanding_function(
+    excess_sharpe,
+    _expanding_from_rolling_kernel(_excess_sharpe_kernel),
+)
+expanding_alpha = _create_binary_expanding_function(
+    alpha,
+    _expanding_from_rolling_kernel(_alpha_kernel),
+)
+expanding_beta = _create_binary_expanding_function(
+    beta,
+    _expanding_from_rolling_kernel(_beta_kernel),
+)
+expanding_alpha_beta = _create_binary_expanding_function(
+    alpha_beta,
+    _expanding_from_rolling_kernel(_alpha_beta_kernel),
+)
+
+
+def _ew_decay(halflife, span):
+    """Decay factor per period of exponentially weighted statistics.
+
+    Follows the parametrization of ``pd.DataFrame.ewm``.
+    """
+    if (halflife is None) == (span is None):
+        raise ValueError("Must pass exactly one of halflife and span")
+    if halflife is not None:
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        return np.exp(-np.log(2) / halflife)
+    if span < 1:
+        raise ValueError("span must be at least 1")
+    return 1 - 2.0 / (span + 1)
+
+
+def _ew_sums(terms, decay):
+    """Exponentially weighted running sums of (T, N) arrays.
+
+    Each sum is the recursive filter ``y[t] = x[t] + decay * y[t - 1]``,
+    evaluated in a single pass along the first axis.
+    """
+    return [lfilter([1.0], [1.0, -decay], term, axis=0) for term in terms]
+
+
+def _ew_mean_var(returns, decay):
+    """Exponentially weighted mean and bias corrected variance, which skip
+    missing returns like ``pd.DataFrame.ewm``.
+    """
+    valid, centered, center = _centered(returns)
+    valid = valid.astype('float64')
+    squares = np.square(centered)
+    weight, weight_sq = _ew_sums((valid,), decay) + _ew_sums(
+        (valid,), decay ** 2,
+    )
+    total, total_sq = _ew_sums((centered, squares), decay)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / weight
+        biased_var = np.maximum(total_sq / weight - np.square(mean), 0)
+        var = biased_var * np.square(weight) / (np.square(weight) - weight_sq)
+    var[~(np.square(weight) - weight_sq > 0)] = np.nan
+    return mean + center, var
+
+
+def _ew_annual_volatility_kernel(returns,
+                                 halflife=None,
+                                 span=None,
+                                 period=DAILY,
+                                 annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    _, var = _ew_mean_var(_as_columns(returns), _ew_decay(halflife, span))
+    return np.sqrt(var) * np.sqrt(ann_factor)
+
+
+def _ew_sharpe_ratio_kernel(returns,
+                            risk_free=0,
+                            halflife=None,
+                            span=None,
+                            period=DAILY,
+                            annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    mean, var = _ew_mean_var(
+        _window_adjusted(returns, risk_free),
+        _ew_decay(halflife, span),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return mean / np.sqrt(var) * np.sqrt(ann_factor)
+
+
+def _ew_downside_risk_kernel(returns,
+                             required_return=0,
+                             halflife=None,
+                             span=None,
+                             period=DAILY,
+                             annualization=None):
+    ann_factor = annualization_factor(period, annualization)
+    valid, _, _, downside = _downside_terms(returns, required_return)
+    weight, total_sq = _ew_sums(
+        (valid.astype('float64'), downside),
+        _ew_decay(halflife, span),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(total_sq / weight) * np.sqrt(ann_factor)
+
+
+def _ew_beta_kernel(returns,
+                    factor_returns,
+                    risk_free=0.0,
+                    halflife=None,
+                    span=None):
+    decay = _ew_decay(halflife, span)
+    dependent = _window_adjusted(returns, risk_free)
+    independent = _as_columns(
+        _window_adjusted(factor_returns, risk_free),
+        dependent.shape[1],
+    )
+    pairs = ~(np.isnan(dependent) | np.isnan(independent))
+    _, independent, _ = _centered(independent, pairs)
+    _, dependent, _ = _centered(dependent, pairs)
+
+    weight, ind_total, dep_total, cross_total, sq_total = _ew_sums(
+        (pairs.astype('float64'), independent, dependent,
+         independent * dependent, np.square(independent)),
+        decay,
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ind_mean = ind_total / weight
+        covariance = cross_total / weight - ind_mean * dep_total / weight
+        variance = sq_total / weight - np.square(ind_mean)
+        variance[~(variance >= 1.0e-30)] = np.nan
+        return covariance / variance
+
+
+_EW_PARAMETERS_DOC = """halflife : float, optional
+        Number of periods after which the weight of a return halves.
+    span : float, optional
+        Decay in terms of span, i.e. a weight of ``2 / (span + 1)`` for the
+        latest return. Pass exactly one of ``halflife`` and ``span``."""
+
+
+def ew_annual_volatility(returns,
+                         halflife=None,
+                         span=None,
+                         period=DAILY,
+                         annualization=None,
+                         out=None):
+    """
+    Determines the exponentially weighted annual volatility of a strategy at
+    every period, e.g. the RiskMetrics volatility for ``halflife`` 11.
+
+    The weighted moments are running sums of a recursive filter, so the cost
+    is O(T * N) without window sized temporaries. Missing returns are skipped
+    and the variance is bias corrected like ``pd.DataFrame.ewm(...).std()``.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Periodic returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    {ew_parameters}
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    ew_annual_volatility : array-like
+        The volatility at every period, indexed like ``returns``.
+    """
+    annualization = _annualization(returns, period, annualization)
+    return _statistic_series(
+        _ew_annual_volatility_kernel,
+        (returns,),
+        out,
+        dict(halflife=halflife, span=span, period=period,
+             annualization=annualization),
+    )
+
+
+def ew_sharpe_ratio(returns,
+                    risk_free=0,
+                    halflife=None,
+                    span=None,
+                    period=DAILY,
+                    annualization=None,
+                    out=None):
+    """
+    Determines the exponentially weighted Sharpe ratio of a strategy at every
+    period.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    risk_free : int, float
+        Constant daily risk-free return throughout the period.
+    {ew_parameters}
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    ew_sharpe_ratio : array-like
+        The Sharpe ratio at every period, indexed like ``returns``.
+
+    Note
+    -----
+    The mean and standard deviation are weighted like
+    :func:`~empyrical.stats.ew_annual_volatility`.
+    """
+    annualization = _annualization(returns, period, annualization)
+    return _statistic_series(
+        _ew_sharpe_ratio_kernel,
+        (returns,),
+        out,
+        dict(risk_free=risk_free, halflife=halflife, span=span,
+             period=period, annualization=annualization),
+    )
+
+
+def ew_downside_risk(returns,
+                     required_return=0,
+                     halflife=None,
+                     span=None,
+                     period=DAILY,
+                     annualization=None,
+                     out=None):
+    """
+    Determines the exponentially weighted downside deviation below a
+    threshold at every period.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    required_return: float / series
+        minimum acceptable return
+    {ew_parameters}
+    period : str, optional
+        Defines the periodicity of the 'returns' data for purposes of
+        annualizing. Value ignored if `annualization` parameter is specified.
+        Defaults are::
+
+            'monthly':12
+            'weekly': 52
+            'daily': 252
+
+    annualization : int, optional
+        Used to suppress default values available in `period` to convert
+        returns into annual returns. Value should be the annual frequency of
+        `returns`.
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    ew_downside_risk : array-like
+        The annualized downside deviation at every period, indexed like
+        ``returns``.
+    """
+    annualization = _annualization(returns, period, annualization)
+    return _statistic_series(
+        _ew_downside_risk_kernel,
+        (returns,),
+        out,
+        dict(required_return=required_return, halflife=halflife, span=span,
+             period=period, annualization=annualization),
+    )
+
+
+def ew_beta(returns,
+            factor_returns,
+            risk_free=0.0,
+            halflife=None,
+            span=None,
+            out=None):
+    """
+    Determines the exponentially weighted beta of one or more strategies
+    against a factor at every period.
+
+    Only the periods where neither input is missing carry weight, like
+    :func:`~empyrical.stats.beta_aligned`.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series or np.ndarray
+         Daily noncumulative returns of the factor to which beta is
+         computed. Usually a benchmark such as the market. Two pd.Series are
+         aligned on their index first, otherwise the inputs must already be
+         aligned.
+    risk_free : int, float, optional
+        Constant risk-free return throughout the period.
+    {ew_parameters}
+    out : array-like, optional
+        Array to use as output buffer.
+        If not passed, a new array will be created.
+
+    Returns
+    -------
+    ew_beta : array-like
+        The beta at every period, indexed like ``returns``.
+    """
+    if (isinstance(returns, pd.Series) and
+            isinstance(factor_returns, pd.Series)):
+        returns, factor_returns = _aligned_series(returns, factor_returns)
+    return _statistic_series(
+        _ew_beta_kernel,
+        (returns, factor_returns),
+        out,
+        dict(risk_free=risk_free, halflife=halflife, span=span),
+    )
+
+
+for _ew_function in (ew_annual_volatility,
+                     ew_sharpe_ratio,
+                     ew_downside_risk,
+                     ew_beta):
+    _ew_function.__doc__ = _ew_function.__doc__.format(
+        ew_parameters=_EW_PARAMETERS_DOC,
+    )
+del _ew_function
+
+# Number of elements of the gathered returns evaluated at once by default.
+RESAMPLE_CHUNK_ELEMENTS = 2 ** 22
+
+RESAMPLE_METHODS = ('iid', 'block', 'stationary')
+
+
+def _resample_indices(random_state, n_periods, length, n_samples, method,
+                      block_size):
+    """Draw the periods of ``n_samples`` resampled paths.
+
+    Parameters
+    ----------
+    random_state : np.random.RandomState
+        The source of randomness.
+    n_periods : int
+        Number of periods to draw from.
+    length : int
+        Number of periods of every path.
+    n_samples : int
+        Number of paths.
+    method : {'iid', 'block', 'stationary'}
+        'iid' draws every period independently, 'block' concatenates
+        blocks of ``block_size`` consecutive periods starting at random and
+        'stationary' draws blocks of random length with mean
+        ``block_size``, wrapping around the end of the history.
+    block_size : int
+        The (mean) length of the blocks.
+
+    Returns
+    -------
+    indices : np.ndarray
+        The (length, n_samples) positions of the periods of every path.
+    """
+    if method == 'iid' or block_size == 1:
+        return random_state.randint(0, n_periods, (length, n_samples))
+
+    time = np.arange(length)[:, np.newaxis]
+    if method == 'block':
+        block_size = min(block_size, n_periods)
+        n_blocks = -(-length // block_size)
+        starts = random_state.randint(
+            0,
+            n_periods - block_size + 1,
+            (n_blocks, n_samples),
+        )
+        return np.repeat(starts, block_size, axis=0)[:length] + (
+            time % block_size
+        )
+
+    # Every period starts a new block with probability 1 / block_size and
+    # otherwise continues the block started most recently.
+    new_block = random_state.random_sample((length, n_samples)) < (
+        1.0 / block_size
+    )
+    new_block[0] = True
+    starts = random_state.randint(0, n_periods, (length, n_samples))
+    block_start = np.maximum.accumulate(
+        np.where(new_block, time, 0),
+        axis=0,
+    )
+    return (
+        starts[block_start, np.arange(n_samples)] + time - block_start
+    ) % n_periods
+
+
+def _resample_chunks(random_state, n_samples, chunk_size):
+    """Split ``n_samples`` into chunks, each with its own seed.
+
+    The seeds are drawn up front so the result does not depend on the
+    order in which the chunks are evaluated.
+    """
+    if not isinstance(random_state, np.random.RandomState):
+        random_state = np.random.RandomState(random_state)
+    sizes = np.diff(np.r_[np.arange(0, n_samples, chunk_size), n_samples])
+    seeds = random_state.randint(
+        0,
+        np.iinfo('uint32').max,
+        len(sizes),
+        dtype='int64',
+    )
+    return list(zip(seeds, sizes))
+
+
+def _resample_block_size(block_size, n_periods):
+    """The cube root of the number of periods unless a size is given."""
+    if block_size is None:
+        return max(int(round(n_periods ** (1.0 / 3))), 1)
+    return block_size
+
+
+def _check_resample_method(method, block_size):
+    if method not in RESAMPLE_METHODS:
+        raise ValueError(
+            'method must be one of {}, got {!r}'.format(
+                RESAMPLE_METHODS, method,
+            ),
+        )
+    if block_size < 1:
+        raise ValueError(
+            'block_size must be at least 1, got {!r}'.format(block_size),
+        )
+
+
+def _bootstrap_chunk(stat, returns, factor_returns, method, block_size,
+                     kwargs, chunk):
+    seed, n_samples = chunk
+    n_periods, n_columns = returns.shape
+    indices = _resample_indices(
+        np.random.RandomState(seed),
+        n_periods,
+        n_periods,
+        n_samples,
+        method,
+        block_size,
+    )
+    # (T, n_samples, N) flattened so that every column of every sample is
+    # one column of the statistic.
+    arrays = [returns[indices].reshape(n_periods, -1)]
+    if factor_returns is not None:
+        factor_returns = factor_returns[indices]
+        if factor_returns.ndim == 2:
+            factor_returns = factor_returns[..., np.newaxis]
+        arrays.append(np.broadcast_to(
+            factor_returns,
+            (n_periods, n_samples, n_columns),
+        ).reshape(n_periods, -1))
+
+    result = np.asanyarray(stat(*arrays, **kwargs))
+    return result.reshape((n_samples, n_columns) + result.shape[1:])
+
+
+def bootstrap(stat,
+              returns,
+              factor_returns=None,
+              n_samples=1000,
+              block_size=None,
+              method='stationary',
+              random_state=None,
+              chunk_size=None,
+              n_jobs=1,
+              **kwargs):
+    """
+    Draws the bootstrap distribution of a statistic.
+
+    The periods of every sample are drawn at once as a matrix of indices,
+    and the statistic is evaluated on the gathered (T, n_samples) returns
+    through its vectorized 2-D code path instead of once per sample.
+
+    Parameters
+    ----------
+    stat : callable
+        The statistic, e.g. :func:`~empyrical.stats.sharpe_ratio`, which
+        must accept 2-D returns and reduce over their first axis. It is
+        called as ``stat(returns, **kwargs)``, or as
+        ``stat(returns, factor_returns, **kwargs)`` if ``factor_returns``
+        is passed.
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    factor_returns : pd.Series or np.ndarray, optional
+        Daily noncumulative returns of the factor, resampled alongside
+        ``returns`` on the same periods. Two pandas inputs are aligned on
+        their index first.
+    n_samples : int, optional
+        Number of bootstrap samples.
+    block_size : int, optional
+        The (mean) number of consecutive periods per block, which preserves
+        the serial dependence of the returns. Defaults to the cube root of
+        the number of periods.
+    method : {'stationary', 'block', 'iid'}, optional
+        'stationary' draws blocks of geometrically distributed length
+        (Politis and Romano), wrapping around the end of the history,
+        'block' draws blocks of fixed length (moving block bootstrap) and
+        'iid' draws every period independently.
+    random_state : int or np.random.RandomState, optional
+        Seed of the resampling, for reproducible results.
+    chunk_size : int, optional
+        Number of samples evaluated at once, which bounds the memory used by
+        the gathered returns. By default chunks hold about
+        ``RESAMPLE_CHUNK_ELEMENTS`` returns. Every chunk is seeded
+        separately, so the samples depend on the chunk size but not on
+        ``n_jobs``.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads evaluating the chunks.
+        See :func:`~empyrical.utils.map_chunks`.
+    **kwargs
+        Forwarded to ``stat``. Arrays aligned with ``returns``, e.g. a
+        time-varying ``risk_free``, are not resampled. ``period='infer'``
+        is resolved from the index of ``returns`` before resampling.
+
+    Returns
+    -------
+    samples : np.ndarray or pd.DataFrame
+        The statistic of every sample, of shape (n_samples,) for 1-D
+        ``returns`` and (n_samples, N) for N strategies, followed by the
+        axes of multi-valued statistics such as
+        :func:`~empyrical.stats.alpha_beta`. A pd.DataFrame input with a
+        single-valued statistic gives a pd.DataFrame with its columns.
+
+    Note
+    -----
+    Percentile confidence intervals follow from the samples, e.g.
+    ``np.nanpercentile(samples, [2.5, 97.5], axis=0)``.
+    """
+    if (isinstance(returns, (pd.Series, pd.DataFrame)) and
+            isinstance(factor_returns, pd.Series)):
+        returns, factor_returns = returns.align(factor_returns, axis=0)
+    if factor_returns is not None:
+        factor_returns = np.asanyarray(factor_returns, dtype='float64')
+
+    _infer_kwargs(returns, kwargs)
+    values = np.asanyarray(returns, dtype='float64')
+    columns = _as_columns(values)
+    n_periods, n_columns = columns.shape
+    if n_periods < 1:
+        raise ValueError('cannot bootstrap empty returns')
+    block_size = _resample_block_size(block_size, n_periods)
+    _check_resample_method(method, block_size)
+    if chunk_size is None:
+        chunk_size = RESAMPLE_CHUNK_ELEMENTS // (n_periods * n_columns)
+    chunk_size = max(min(chunk_size, n_samples), 1)
+
+    function = partial(
+        _bootstrap_chunk,
+        stat,
+        columns,
+        factor_returns,
+        method,
+        block_size,
+        kwargs,
+    )
+    samples = np.concatenate(map_chunks(
+        function,
+        _resample_chunks(random_state, n_samples, chunk_size),
+        n_jobs,
+    ))
+
+    if values.ndim == 1:
+        samples = samples[:, 0]
+    elif isinstance(returns, pd.DataFrame) and samples.ndim == 2:
+        samples = pd.DataFrame(samples, columns=returns.columns)
+    return samples
+
+
+def _simulate_drawdowns_chunk(returns, horizon, method, block_size, chunk):
+    seed, n_paths = chunk
+    n_periods, n_columns = returns.shape
+    indices = _resample_indices(
+        np.random.RandomState(seed),
+        n_periods,
+        horizon,
+        n_paths,
+        method,
+        block_size,
+    )
+    paths = returns[indices].reshape(horizon, -1)
+    return nanmin(_drawdown(paths), axis=0).reshape(n_paths, n_columns)
+
+
+def simulate_drawdowns(returns,
+                       horizon,
+                       n_paths=10000,
+                       method='iid',
+                       block_size=None,
+                       quantiles=(0.01, 0.05, 0.5),
+                       random_state=None,
+                       chunk_size=None,
+                       n_jobs=1):
+    """
+    Simulates the distribution of the max drawdown over a future horizon.
+
+    Paths of ``horizon`` returns are resampled from the history and the max
+    drawdown of every path is computed with the running peak of
+    :func:`~empyrical.stats.max_drawdown`, vectorized over the paths.
+
+    Parameters
+    ----------
+    returns : pd.Series, pd.DataFrame or np.ndarray
+        Daily returns of one or more strategies, noncumulative. The
+        strategies are resampled on the same periods, which keeps their
+        correlation.
+        - See full explanation in :func:`~empyrical.stats.cum_returns`.
+    horizon : int
+        Number of periods of every path.
+    n_paths : int, optional
+        Number of simulated paths.
+    method : {'iid', 'block', 'stationary'}, optional
+        How the returns are resampled, see
+        :func:`~empyrical.stats.bootstrap`.
+    block_size : int, optional
+        The (mean) number of consecutive periods per block. Defaults to the
+        cube root of the number of periods.
+    quantiles : float or sequence of float, optional
+        Quantiles of the max drawdowns to return. The low quantiles are the
+        severe drawdowns, e.g. 0.05 is the drawdown exceeded on 5% of the
+        paths. If None, the max drawdown of every path is returned.
+    random_state : int or np.random.RandomState, optional
+        Seed of the simulation, for reproducible results.
+    chunk_size : int, optional
+        Number of paths simulated at once, which bounds the memory used by
+        the paths. By default chunks hold about ``RESAMPLE_CHUNK_ELEMENTS``
+        returns. Every chunk is seeded separately, so the paths depend on
+        the chunk size but not on ``n_jobs``.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of threads simulating the chunks, or an executor such as a
+        ``ProcessPoolExecutor`` to spread millions of paths across
+        processes. See :func:`~empyrical.utils.map_chunks`.
+
+    Returns
+    -------
+    simulate_drawdowns : float, np.ndarray, pd.Series or pd.DataFrame
+        The quantiles of the max drawdown, with the quantiles first and the
+        strategies second. For pandas inputs they are labelled with the
+        quantiles and the columns of ``returns``.
+    """
+    values = np.asanyarray(returns, dtype='float64')
+    columns = _as_columns(values)
+    n_periods, n_columns = columns.shape
+    if n_periods < 1:
+        raise ValueError('cannot simulate drawdowns from empty returns')
+    block_size = _resample_block_size(block_size, n_periods)
+    _check_resample_method(method, block_size)
+    if chunk_size is None:
+        chunk_size = RESAMPLE_CHUNK_ELEMENTS // (horizon * n_columns)
+    chunk_size = max(min(chunk_size, n_paths), 1)
+
+    function = partial(
+        _simulate_drawdowns_chunk,
+        columns,
+        horizon,
+        method,
+        block_size,
+    )
+    drawdowns = np.concatenate(map_chunks(
+        function,
+        _resample_chunks(random_state, n_paths, chunk_size),
+        n_jobs,
+    ))
+    if values.ndim == 1:
+        drawdowns = drawdowns[:, 0]
+
+    if quantiles is None:
+        if isinstance(returns, pd.DataFrame):
+            return pd.DataFrame(drawdowns, columns=returns.columns)
+        return drawdowns
+
+    result = np.nanquantile(drawdowns, quantiles, axis=0)
+    if np.ndim(quantiles) == 0:
+        if isinstance(returns, pd.DataFrame):
+            return pd.Series(result, index=returns.columns)
+        return result if values.ndim > 1 else result.item()
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(result, index=quantiles, columns=returns.columns)
+    elif isinstance(returns, pd.Series):
+        return pd.Series(result, index=quantiles, name=returns.name)
+    return result
 
 
 SIMPLE_STAT_FUNCS = [
@@ -0,0 +1,136 @@
+from threading import Thread
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pandas as pd
+
+import empyrical
+from empyrical import memoize
+
+
+class MemoizeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = np.random.RandomState(1337)
+        self.returns = pd.Series(
+            rand.normal(0.001, 0.01, 500),
+            index=pd.date_range('2000-1-1', periods=500, tz='UTC'),
+        )
+        self.factor_returns = pd.Series(
+            rand.normal(0.001, 0.01, 500),
+            index=self.returns.index,
+        )
+
+    def test_hits_and_misses(self):
+        with empyrical.cache() as results:
+            first = empyrical.sharpe_ratio(self.returns)
+            second = empyrical.sharpe_ratio(self.returns)
+            empyrical.sharpe_ratio(self.returns, risk_free=0.0001)
+            empyrical.alpha_beta(self.returns, self.factor_returns)
+            empyrical.alpha_beta(self.returns, self.factor_returns)
+
+        self.assertEqual(first, second)
+        self.assertEqual(results.info(), (2, 3, 128, 3))
+
+    def test_inactive_outside_block(self):
+        with empyrical.cache() as results:
+            pass
+        empyrical.sharpe_ratio(self.returns)
+        empyrical.sharpe_ratio(self.returns)
+        self.assertEqual(results.info().currsize, 0)
+
+    def test_nested_calls_are_not_cached(self):
+        with empyrical.cache() as results:
+            empyrical.calmar_ratio(self.returns)
+            empyrical.max_drawdown(self.returns)
+        self.assertEqual(results.info(), (0, 2, 128, 2))
+
+    def test_changed_data(self):
+        returns = self.returns.values.copy()
+        with empyrical.cache() as results:
+            before = empyrical.max_drawdown(returns)
+            returns[-1] = -0.5
+            after = empyrical.max_drawdown(returns)
+
+        self.assertEqual(results.info().hits, 0)
+        self.assertNotEqual(before, after)
+        self.assertEqual(after, empyrical.max_drawdown(returns))
+
+    def test_results_are_copies(self):
+        with empyrical.cache():
+            first = empyrical.cum_returns(self.returns)
+            first[:] = 0
+            second = empyrical.cum_returns(self.returns)
+            second[:] = 0
+            third = empyrical.cum_returns(self.returns)
+
+        assert_allclose(third, empyrical.cum_returns(self.returns))
+
+    def test_out_is_not_cached(self):
+        returns = self.returns.values.reshape(-1, 1)
+        out = np.empty(1)
+        with empyrical.cache() as results:
+            empyrical.max_drawdown(returns, out=out)
+            empyrical.max_drawdown(returns, out=out)
+        self.assertEqual(results.info().currsize, 0)
+
+    def test_positional_out_is_not_cached(self):
+        returns = self.returns.values.reshape(-1, 1)
+        with empyrical.cache() as results:
+            empyrical.max_drawdown(returns)
+            out = np.zeros(1)
+            empyrical.max_drawdown(returns, out)
+        self.assertEqual(results.info().hits, 0)
+        assert_allclose(out, empyrical.max_drawdown(returns))
+
+    def test_defaults_share_results(self):
+        with empyrical.cache() as results:
+            empyrical.sharpe_ratio(self.returns)
+            empyrical.sharpe_ratio(self.returns, risk_free=0)
+        self.assertEqual(results.info(), (1, 1, 128, 1))
+
+    def test_unhashable_arguments_are_not_cached(self):
+        with empyrical.cache() as results:
+            empyrical.sortino_ratio(
+                self.returns.values,
+                required_return=[0] * len(self.returns),
+            )
+        self.assertEqual(results.info().currsize, 0)
+
+    def test_lru_eviction(self):
+        with empyrical.cache(maxsize=2) as results:
+            empyrical.annual_return(self.returns)
+            empyrical.annual_volatility(self.returns)
+            empyrical.annual_return(self.returns)
+            empyrical.sharpe_ratio(self.returns)
+            empyrical.annual_return(self.returns)
+            empyrical.annual_volatility(self.returns)
+
+        self.assertEqual(results.info(), (2, 4, 2, 2))
+
+    def test_shared_between_threads(self):
+        results = empyrical.cache()
+
+        def target():
+            with results:
+                empyrical.sharpe_ratio(self.returns)
+
+        threads = [Thread(target=target) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        self.assertEqual(results.info(), (1, 1, 128, 1))
+
+    def test_sampled_checksum(self):
+        xxhash = memoize.xxhash
+        memoize.xxhash = None
+        try:
+            array = np.arange(10000.0)
+            checksum = memoize._checksum(array)
+            self.assertEqual(checksum, memoize._checksum(array.copy()))
+            array[-1] = 0
+            self.assertNotEqual(checksum, memoize._checksum(array))
+        finally:
+            memoize.xxhash = xxhash
@@ -0,0 +1,248 @@
+import tracemalloc
+import unittest
+
+from parameterized import parameterized
+import numpy as np
+from numpy.testing import assert_allclose
+import pandas as pd
+
+import empyrical
+from empyrical import raw
+
+
+class RawTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = np.random.RandomState(1337)
+        self.returns = rand.normal(0.001, 0.01, (300, 4))
+        self.returns[[5, 17], 1] = np.nan
+        self.factor_returns = rand.normal(0.001, 0.01, 300)
+
+    @parameterized.expand([
+        ('cum_returns_final',),
+        ('max_drawdown',),
+        ('annual_return',),
+        ('cagr',),
+        ('annual_volatility',),
+        ('calmar_ratio',),
+        ('sharpe_ratio',),
+        ('sortino_ratio',),
+        ('downside_risk',),
+    ])
+    def test_matches_stats(self, name):
+        function = getattr(raw, name)
+        expected = [
+            getattr(empyrical, name)(pd.Series(column))
+            for column in self.returns.T
+        ]
+        assert_allclose(function(self.returns), expected, rtol=1e-12)
+
+        result = function(self.returns[:, 1])
+        self.assertIsInstance(result, np.float64)
+        assert_allclose(result, expected[1], rtol=1e-12)
+
+        out = np.empty(4)
+        self.assertIs(function(self.returns, out=out), out)
+        assert_allclose(out, expected, rtol=1e-12)
+
+    @parameterized.expand([
+        ('excess_sharpe', 'excess_sharpe'),
+        ('beta', 'beta_aligned'),
+        ('alpha', 'alpha_aligned'),
+    ])
+    def test_factor_matches_stats(self, name, stat):
+        expected = [
+            getattr(empyrical, stat)(column, self.factor_returns)
+            for column in self.returns.T
+        ]
+        assert_allclose(
+            getattr(raw, name)(self.returns, self.factor_returns),
+            expected,
+            rtol=1e-12,
+        )
+
+    def test_alpha_beta(self):
+        assert_allclose(
+            raw.alpha_beta(self.returns, self.factor_returns),
+            [
+                empyrical.alpha_beta(column, self.factor_returns)
+                for column in self.returns.T
+            ],
+            rtol=1e-12,
+        )
+
+    def test_cum_returns(self):
+        assert_allclose(
+            raw.cum_returns(self.returns, starting_value=100),
+            empyrical.cum_returns(
+                pd.DataFrame(self.returns), starting_value=100,
+            ).values,
+        )
+
+    def test_cum_log_returns(self):
+        expected = np.log1p(raw.cum_returns(self.returns))
+        assert_allclose(raw.cum_log_returns(self.returns), expected)
+
+        returns = np.tile(self.returns, (3, 1))
+        with raw.precision('float32'):
+            result = raw.cum_log_returns(returns.astype('float32'))
+        self.assertEqual(result.dtype, np.float32)
+        assert_allclose(
+            result, raw.cum_log_returns(returns), rtol=1e-5, atol=1e-6,
+        )
+
+    def test_short_returns(self):
+        self.assertTrue(np.isnan(raw.sharpe_ratio(self.returns[:1, 0])))
+        self.assertTrue(np.all(np.isnan(raw.max_drawdown(self.returns[:0]))))
+
+    def test_debug(self):
+        returns = self.returns[:, 0]
+        # Without validation, anything numpy accepts is evaluated.
+        raw.sharpe_ratio(returns.astype('float32'))
+
+        with raw.debug():
+            with self.assertRaises(TypeError):
+                raw.sharpe_ratio(returns.astype('float32'))
+            with self.assertRaises(TypeError):
+                raw.sharpe_ratio(pd.Series(returns))
+            with self.assertRaises(ValueError):
+                raw.beta(returns, self.factor_returns[:10])
+            with self.assertRaises(ValueError):
+                raw.sharpe_ratio(self.returns, out=np.empty(3))
+            raw.sharpe_ratio(returns)
+        self.assertFalse(raw._debug)
+
+    @parameterized.expand([
+        ('cum_returns_final',),
+        ('max_drawdown',),
+        ('annual_return',),
+        ('annual_volatility',),
+        ('calmar_ratio',),
+        ('sharpe_ratio',),
+        ('sortino_ratio',),
+        ('downside_risk',),
+    ])
+    def test_workspace(self, name):
+        function = getattr(raw, name)
+        workspace = raw.Workspace()
+        out = np.empty(4)
+        for returns in (self.returns, self.returns[::-1], self.returns[:50]):
+            function(returns, out=out[:returns.shape[1]], workspace=workspace)
+            assert_allclose(out, function(returns), rtol=1e-12)
+
+    def test_factor_workspace(self):
+        workspace = raw.Workspace()
+        out = np.empty((4, 2))
+        for _ in range(2):
+            raw.alpha_beta(
+                self.returns,
+                self.factor_returns,
+                out=out,
+                workspace=workspace,
+            )
+            assert_allclose(
+                out,
+                raw.alpha_beta(self.returns, self.factor_returns),
+                rtol=1e-12,
+            )
+
+    def test_workspace_allocations(self):
+        returns = np.tile(self.returns, (10, 50))
+        factor_returns = np.tile(self.factor_returns, 10)
+        workspace = raw.Workspace()
+        out = np.empty(returns.shape[1])
+        out2 = np.empty(returns.shape[1:] + (2,))
+
+        def evaluate():
+            raw.sharpe_ratio(returns, out=out, workspace=workspace)
+            raw.calmar_ratio(returns, out=out, workspace=workspace)
+            raw.sortino_ratio(returns, out=out, workspace=workspace)
+            raw.alpha_beta(returns, factor_returns, out=out2,
+                           workspace=workspace)
+
+        evaluate()
+        tracemalloc.start()
+        try:
+            evaluate()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Only the small temporaries of numpy's reductions remain.
+        self.assertLess(peak, returns.nbytes // 10)
+
+    @parameterized.expand([
+        ('cum_returns_final',),
+        ('max_drawdown',),
+        ('annual_return',),
+        ('annual_volatility',),
+        ('calmar_ratio',),
+        ('sharpe_ratio',),
+        ('sortino_ratio',),
+        ('downside_risk',),
+    ])
+    def test_float32(self, name):
+        function = getattr(raw, name)
+        # Longer than a block of rows compounded at a time.
+        returns = np.tile(self.returns, (3, 1))
+        expected = function(returns)
+        with raw.precision('float32'), raw.debug():
+            result = function(returns.astype('float32'))
+            self.assertEqual(result.dtype, np.float32)
+            assert_allclose(result, expected, rtol=1e-4)
+
+            stat = getattr(empyrical, name)(returns.astype('float32'))
+            self.assertEqual(stat.dtype, np.float32)
+            assert_allclose(stat, expected, rtol=1e-4)
+
+    def test_float32_factor(self):
+        expected = raw.alpha_beta(self.returns, self.factor_returns)
+        with raw.precision('float32'):
+            result = raw.alpha_beta(
+                self.returns.astype('float32'),
+                self.factor_returns,
+            )
+        self.assertEqual(result.dtype, np.float32)
+        assert_allclose(result, expected, rtol=1e-4)
+
+    def test_float32_cum_returns(self):
+        returns = np.tile(self.returns, (3, 1))
+        with raw.precision('float32'):
+            result = empyrical.cum_returns(
+                returns.astype('float32'),
+                starting_value=100,
+            )
+        self.assertEqual(result.dtype, np.float32)
+        assert_allclose(
+            result,
+            empyrical.cum_returns(returns, starting_value=100),
+            rtol=1e-5,
+        )
+
+    def test_precision(self):
+        returns = self.returns.astype('float32')
+        # By default, float32 returns are converted to float64.
+        self.assertEqual(empyrical.max_drawdown(returns).dtype, np.float64)
+
+        raw.precision('float32')
+        try:
+            self.assertEqual(
+                empyrical.max_drawdown(returns).dtype,
+                np.float32,
+            )
+            # Other dtypes are still converted to float64.
+            self.assertEqual(
+                empyrical.max_drawdown(returns.astype('float16')).dtype,
+                np.float64,
+            )
+            with raw.precision():
+                self.assertEqual(
+                    empyrical.max_drawdown(returns).dtype,
+                    np.float64,
+                )
+            self.assertEqual(raw._precision, 'float32')
+        finally:
+            raw.precision()
+
+        with self.assertRaises(ValueError):
+            raw.precision('float16')
+        self.assertEqual(raw._precision, 'float64')
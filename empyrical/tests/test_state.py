@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pandas as pd
+
+import empyrical
+from empyrical import MetricsState
+
+
+class MetricsStateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rand = np.random.RandomState(1337)
+        self.returns = pd.DataFrame(
+            rand.normal(0.0005, 0.01, (300, 4)),
+            columns=['a', 'b', 'c', 'd'],
+        )
+        self.returns.iloc[[3, 9], 1] = np.nan
+        self.returns.iloc[:50, 3] = np.nan
+        self.factor_returns = pd.Series(rand.normal(0.0004, 0.01, 300))
+        self.factor_returns.iloc[100] = np.nan
+
+    def expected(self, returns, factor_returns):
+        kwargs = dict(risk_free=0.0001)
+        downside_kwargs = dict(required_return=0.0002)
+        return pd.DataFrame({
+            column: [
+                empyrical.cum_returns_final(values),
+                empyrical.annual_return(values),
+                empyrical.annual_volatility(values),
+                empyrical.sharpe_ratio(values, **kwargs),
+                empyrical.sortino_ratio(values, **downside_kwargs),
+                empyrical.downside_risk(values, **downside_kwargs),
+                empyrical.max_drawdown(values),
+                empyrical.alpha_aligned(values, factor_returns, **kwargs),
+                empyrical.beta_aligned(values, factor_returns, **kwargs),
+                empyrical.capture(values, factor_returns),
+                empyrical.up_capture(values, factor_returns),
+                empyrical.down_capture(values, factor_returns),
+            ]
+            for column, values in (
+                (c, returns[c].values) for c in returns
+            )
+        }, index=[
+            'cum_returns_final',
+            'annual_return',
+            'annual_volatility',
+            'sharpe_ratio',
+            'sortino_ratio',
+            'downside_risk',
+            'max_drawdown',
+            'alpha',
+            'beta',
+            'capture',
+            'up_capture',
+            'down_capture',
+        ])
+
+    def state(self, rows):
+        return MetricsState.from_returns(
+            self.returns.iloc[:rows],
+            self.factor_returns.iloc[:rows],
+            risk_free=0.0001,
+            required_return=0.0002,
+        )
+
+    def test_from_returns(self):
+        state = self.state(300)
+        assert_allclose(
+            state.stats(),
+            self.expected(self.returns, self.factor_returns.values),
+            rtol=1e-9,
+        )
+
+    def test_append(self):
+        state = self.state(200)
+        for i in range(200, 300):
+            stats = state.append(
+                self.returns.values[i],
+                self.factor_returns.values[i],
+            )
+        state.append(self.returns.values[:0], self.factor_returns.values[:0])
+
+        self.assertEqual(state.n_periods, 300)
+        self.assertEqual(list(stats.columns), ['a', 'b', 'c', 'd'])
+        assert_allclose(
+            stats,
+            self.expected(self.returns, self.factor_returns.values),
+            rtol=1e-9,
+        )
+
+    def test_append_block(self):
+        state = self.state(200)
+        stats = state.append(
+            self.returns.values[200:],
+            self.factor_returns.values[200:],
+        )
+        assert_allclose(stats, self.state(300).stats(), rtol=1e-9)
+
+    def test_without_factor(self):
+        state = MetricsState.from_returns(self.returns['a'])
+        stats = state.append([0.01])
+        self.assertEqual(len(stats), 7)
+        assert_allclose(
+            stats.loc['sharpe_ratio', 'a'],
+            empyrical.sharpe_ratio(
+                np.append(self.returns['a'].values, 0.01),
+            ),
+        )
+
+        with self.assertRaises(ValueError):
+            self.state(10).append(self.returns.values[10])
+
+    def test_infer(self):
+        returns = self.returns.set_index(
+            pd.date_range('2000-01-01', periods=300, freq='W'),
+        )
+        state = MetricsState.from_returns(returns, period=empyrical.INFER)
+        assert_allclose(
+            state.stats(),
+            MetricsState.from_returns(returns, period='weekly').stats(),
+        )
+        with self.assertRaises(ValueError):
+            MetricsState(3, period=empyrical.INFER)
+
+    def test_empty(self):
+        stats = MetricsState(3).stats()
+        self.assertTrue(stats.isnull().all().all())
+
+    def test_save_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'state.npz')
+            state = self.state(200)
+            state.save(path)
+
+            loaded = MetricsState.load(path)
+            self.assertEqual(loaded.n_periods, 200)
+            assert_allclose(loaded.stats(), state.stats())
+
+            rows = (
+                self.returns.values[200:],
+                self.factor_returns.values[200:],
+            )
+            assert_allclose(loaded.append(*rows), state.append(*rows))
+            self.assertEqual(
+                list(loaded.stats().columns),
+                ['a', 'b', 'c', 'd'],
+            )
+        finally:
+            shutil.rmtree(directory)
@@ -1,12 +1,18 @@
 from __future__ import division
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from operator import attrgetter
-from unittest import TestCase, SkipTest
+import tracemalloc
+from unittest import TestCase, SkipTest, mock
 
 from parameterized import parameterized
 import numpy as np
-from numpy.testing import assert_almost_equal, assert_allclose
+from numpy.testing import (
+    assert_almost_equal,
+    assert_allclose,
+    assert_array_equal,
+)
 import pandas as pd
 from pandas.core.generic import NDFrame
 from scipy import stats
@@ -16,7 +22,7 @@ from six import iteritems, wraps
 #     from pandas.testing import assert_index_equal
 # except ImportError:
 # This moved in pandas 0.20.
-from pandas.testing import assert_index_equal
+from pandas.testing import assert_frame_equal, assert_index_equal
 
 import empyrical
 import empyrical.utils as emutils
@@ -171,6 +177,28 @@ class TestStats(BaseTestCase):
         assert_almost_equal(np.array(simple_returns), expected, 4)
         self.assert_indexes_match(simple_returns, prices.iloc[1:])
 
+    @parameterized.expand([
+        (flat_line_1, [0.0] * (flat_line_1.shape[0] - 1)),
+        (pos_line.iloc[1:], np.log(np.arange(2, 1000) / np.arange(1, 999))),
+    ])
+    def test_log_returns(self, prices, expected):
+        log_returns = self.empyrical.log_returns(prices)
+        assert_almost_equal(np.array(log_returns), expected, DECIMAL_PLACES)
+        self.assert_indexes_match(log_returns, prices.iloc[1:])
+
+    @parameterized.expand([
+        (mixed_returns,),
+        (negative_returns,),
+    ])
+    def test_cum_log_returns(self, returns):
+        cum_log_returns = self.empyrical.cum_log_returns(returns)
+        assert_almost_equal(
+            np.expm1(np.array(cum_log_returns)),
+            np.array(self.empyrical.cum_returns(returns)),
+            DECIMAL_PLACES,
+        )
+        self.assert_indexes_match(cum_log_returns, returns)
+
     @parameterized.expand([
         (empty_returns, 0, []),
         (mixed_returns, 0, [0.0, 0.01, 0.111, 0.066559, 0.08789, 0.12052,
@@ -1601,6 +1629,2056 @@ class Test2DStatsArrays(Test2DStats):
         pass
 
 
+class TestParallelColumns(BaseTestCase):
+    """
+    Tests that evaluating 2-D inputs with n_jobs gives the same results as
+    the serial code path.
+    """
+    returns = rand.normal(0.0005, 0.01, (250, 70))
+    returns[rand.randint(0, 250, 30), rand.randint(0, 70, 30)] = np.nan
+    factor_returns = rand.normal(0.0004, 0.01, 250)
+    factor_returns_2d = rand.normal(0.0004, 0.01, (250, 70))
+
+    @parameterized.expand([
+        ('sharpe_ratio', (returns,)),
+        ('annual_volatility', (returns,)),
+        ('downside_risk', (returns,)),
+        ('sortino_ratio', (returns,)),
+        ('max_drawdown', (returns,)),
+        ('excess_sharpe', (returns, factor_returns_2d)),
+        ('beta_aligned', (returns, factor_returns)),
+        ('alpha_aligned', (returns, factor_returns_2d)),
+        ('alpha_beta_aligned', (returns, factor_returns_2d)),
+    ])
+    def test_n_jobs_matches_serial(self, name, args):
+        function = getattr(empyrical, name)
+        expected = function(*args)
+
+        assert_allclose(function(*args, n_jobs=4), expected)
+        assert_allclose(function(*args, n_jobs=-1), expected)
+
+    def test_n_jobs_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        expected = empyrical.sharpe_ratio(self.returns)
+        with ThreadPoolExecutor(2) as executor:
+            result = empyrical.sharpe_ratio(self.returns, n_jobs=executor)
+        assert_allclose(result, expected)
+
+    def test_n_jobs_out(self):
+        out = np.empty(self.returns.shape[1])
+        result = empyrical.sharpe_ratio(self.returns, out=out, n_jobs=3)
+        self.assertIs(result, out)
+        assert_allclose(out, empyrical.sharpe_ratio(self.returns))
+
+    def test_n_jobs_dataframe(self):
+        returns = pd.DataFrame(self.returns)
+        result = empyrical.sortino_ratio(returns, n_jobs=2)
+        self.assertIsInstance(result, pd.Series)
+        assert_allclose(result, empyrical.sortino_ratio(returns))
+
+    def test_parallel_columns_chunk_size(self):
+        out = np.empty(self.returns.shape[1])
+        emutils.parallel_columns(
+            empyrical.sharpe_ratio, out, 2, self.returns, chunk_size=9,
+        )
+        assert_allclose(out, empyrical.sharpe_ratio(self.returns))
+
+
+class TestChunkedRoll(BaseTestCase):
+    """
+    Tests that evaluating the vectorized rolling functions in blocks of
+    windows gives the same results as evaluating all windows at once.
+    """
+    returns = pd.Series(
+        rand.normal(0.0005, 0.01, 300),
+        index=pd.date_range('2000-1-30', periods=300, freq='D'),
+    )
+    returns.iloc[rand.randint(0, 300, 10)] = np.nan
+    factor_returns = pd.Series(
+        rand.normal(0.0004, 0.01, 300),
+        index=returns.index,
+    )
+
+    @parameterized.expand([
+        ('roll_max_drawdown', 1),
+        ('roll_sharpe_ratio', 7),
+        ('roll_annual_volatility', 100),
+        ('roll_sortino_ratio', 1000),
+    ])
+    def test_unary_chunk_size(self, name, chunk_size):
+        function = getattr(empyrical, name)
+        expected = function(self.returns, window=21)
+        result = function(self.returns, window=21, chunk_size=chunk_size)
+
+        assert_allclose(result, expected)
+        self.assert_indexes_match(result, expected)
+
+    @parameterized.expand([
+        ('roll_beta', 5),
+        ('roll_alpha_aligned', 64),
+        ('roll_alpha_beta_aligned', 13),
+    ])
+    def test_binary_chunk_size(self, name, chunk_size):
+        function = getattr(empyrical, name)
+        expected = function(self.returns, self.factor_returns, window=21)
+        result = function(
+            self.returns,
+            self.factor_returns,
+            window=21,
+            chunk_size=chunk_size,
+        )
+
+        assert_allclose(result, expected)
+        self.assert_indexes_match(result, expected)
+
+    def test_max_memory(self):
+        expected = empyrical.roll_max_drawdown(self.returns, window=60)
+        # Room for roughly ten windows per block.
+        result = empyrical.roll_max_drawdown(
+            self.returns,
+            window=60,
+            max_memory=10 * 60 * 8 * empyrical.stats.ROLL_TEMPORARIES,
+        )
+        assert_allclose(result, expected)
+
+    def test_chunk_size_out(self):
+        out = np.empty(len(self.returns) - 20)
+        result = empyrical.roll_sharpe_ratio(
+            self.returns.values, window=21, out=out, chunk_size=50,
+        )
+        self.assertIs(result, out)
+        assert_allclose(
+            out,
+            empyrical.roll_sharpe_ratio(self.returns.values, window=21),
+        )
+
+
+class TestMultipleWindows(BaseTestCase):
+    """
+    Tests that passing several windows to the rolling functions gives the
+    same results as rolling over each window separately.
+    """
+    windows = [5, 21, 63]
+
+    returns = pd.Series(
+        rand.normal(0.0005, 0.01, 300),
+        index=pd.date_range('2000-1-30', periods=300, freq='D'),
+    )
+    returns.iloc[rand.randint(0, 300, 10)] = np.nan
+    factor_returns = pd.Series(
+        rand.normal(0.0004, 0.01, 300),
+        index=returns.index,
+    )
+    factor_returns.iloc[rand.randint(0, 300, 5)] = np.nan
+
+    def assert_windows_match(self, result, function, *args, **kwargs):
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(
+            result.index,
+            args[0].index[min(self.windows) - 1:],
+        )
+        for window in self.windows:
+            expected = function(*args, window=window, **kwargs)
+            assert_allclose(
+                result[window].iloc[window - min(self.windows):],
+                expected,
+                rtol=1e-9,
+            )
+            self.assertTrue(
+                result[window].iloc[:window - min(self.windows)].isnull().all()
+            )
+
+    @parameterized.expand([
+        ('roll_sharpe_ratio', {}),
+        ('roll_sharpe_ratio', {'risk_free': 0.0001}),
+        ('roll_annual_volatility', {'period': empyrical.WEEKLY}),
+        ('roll_sortino_ratio', {'required_return': 0.001}),
+        ('roll_max_drawdown', {}),
+    ])
+    def test_unary_windows(self, name, kwargs):
+        function = getattr(empyrical, name)
+        result = function(self.returns, window=self.windows, **kwargs)
+        self.assert_windows_match(result, function, self.returns, **kwargs)
+
+    @parameterized.expand([
+        ('roll_beta',),
+        ('roll_alpha',),
+        ('roll_alpha_aligned',),
+        ('roll_up_capture',),
+        ('roll_down_capture',),
+        ('roll_up_down_capture',),
+    ])
+    def test_binary_windows(self, name):
+        function = getattr(empyrical, name)
+        result = function(
+            self.returns,
+            self.factor_returns,
+            window=self.windows,
+        )
+        self.assert_windows_match(
+            result,
+            function,
+            self.returns,
+            self.factor_returns,
+        )
+
+    def test_alpha_beta_windows(self):
+        result = empyrical.roll_alpha_beta(
+            self.returns,
+            self.factor_returns,
+            window=self.windows,
+        )
+        for window in self.windows:
+            expected = empyrical.roll_alpha_beta(
+                self.returns,
+                self.factor_returns,
+                window=window,
+            )
+            assert_allclose(
+                result[window].iloc[window - min(self.windows):],
+                expected,
+                rtol=1e-9,
+            )
+
+    def test_ndarray_windows(self):
+        result = empyrical.roll_sharpe_ratio(
+            self.returns.values,
+            window=self.windows,
+        )
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(
+            result.shape,
+            (len(self.returns) - min(self.windows) + 1, len(self.windows)),
+        )
+
+    @parameterized.expand([
+        ('roll_sharpe_ratio', ()),
+        ('roll_beta', ('factor_returns',)),
+    ])
+    def test_dataframe_windows(self, name, factor_names):
+        function = getattr(empyrical, name)
+        returns = pd.DataFrame({'a': self.returns, 'b': -self.returns})
+        factors = [getattr(self, factor) for factor in factor_names]
+        result = function(returns, *factors, window=self.windows)
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(
+            result.columns,
+            pd.MultiIndex.from_product([self.windows, returns.columns]),
+        )
+        assert_index_equal(
+            result.index,
+            returns.index[min(self.windows) - 1:],
+        )
+        for window in self.windows:
+            for column in returns.columns:
+                assert_allclose(
+                    result[window, column].iloc[window - min(self.windows):],
+                    function(returns[column], *factors, window=window),
+                    rtol=1e-9,
+                )
+
+    def test_ndarray_capture_windows(self):
+        returns = self.returns.values[:80]
+        factor_returns = self.factor_returns.values[:80]
+        result = empyrical.roll_up_capture(
+            returns,
+            factor_returns,
+            window=self.windows,
+        )
+        self.assertEqual(result.shape, (76, 3))
+        for i, window in enumerate(self.windows):
+            self.assertTrue(
+                np.isnan(result[:window - min(self.windows), i]).all()
+            )
+            assert_allclose(
+                result[window - min(self.windows):, i],
+                empyrical.roll_up_capture(
+                    returns,
+                    factor_returns,
+                    window=window,
+                ),
+                rtol=1e-9,
+            )
+
+    def test_windows_longer_than_returns(self):
+        result = empyrical.roll_sharpe_ratio(self.returns[:10],
+                                             window=self.windows)
+        self.assertEqual(result.shape, (6, 3))
+        self.assertTrue(result[21].isnull().all())
+        self.assertTrue(result[63].isnull().all())
+
+
+class TestTimeWindows(BaseTestCase):
+    """
+    Tests for rolling over time spans of an irregular DatetimeIndex.
+    """
+    index = pd.bdate_range('2010-01-04', periods=400, tz='UTC')
+    # Drop some sessions to mimic holidays and suspended trading.
+    index = index.delete(rand.choice(400, 60, replace=False))
+
+    returns = pd.Series(rand.normal(0.0005, 0.01, len(index)), index=index)
+    returns.iloc[rand.randint(0, len(index), 5)] = np.nan
+    factor_returns = pd.Series(
+        rand.normal(0.0004, 0.01, len(index)),
+        index=index,
+    )
+
+    def brute_force(self, function, window, *args):
+        offset = emutils.window_offset(window)
+        result = []
+        for dt in self.index:
+            in_window = (self.index > dt - offset) & (self.index <= dt)
+            result.append(function(*[a.values[in_window] for a in args]))
+        return np.array(result)
+
+    @parameterized.expand([
+        ('days', '90D'),
+        ('months', '6M'),
+        ('quarters', '2Q'),
+        ('years', '1Y'),
+        ('timedelta', pd.Timedelta(days=30)),
+    ])
+    def test_time_window_starts(self, _, window):
+        starts = emutils.time_window_starts(self.index, window)
+        offset = emutils.window_offset(window)
+        expected = [
+            np.flatnonzero(self.index > dt - offset)[0] for dt in self.index
+        ]
+        np.testing.assert_array_equal(starts, expected)
+
+    @parameterized.expand([
+        ('roll_sharpe_ratio', 'sharpe_ratio', '90D'),
+        ('roll_annual_volatility', 'annual_volatility', '6M'),
+        ('roll_sortino_ratio', 'sortino_ratio', '3M'),
+        ('roll_max_drawdown', 'max_drawdown', '6M'),
+        ('roll_cagr', 'cagr', '30D'),
+        ('roll_downsize_risk', 'downside_risk', '2M'),
+        ('roll_omega_ratio', 'omega_ratio', '90D'),
+    ])
+    def test_unary_time_window(self, roll_name, name, window):
+        result = getattr(empyrical.stats, roll_name)(
+            self.returns, window=window,
+        )
+        expected = self.brute_force(
+            getattr(empyrical, name),
+            window,
+            self.returns,
+        )
+
+        self.assertIsInstance(result, pd.Series)
+        assert_index_equal(result.index, self.index)
+        assert_allclose(result.values, expected, rtol=1e-9)
+
+    @parameterized.expand([
+        ('roll_beta', 'beta_aligned'),
+        ('roll_beta_aligned', 'beta_aligned'),
+        ('roll_alpha', 'alpha_aligned'),
+        ('roll_alpha_aligned', 'alpha_aligned'),
+        ('roll_alpha_beta_aligned', 'alpha_beta_aligned'),
+        ('roll_excess_sharpe', 'excess_sharpe'),
+    ])
+    def test_binary_time_window(self, roll_name, name):
+        result = getattr(empyrical.stats, roll_name)(
+            self.returns,
+            self.factor_returns,
+            window='90D',
+        )
+        expected = self.brute_force(
+            getattr(empyrical, name),
+            '90D',
+            self.returns,
+            self.factor_returns,
+        )
+        assert_allclose(np.asarray(result), expected, rtol=1e-9)
+
+    def test_cagr_time_window_total_loss(self):
+        returns = self.returns.copy()
+        returns.iloc[100] = -1.0
+        assert_allclose(
+            empyrical.stats.roll_cagr(returns, window='30D').values,
+            self.brute_force(empyrical.cagr, '30D', returns),
+            rtol=1e-9,
+        )
+
+    def test_max_drawdown_time_window_chunked(self):
+        expected = empyrical.roll_max_drawdown(self.returns, window='6M')
+        result = empyrical.roll_max_drawdown(
+            self.returns,
+            window='6M',
+            chunk_size=37,
+        )
+        assert_allclose(result, expected)
+
+    def test_time_window_copies_bounded(self):
+        index = pd.bdate_range('2000-01-03', periods=5000)
+        returns = pd.Series(rand.normal(0.0005, 0.01, 5000), index=index)
+        # Max drawdown has no kernel, so the windows are copied out.
+        expected = empyrical.roll_max_drawdown(
+            returns,
+            window='2Y',
+            chunk_size=5000,
+        )
+
+        with mock.patch.object(empyrical.stats, 'ROLL_CHUNK_ELEMENTS',
+                               2 ** 16):
+            tracemalloc.start()
+            try:
+                result = empyrical.roll_max_drawdown(returns, window='2Y')
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        assert_allclose(result, expected)
+        # A copy of all windows would take 5000 * 523 * 8 bytes.
+        self.assertLess(peak, 5000 * 523 * 8 // 4)
+
+    def test_multiple_time_windows(self):
+        result = empyrical.roll_annual_volatility(
+            self.returns,
+            window=['1M', '3M'],
+        )
+        self.assertEqual(list(result.columns), ['1M', '3M'])
+        for window in result.columns:
+            assert_allclose(
+                result[window],
+                empyrical.roll_annual_volatility(self.returns, window=window),
+            )
+
+    def test_time_window_requires_datetime_index(self):
+        with self.assertRaises(ValueError):
+            empyrical.roll_sharpe_ratio(self.returns.values, window='90D')
+        with self.assertRaises(ValueError):
+            empyrical.roll_sharpe_ratio(
+                self.returns.reset_index(drop=True),
+                window='90D',
+            )
+
+
+class TestExpanding(BaseTestCase):
+    """
+    Tests for the since-inception variants of the statistics.
+    """
+    index = pd.date_range('2000-1-1', periods=300, freq='D')
+    returns = pd.Series(rand.normal(0.001, 0.01, 300), index=index)
+    returns.iloc[[0, 5, 50]] = np.nan
+    factor_returns = pd.Series(rand.normal(0.001, 0.01, 300), index=index)
+    factor_returns.iloc[7] = np.nan
+    returns_2d = pd.DataFrame(
+        rand.normal(0.001, 0.01, (300, 3)),
+        index=index,
+        columns=['a', 'b', 'c'],
+    )
+
+    @parameterized.expand([
+        ('max_drawdown',),
+        ('annual_return',),
+        ('calmar_ratio',),
+        ('annual_volatility',),
+        ('sharpe_ratio',),
+        ('sortino_ratio',),
+        ('downside_risk',),
+    ])
+    def test_unary(self, name):
+        result = getattr(empyrical, 'expanding_' + name)(self.returns)
+        expected = [
+            getattr(empyrical, name)(self.returns.values[:i + 1])
+            for i in range(len(self.returns))
+        ]
+
+        self.assertIsInstance(result, pd.Series)
+        assert_index_equal(result.index, self.index)
+        assert_allclose(result.values, expected, rtol=1e-9, atol=1e-12)
+
+    @parameterized.expand([
+        ('excess_sharpe',),
+        ('alpha',),
+        ('beta',),
+        ('alpha_beta',),
+    ])
+    def test_binary(self, name):
+        result = getattr(empyrical, 'expanding_' + name)(
+            self.returns,
+            self.factor_returns,
+        )
+        expected = [
+            getattr(empyrical, name)(
+                self.returns.values[:i + 1],
+                self.factor_returns.values[:i + 1],
+            )
+            for i in range(len(self.returns))
+        ]
+
+        assert_index_equal(result.index, self.index)
+        assert_allclose(
+            np.asarray(result, dtype='float64'),
+            np.asarray(expected, dtype='float64'),
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+    def test_one_observation(self):
+        returns = pd.Series([0.01, 0.02, -0.01], index=self.index[:3])
+        factor_returns = pd.Series([0.0, 0.005, 0.0], index=self.index[:3])
+        self.assertTrue(np.isnan(
+            empyrical.excess_sharpe(returns.values[:1],
+                                    factor_returns.values[:1])
+        ))
+        self.assertTrue(np.isnan(
+            empyrical.excess_sharpe(np.array([np.nan, 0.01]), np.zeros(2))
+        ))
+
+        result = empyrical.expanding_excess_sharpe(returns, factor_returns)
+        self.assertTrue(np.isnan(result.iloc[0]))
+        assert_allclose(
+            result.iloc[1:],
+            [empyrical.excess_sharpe(returns.values[:i],
+                                     factor_returns.values[:i])
+             for i in (2, 3)],
+        )
+
+        result = empyrical.stats.roll_excess_sharpe(
+            returns,
+            factor_returns,
+            window=[1, 2],
+        )
+        self.assertTrue(result[1].isnull().all())
+        self.assertFalse(result[2].iloc[1:].isnull().any())
+
+    def test_2d(self):
+        result = empyrical.expanding_sharpe_ratio(self.returns_2d)
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(result.columns, self.returns_2d.columns)
+        for column in self.returns_2d:
+            assert_allclose(
+                result[column],
+                empyrical.expanding_sharpe_ratio(self.returns_2d[column]),
+            )
+
+        result = empyrical.expanding_max_drawdown(self.returns_2d.values)
+        self.assertEqual(result.shape, self.returns_2d.shape)
+        assert_allclose(result[-1], empyrical.max_drawdown(self.returns_2d))
+
+    def test_out(self):
+        out = np.empty(len(self.returns))
+        result = empyrical.expanding_beta(
+            self.returns.values,
+            self.factor_returns.values,
+            risk_free=0.0001,
+            out=out,
+        )
+        self.assertIs(result, out)
+        assert_allclose(
+            out,
+            empyrical.expanding_beta(self.returns, self.factor_returns),
+        )
+
+    def test_empty(self):
+        result = empyrical.expanding_sharpe_ratio(self.returns.iloc[:0])
+        self.assertEqual(len(result), 0)
+
+
+class TestExponentiallyWeighted(BaseTestCase):
+    """
+    Tests for the exponentially weighted statistics against ``ewm``.
+    """
+    index = pd.date_range('2000-1-1', periods=500, freq='D')
+    returns = pd.DataFrame(
+        rand.normal(0.001, 0.01, (500, 3)),
+        index=index,
+        columns=['a', 'b', 'c'],
+    )
+    returns.iloc[[0, 5, 50], 0] = np.nan
+    returns.iloc[100:110, 1] = np.nan
+    factor_returns = pd.Series(rand.normal(0.001, 0.01, 500), index=index)
+
+    @parameterized.expand([
+        ('halflife', dict(halflife=11)),
+        ('span', dict(span=30)),
+    ])
+    def test_annual_volatility(self, _, decay):
+        result = empyrical.ew_annual_volatility(self.returns, **decay)
+        expected = self.returns.ewm(**decay).std() * np.sqrt(252)
+
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(result.index, self.index)
+        assert_allclose(result, expected, rtol=1e-9)
+
+    @parameterized.expand([
+        ('halflife', dict(halflife=11)),
+        ('span', dict(span=30)),
+    ])
+    def test_sharpe_ratio(self, _, decay):
+        result = empyrical.ew_sharpe_ratio(self.returns, **decay)
+        weighted = self.returns.ewm(**decay)
+        expected = weighted.mean() / weighted.std() * np.sqrt(252)
+        assert_allclose(result, expected, rtol=1e-9)
+
+    def test_downside_risk(self):
+        result = empyrical.ew_downside_risk(self.returns.values, span=30)
+        expected = np.sqrt(
+            np.minimum(self.returns, 0).pow(2).ewm(span=30).mean() * 252
+        )
+        assert_allclose(result, expected, rtol=1e-9)
+
+    def test_beta(self):
+        returns = self.returns['a']
+        result = empyrical.ew_beta(returns, self.factor_returns, halflife=11)
+
+        factor_returns = self.factor_returns.where(returns.notnull())
+        expected = (
+            returns.ewm(halflife=11).cov(factor_returns) /
+            factor_returns.ewm(halflife=11).var()
+        )
+
+        self.assertIsInstance(result, pd.Series)
+        assert_allclose(result, expected, rtol=1e-9)
+
+    def test_out(self):
+        out = np.empty(self.returns.shape)
+        result = empyrical.ew_beta(
+            self.returns.values,
+            self.factor_returns.values,
+            span=30,
+            out=out,
+        )
+        self.assertIs(result, out)
+        for i, column in enumerate(self.returns):
+            assert_allclose(
+                out[:, i],
+                empyrical.ew_beta(
+                    self.returns[column],
+                    self.factor_returns,
+                    span=30,
+                ),
+            )
+
+    def test_decay_arguments(self):
+        with self.assertRaises(ValueError):
+            empyrical.ew_annual_volatility(self.returns)
+        with self.assertRaises(ValueError):
+            empyrical.ew_annual_volatility(self.returns, halflife=5, span=5)
+
+
+class TestMultiFactor(BaseTestCase):
+    """
+    Tests for regressions on several factors at once.
+    """
+    index = pd.date_range('2000-1-1', periods=300, freq='D')
+    factor_returns = pd.DataFrame(
+        rand.normal(0.0, 0.01, (300, 3)),
+        index=index,
+        columns=['mkt', 'smb', 'hml'],
+    )
+    returns = pd.DataFrame(
+        factor_returns.values.dot(rand.normal(1.0, 0.3, (3, 5))) +
+        rand.normal(0.0003, 0.005, (300, 5)),
+        index=index,
+        columns=['a', 'b', 'c', 'd', 'e'],
+    )
+    returns.iloc[[3, 9], [1, 2]] = np.nan
+    returns.iloc[:280, 4] = np.nan
+    factor_returns.iloc[20, 1] = np.nan
+
+    def test_multi_factor_alpha_beta(self):
+        result = empyrical.multi_factor_alpha_beta(
+            self.returns,
+            self.factor_returns,
+        )
+
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(result.index, self.returns.columns)
+        self.assertEqual(list(result.columns), ['alpha', 'mkt', 'smb', 'hml'])
+
+        for column in self.returns:
+            rows = (self.returns[column].notnull() &
+                    self.factor_returns.notnull().all(axis=1))
+            design = np.column_stack([
+                np.ones(rows.sum()),
+                self.factor_returns[rows].values,
+            ])
+            expected = np.linalg.lstsq(
+                design,
+                self.returns.loc[rows, column].values,
+                rcond=None,
+            )[0]
+            expected[0] = (1 + expected[0]) ** 252 - 1
+            assert_allclose(result.loc[column], expected, rtol=1e-9)
+
+    def test_single_factor(self):
+        returns = self.returns['a']
+        factor_returns = self.factor_returns['mkt']
+        result = empyrical.multi_factor_alpha_beta(returns, factor_returns)
+
+        self.assertIsInstance(result, pd.Series)
+        assert_allclose(
+            result.values,
+            empyrical.alpha_beta(returns, factor_returns),
+            rtol=1e-9,
+        )
+
+    def test_ndarray(self):
+        result = empyrical.multi_factor_alpha_beta(
+            self.returns.values,
+            self.factor_returns.values,
+            risk_free=0.0001,
+        )
+        expected = empyrical.multi_factor_alpha_beta(
+            self.returns,
+            self.factor_returns,
+            risk_free=0.0001,
+        )
+        self.assertEqual(result.shape, (5, 4))
+        assert_allclose(result, expected)
+
+        out = np.empty(4)
+        result = empyrical.multi_factor_alpha_beta(
+            self.returns.values[:, 0],
+            self.factor_returns.values,
+            risk_free=0.0001,
+            out=out,
+        )
+        self.assertIs(result, out)
+        assert_allclose(out, expected.iloc[0])
+
+    @parameterized.expand([
+        ('refactor_every_window', None),
+        ('few_refactors', 100),
+        ('every_step', 1),
+    ])
+    def test_roll_multi_factor_beta(self, _, refactor_every):
+        window = 60
+        result = empyrical.roll_multi_factor_beta(
+            self.returns,
+            self.factor_returns,
+            window,
+            refactor_every=refactor_every,
+        )
+
+        n_windows = len(self.returns) - window + 1
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(result.index, self.index[window - 1:])
+        assert_index_equal(
+            result.columns,
+            pd.MultiIndex.from_product(
+                [self.returns.columns, self.factor_returns.columns],
+            ),
+        )
+
+        expected = [
+            empyrical.multi_factor_alpha_beta(
+                self.returns.iloc[i:i + window],
+                self.factor_returns.iloc[i:i + window],
+            ).iloc[:, 1:].values
+            for i in range(n_windows)
+        ]
+        assert_allclose(
+            result.values.reshape(n_windows, 5, 3),
+            expected,
+            rtol=1e-7,
+            atol=1e-10,
+        )
+
+    def test_roll_multi_factor_beta_ndarray(self):
+        result = empyrical.roll_multi_factor_beta(
+            self.returns.values[:, 0],
+            self.factor_returns.values,
+            60,
+        )
+        expected = empyrical.roll_multi_factor_beta(
+            self.returns['a'],
+            self.factor_returns,
+            60,
+        )
+        self.assertEqual(result.shape, (241, 3))
+        assert_allclose(result, expected)
+
+        result = empyrical.roll_multi_factor_beta(
+            self.returns.values,
+            self.factor_returns.values,
+            len(self.returns) + 1,
+        )
+        self.assertEqual(result.shape, (0, 5, 3))
+
+    def test_roll_multi_factor_beta_collinear(self):
+        factor_returns = self.factor_returns.values.copy()
+        factor_returns[:100, 1] = factor_returns[:100, 0]
+        result = empyrical.roll_multi_factor_beta(
+            self.returns.values[:, 0],
+            factor_returns,
+            60,
+        )
+        self.assertTrue(np.isnan(result[:41]).all())
+        self.assertFalse(np.isnan(result[100:]).any())
+
+    def test_too_few_periods(self):
+        result = empyrical.multi_factor_alpha_beta(
+            self.returns.iloc[:3],
+            self.factor_returns.iloc[:3],
+        )
+        self.assertTrue(result.isnull().all().all())
+
+
+class TestPairwiseMatrix(BaseTestCase):
+    """
+    Tests for the statistics of every pair of a strategy and a factor.
+    """
+    index = pd.date_range('2000-1-1', periods=300, freq='D')
+    factor_returns = pd.DataFrame(
+        rand.normal(0.0, 0.01, (300, 3)),
+        index=index,
+        columns=['csi300', 'csi500', 'csi1000'],
+    )
+    returns = pd.DataFrame(
+        factor_returns.values.dot(rand.normal(1.0, 0.3, (3, 5))) +
+        rand.normal(0.0, 0.005, (300, 5)),
+        index=index,
+        columns=['a', 'b', 'c', 'd', 'e'],
+    )
+    returns.iloc[[3, 9], 1] = np.nan
+    returns.iloc[:280, 4] = np.nan
+    factor_returns.iloc[120, 1] = np.nan
+
+    def test_beta_matrix(self):
+        result = empyrical.beta_matrix(self.returns, self.factor_returns)
+
+        self.assertIsInstance(result, pd.DataFrame)
+        assert_index_equal(result.index, self.returns.columns)
+        assert_index_equal(result.columns, self.factor_returns.columns)
+        for column, returns in self.returns.items():
+            for factor, factor_returns in self.factor_returns.items():
+                both = returns.notnull() & factor_returns.notnull()
+                assert_allclose(
+                    result.loc[column, factor],
+                    empyrical.beta(returns[both], factor_returns[both]),
+                    rtol=1e-9,
+                )
+
+    def test_correlation_matrix(self):
+        result = empyrical.correlation_matrix(
+            self.returns,
+            self.factor_returns,
+        )
+        expected = pd.concat([self.returns, self.factor_returns], axis=1)
+        expected = expected.corr().loc[
+            self.returns.columns,
+            self.factor_returns.columns,
+        ]
+        assert_allclose(result, expected, rtol=1e-9)
+
+    def test_1d(self):
+        expected = empyrical.beta_matrix(self.returns, self.factor_returns)
+
+        result = empyrical.beta_matrix(self.returns['a'], self.factor_returns)
+        self.assertIsInstance(result, pd.Series)
+        assert_allclose(result, expected.loc['a'])
+
+        result = empyrical.beta_matrix(
+            self.returns.values,
+            self.factor_returns.values[:, 0],
+        )
+        self.assertEqual(result.shape, (5,))
+        assert_allclose(result, expected['csi300'])
+
+        result = empyrical.beta_matrix(
+            self.returns.values[:, 0],
+            self.factor_returns.values[:, 0],
+        )
+        assert_allclose(result, expected.iloc[0, 0])
+
+    def test_flat_factor(self):
+        factor_returns = np.full(len(self.returns), 0.001)
+        beta = empyrical.beta_matrix(self.returns.values, factor_returns)
+        correlation = empyrical.correlation_matrix(
+            self.returns.values,
+            factor_returns,
+        )
+        self.assertTrue(np.isnan(beta).all())
+        self.assertTrue(np.isnan(correlation).all())
+
+
+class TestPeriodStats(BaseTestCase):
+    """
+    Tests for the statistics of every calendar period.
+    """
+    index = pd.bdate_range('2015-01-01', periods=1000, tz='UTC')
+    returns = pd.DataFrame(
+        rand.normal(0.0005, 0.015, (1000, 3)),
+        index=index,
+        columns=['a', 'b', 'c'],
+    )
+    returns.iloc[[3, 9], 1] = np.nan
+    returns.iloc[:30, 2] = np.nan
+
+    kwargs = {
+        'sharpe_ratio': dict(risk_free=0.0001),
+        'sortino_ratio': dict(required_return=0.0002),
+        'downside_risk': dict(required_return=0.0002),
+    }
+
+    @parameterized.expand([
+        ('year', 'A'),
+        ('quarter', 'Q'),
+        ('month', 'M'),
+        ('week', 'W'),
+        (empyrical.MONTHLY, 'M'),
+    ])
+    def test_period_stats(self, by, freq):
+        names = list(empyrical.stats.PERIOD_STATS)
+        result = empyrical.period_stats(
+            self.returns,
+            by=by,
+            stats=names,
+            risk_free=0.0001,
+            required_return=0.0002,
+        )
+        groups = self.returns.groupby(
+            self.index.tz_localize(None).to_period(freq),
+        )
+
+        assert_index_equal(result.index, pd.PeriodIndex(list(groups.groups)))
+        for name in names:
+            function = getattr(empyrical, name)
+            for column in self.returns:
+                expected = groups[column].apply(
+                    lambda x: function(x.values, **self.kwargs.get(name, {}))
+                )
+                assert_allclose(
+                    result[name, column],
+                    expected.astype('float64'),
+                    rtol=1e-9,
+                    atol=1e-12,
+                    err_msg=name,
+                )
+
+    def test_series(self):
+        returns = self.returns['a']
+        result = empyrical.period_stats(returns, by='month')
+
+        self.assertEqual(
+            list(result.columns),
+            ['annual_return', 'annual_volatility', 'sharpe_ratio',
+             'max_drawdown'],
+        )
+        assert_allclose(
+            result,
+            empyrical.period_stats(self.returns, by='month').xs(
+                'a', axis=1, level=1,
+            ),
+        )
+
+    def test_total_loss(self):
+        returns = self.returns.iloc[:60].copy()
+        returns.iloc[30, 0] = -1.0
+        returns.iloc[40, 1] = -1.5
+        result = empyrical.period_stats(
+            returns, by='month', stats=['max_drawdown', 'calmar_ratio'],
+        )
+        groups = returns.groupby(
+            returns.index.tz_localize(None).to_period('M'),
+        )
+        for name in ('max_drawdown', 'calmar_ratio'):
+            function = getattr(empyrical, name)
+            for column in returns:
+                assert_allclose(
+                    result[name, column],
+                    groups[column].apply(lambda x: function(x.values)),
+                    rtol=1e-9,
+                    err_msg=name,
+                )
+
+    def test_unsorted_index(self):
+        shuffled = self.returns.iloc[rand.permutation(len(self.returns))]
+        assert_allclose(
+            empyrical.period_stats(shuffled, by='quarter'),
+            empyrical.period_stats(self.returns, by='quarter'),
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            empyrical.period_stats(self.returns, by='decade')
+        with self.assertRaises(ValueError):
+            empyrical.period_stats(self.returns, stats=['omega_ratio'])
+        with self.assertRaises(ValueError):
+            empyrical.period_stats(self.returns.reset_index(drop=True))
+
+
+class TestTrailingReturns(BaseTestCase):
+    """
+    Tests for the cumulative returns over trailing horizons.
+    """
+    index = pd.bdate_range('2015-01-01', periods=1500, tz='UTC')
+    returns = pd.DataFrame(
+        rand.normal(0.0005, 0.015, (1500, 3)),
+        index=index,
+        columns=['a', 'b', 'c'],
+    )
+    returns.iloc[[3, 9], 1] = np.nan
+
+    def expected(self, as_of, horizons):
+        as_of = pd.Timestamp(as_of)
+        returns = self.returns[:as_of]
+        starts = {
+            'WTD': as_of.normalize() - pd.Timedelta(days=as_of.weekday()),
+            'MTD': as_of.normalize().replace(day=1),
+            'QTD': as_of.normalize().replace(
+                month=(as_of.month - 1) // 3 * 3 + 1, day=1,
+            ),
+            'YTD': as_of.normalize().replace(month=1, day=1),
+        }
+        result = {}
+        for horizon in horizons:
+            if horizon == 'ITD':
+                window = returns
+            elif horizon in starts:
+                window = returns[returns.index >= starts[horizon]]
+            else:
+                offset = empyrical.utils.window_offset(horizon)
+                window = returns[returns.index > as_of - offset]
+            result[horizon] = empyrical.cum_returns_final(window)
+        return pd.DataFrame(result).T
+
+    @parameterized.expand([
+        ('last', None),
+        ('month_end', '2016-06-30'),
+        ('weekend', '2017-03-05'),
+    ])
+    def test_trailing_returns(self, _, as_of):
+        horizons = list(empyrical.stats.TRAILING_HORIZONS) + ['WTD', '90D']
+        result = empyrical.trailing_returns(
+            self.returns,
+            horizons=horizons,
+            as_of=as_of,
+        )
+        expected = self.expected(
+            self.index[-1] if as_of is None
+            else pd.Timestamp(as_of, tz='UTC'),
+            horizons,
+        )
+
+        self.assertEqual(list(result.index), horizons)
+        assert_allclose(result, expected, rtol=1e-10)
+
+    def test_series(self):
+        result = empyrical.trailing_returns(self.returns['a'], ['YTD', '1Y'])
+        expected = empyrical.trailing_returns(self.returns, ['YTD', '1Y'])
+        self.assertIsInstance(result, pd.Series)
+        assert_allclose(result, expected['a'])
+
+    def test_wiped_out(self):
+        returns = self.returns.copy()
+        returns.iloc[-5, 0] = -1
+        result = empyrical.trailing_returns(returns, ['1M', 'ITD'])
+        assert_allclose(result['a'], [-1, -1])
+        assert_allclose(
+            result[['b', 'c']],
+            empyrical.trailing_returns(self.returns, ['1M', 'ITD'])[
+                ['b', 'c']
+            ],
+        )
+
+    def test_wiped_out_before_horizon(self):
+        index = pd.bdate_range('2015-01-01', periods=80)
+        returns = pd.Series(0.01, index=index)
+        returns.iloc[5] = -1
+        horizons = ['MTD', 'QTD', '1M', '3M', 'ITD']
+        result = empyrical.trailing_returns(returns, horizons)
+        expected = [
+            empyrical.cum_returns_final(
+                returns[empyrical.stats._horizon_start(
+                    index, index[-1], horizon,
+                ):],
+            )
+            for horizon in horizons
+        ]
+        self.assertFalse(result.isnull().any())
+        assert_allclose(result, expected, rtol=1e-10)
+        self.assertEqual(result['ITD'], -1)
+
+    def test_invalid_index(self):
+        with self.assertRaises(ValueError):
+            empyrical.trailing_returns(self.returns.reset_index(drop=True))
+
+
+class TestDrawdownPeriods(BaseTestCase):
+    """
+    Tests for the drawdown episodes and the underwater curve.
+    """
+    returns = rand.normal(0.0005, 0.015, (500, 3))
+    returns[[3, 9], 1] = np.nan
+    returns[:, 2] = np.abs(returns[:, 2])
+
+    @staticmethod
+    def expected_periods(returns):
+        wealth = np.r_[1, np.cumprod(1 + np.nan_to_num(returns))]
+        drawdown = wealth / np.maximum.accumulate(wealth) - 1
+        periods = []
+        i = 1
+        while i < len(wealth):
+            if drawdown[i] < 0:
+                start = i
+                while i < len(wealth) and drawdown[i] < 0:
+                    i += 1
+                valley = start + np.argmin(drawdown[start:i])
+                recovered = i < len(wealth)
+                periods.append((
+                    start - 2,
+                    valley - 1,
+                    i - 1 if recovered else -1,
+                    drawdown[valley],
+                    i - start,
+                ))
+            else:
+                i += 1
+        return sorted(periods, key=lambda period: period[3])
+
+    def test_drawdown_periods(self):
+        periods = empyrical.drawdown_periods(self.returns)
+        for column in range(self.returns.shape[1]):
+            result = periods[periods['column'] == column]
+            expected = self.expected_periods(self.returns[:, column])
+            assert_array_equal(len(result), len(expected))
+            for row, period in zip(result, expected):
+                assert_array_equal(
+                    (row['peak'], row['valley'], row['recovery'],
+                     row['duration']),
+                    period[:3] + period[4:],
+                )
+                assert_almost_equal(row['depth'], period[3], DECIMAL_PLACES)
+
+    def test_duration(self):
+        # Below the peak at 1 and 2, back above it at 3, then below it
+        # again through the last period without recovering.
+        returns = np.array([0.1, -0.1, 0.05, 0.2, -0.05, -0.05])
+        periods = empyrical.drawdown_periods(returns)
+        assert_array_equal(periods['peak'], [0, 3])
+        assert_array_equal(periods['valley'], [1, 5])
+        assert_array_equal(periods['recovery'], [3, -1])
+        assert_array_equal(periods['duration'], [2, 2])
+        assert_almost_equal(periods['depth'], [-0.1, 0.95 ** 2 - 1])
+
+    def test_top(self):
+        periods = empyrical.drawdown_periods(self.returns)
+        top = empyrical.drawdown_periods(self.returns, top=2)
+        assert_array_equal(np.bincount(top['column']), [2, 2])
+        assert_array_equal(top['depth'][::2], periods['depth'][
+            np.searchsorted(periods['column'], [0, 1])
+        ])
+        assert_almost_equal(
+            top['depth'][::2],
+            empyrical.max_drawdown(self.returns)[:2],
+            DECIMAL_PLACES,
+        )
+
+    def test_pandas(self):
+        index = pd.bdate_range('2015-01-01', periods=500)
+        returns = pd.DataFrame(self.returns, index=index, columns=list('abc'))
+        periods = empyrical.drawdown_periods(returns, top=3)
+        expected = empyrical.drawdown_periods(self.returns, top=3)
+        assert_array_equal(list(periods['column']), ['a'] * 3 + ['b'] * 3)
+        for field in ('peak', 'valley', 'recovery'):
+            positions = expected[field]
+            assert_array_equal(periods[field].isnull().values, positions < 0)
+            assert_array_equal(
+                periods[field][positions >= 0].values,
+                index[positions[positions >= 0]].values,
+            )
+
+        series = empyrical.drawdown_periods(returns['a'], top=3)
+        self.assertEqual(
+            series.columns.tolist(),
+            ['peak', 'valley', 'recovery', 'depth', 'duration'],
+        )
+        assert_almost_equal(series['depth'].values, expected['depth'][:3])
+
+    def test_empty(self):
+        self.assertEqual(len(empyrical.drawdown_periods(np.array([]))), 0)
+        self.assertEqual(
+            len(empyrical.drawdown_periods(self.returns[:, 2])), 0,
+        )
+
+    def test_drawdown_series(self):
+        index = pd.bdate_range('2015-01-01', periods=500)
+        returns = pd.Series(self.returns[:, 0], index=index)
+        drawdown = empyrical.drawdown_series(returns)
+        cumulative = empyrical.cum_returns(returns, starting_value=100)
+        expected = cumulative / np.maximum(cumulative.cummax(), 100) - 1
+        assert_almost_equal(drawdown.values, expected.values, DECIMAL_PLACES)
+        assert drawdown.index.equals(index)
+        assert_almost_equal(
+            np.nanmin(empyrical.drawdown_series(self.returns), axis=0),
+            empyrical.max_drawdown(self.returns),
+            DECIMAL_PLACES,
+        )
+
+
+class TestBootstrap(BaseTestCase):
+    """
+    Tests for the bootstrap distribution of the statistics.
+    """
+    returns = rand.normal(0.0005, 0.01, (300, 3))
+    factor_returns = rand.normal(0.0004, 0.01, 300)
+
+    def sample_indices(self, n_samples, method, block_size, random_state=0):
+        (seed, _), = empyrical.stats._resample_chunks(
+            random_state, n_samples, 10000,
+        )
+        return empyrical.stats._resample_indices(
+            np.random.RandomState(seed),
+            len(self.returns),
+            len(self.returns),
+            n_samples,
+            method,
+            block_size,
+        )
+
+    @parameterized.expand([
+        ('iid', 'iid', 5),
+        ('block', 'block', 5),
+        ('stationary', 'stationary', 5),
+    ])
+    def test_matches_loop(self, _, method, block_size):
+        samples = empyrical.bootstrap(
+            empyrical.alpha_beta,
+            self.returns,
+            self.factor_returns,
+            n_samples=20,
+            block_size=block_size,
+            method=method,
+            random_state=0,
+        )
+        self.assertEqual(samples.shape, (20, 3, 2))
+
+        indices = self.sample_indices(20, method, block_size)
+        for i in range(20):
+            for column in range(3):
+                assert_almost_equal(
+                    samples[i, column],
+                    empyrical.alpha_beta(
+                        self.returns[indices[:, i], column],
+                        self.factor_returns[indices[:, i]],
+                    ),
+                    DECIMAL_PLACES,
+                )
+
+    def test_blocks(self):
+        block = self.sample_indices(100, 'block', 10)
+        assert_array_equal(
+            np.diff(block, axis=0)[np.arange(299) % 10 != 9],
+            1,
+        )
+        stationary = self.sample_indices(2000, 'stationary', 10)
+        continued = np.diff(stationary, axis=0) % len(self.returns) == 1
+        assert_almost_equal(continued.mean(), 0.9, 2)
+
+    def test_reproducible(self):
+        samples = empyrical.bootstrap(
+            empyrical.sharpe_ratio,
+            self.returns,
+            n_samples=50,
+            random_state=1,
+            chunk_size=7,
+        )
+        threaded = empyrical.bootstrap(
+            empyrical.sharpe_ratio,
+            self.returns,
+            n_samples=50,
+            random_state=1,
+            chunk_size=7,
+            n_jobs=2,
+        )
+        assert_array_equal(samples, threaded)
+
+        single = empyrical.bootstrap(
+            empyrical.sharpe_ratio,
+            self.returns[:, 0],
+            n_samples=50,
+            random_state=1,
+            chunk_size=7,
+        )
+        assert_almost_equal(single, samples[:, 0], DECIMAL_PLACES)
+
+    def test_pandas(self):
+        index = pd.bdate_range('2015-01-01', periods=300)
+        returns = pd.DataFrame(
+            self.returns, index=index, columns=list('abc'),
+        )
+        factor_returns = pd.Series(self.factor_returns, index=index)
+        samples = empyrical.bootstrap(
+            empyrical.beta,
+            returns,
+            factor_returns,
+            n_samples=10,
+            random_state=0,
+        )
+        assert_array_equal(samples.columns, returns.columns)
+        assert_array_equal(
+            samples.values,
+            empyrical.bootstrap(
+                empyrical.beta,
+                self.returns,
+                self.factor_returns,
+                n_samples=10,
+                random_state=0,
+            ),
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            empyrical.bootstrap(
+                empyrical.sharpe_ratio, self.returns, method='jackknife',
+            )
+        with self.assertRaises(ValueError):
+            empyrical.bootstrap(
+                empyrical.sharpe_ratio, self.returns, block_size=0,
+            )
+
+
+class TestProbabilisticSharpeRatio(BaseTestCase):
+    """
+    Tests for the probabilistic and deflated Sharpe ratios.
+    """
+    returns = rand.standard_t(4, (500, 20)) * 0.01 + 0.0005
+    returns[[2, 5], 3] = np.nan
+
+    @staticmethod
+    def expected_psr(returns, benchmark_sharpe):
+        returns = returns[~np.isnan(returns)]
+        sharpe = returns.mean() / returns.std(ddof=1)
+        skew = stats.skew(returns)
+        kurtosis = stats.kurtosis(returns, fisher=False)
+        return stats.norm.cdf(
+            (sharpe - benchmark_sharpe) * np.sqrt(len(returns) - 1) /
+            np.sqrt(1 - skew * sharpe + (kurtosis - 1) / 4 * sharpe ** 2)
+        )
+
+    def test_probabilistic_sharpe_ratio(self):
+        result = empyrical.probabilistic_sharpe_ratio(
+            self.returns, benchmark_sharpe=0.5,
+        )
+        expected = [
+            self.expected_psr(column, 0.5 / np.sqrt(252))
+            for column in self.returns.T
+        ]
+        assert_almost_equal(result, expected, DECIMAL_PLACES)
+        assert_almost_equal(
+            empyrical.probabilistic_sharpe_ratio(
+                self.returns[:, 3], benchmark_sharpe=0.5,
+            ),
+            expected[3],
+            DECIMAL_PLACES,
+        )
+        assert_array_equal(
+            empyrical.probabilistic_sharpe_ratio(self.returns, n_jobs=2),
+            empyrical.probabilistic_sharpe_ratio(self.returns),
+        )
+
+    def test_deflated_sharpe_ratio(self):
+        sharpes = np.array([
+            np.nanmean(column) / np.nanstd(column, ddof=1)
+            for column in self.returns.T
+        ])
+        variance = sharpes.var(ddof=1)
+        n = self.returns.shape[1]
+        expected_max = np.sqrt(variance) * (
+            (1 - np.euler_gamma) * stats.norm.ppf(1 - 1.0 / n) +
+            np.euler_gamma * stats.norm.ppf(1 - 1.0 / (n * np.e))
+        )
+        expected = [
+            self.expected_psr(column, expected_max)
+            for column in self.returns.T
+        ]
+        assert_almost_equal(
+            empyrical.deflated_sharpe_ratio(self.returns),
+            expected,
+            DECIMAL_PLACES,
+        )
+        assert_almost_equal(
+            empyrical.deflated_sharpe_ratio(
+                self.returns[:, 0],
+                n_trials=n,
+                sharpe_variance=variance * 252,
+            ),
+            expected[0],
+            DECIMAL_PLACES,
+        )
+        with self.assertRaises(ValueError):
+            empyrical.deflated_sharpe_ratio(self.returns[:, :1])
+
+    @parameterized.expand([
+        ('probabilistic_sharpe_ratio',),
+        ('deflated_sharpe_ratio',),
+    ])
+    def test_dataframe(self, name):
+        function = getattr(empyrical, name)
+        returns = pd.DataFrame(
+            self.returns,
+            columns=['s{}'.format(i) for i in range(self.returns.shape[1])],
+        )
+        result = function(returns)
+        self.assertIsInstance(result, pd.Series)
+        assert_index_equal(result.index, returns.columns)
+        assert_almost_equal(
+            result.values,
+            function(self.returns),
+            DECIMAL_PLACES,
+        )
+
+    def test_short_returns(self):
+        assert np.isnan(empyrical.probabilistic_sharpe_ratio(np.array([])))
+        assert np.all(np.isnan(
+            empyrical.probabilistic_sharpe_ratio(self.returns[:1]),
+        ))
+
+
+class TestSimulateDrawdowns(BaseTestCase):
+    """
+    Tests for the simulated distribution of the max drawdown.
+    """
+    returns = rand.normal(0.0004, 0.012, (400, 2))
+
+    def test_matches_loop(self):
+        drawdowns = empyrical.simulate_drawdowns(
+            self.returns,
+            60,
+            n_paths=30,
+            method='block',
+            block_size=5,
+            quantiles=None,
+            random_state=1,
+            chunk_size=8,
+        )
+        indices = np.concatenate([
+            empyrical.stats._resample_indices(
+                np.random.RandomState(seed), 400, 60, n_paths, 'block', 5,
+            )
+            for seed, n_paths in empyrical.stats._resample_chunks(1, 30, 8)
+        ], axis=1)
+        expected = [
+            empyrical.max_drawdown(self.returns[path])
+            for path in indices.T
+        ]
+        assert_almost_equal(drawdowns, expected, DECIMAL_PLACES)
+
+    def test_quantiles(self):
+        drawdowns = empyrical.simulate_drawdowns(
+            self.returns[:, 0], 60, n_paths=500, random_state=0,
+            quantiles=None,
+        )
+        assert_almost_equal(
+            empyrical.simulate_drawdowns(
+                self.returns[:, 0], 60, n_paths=500, random_state=0,
+            ),
+            np.quantile(drawdowns, [0.01, 0.05, 0.5]),
+            DECIMAL_PLACES,
+        )
+        assert_almost_equal(
+            empyrical.simulate_drawdowns(
+                self.returns[:, 0], 60, n_paths=500, random_state=0,
+                quantiles=0.05,
+            ),
+            np.quantile(drawdowns, 0.05),
+            DECIMAL_PLACES,
+        )
+
+    def test_executor(self):
+        kwargs = dict(n_paths=100, random_state=3, chunk_size=10)
+        with ThreadPoolExecutor(2) as executor:
+            assert_array_equal(
+                empyrical.simulate_drawdowns(
+                    self.returns, 20, n_jobs=executor, **kwargs
+                ),
+                empyrical.simulate_drawdowns(self.returns, 20, **kwargs),
+            )
+
+    def test_pandas(self):
+        returns = pd.DataFrame(
+            self.returns,
+            index=pd.bdate_range('2015-01-01', periods=400),
+            columns=['a', 'b'],
+        )
+        result = empyrical.simulate_drawdowns(
+            returns, 60, n_paths=100, random_state=0,
+        )
+        assert_array_equal(result.index, [0.01, 0.05, 0.5])
+        assert_array_equal(result.columns, ['a', 'b'])
+        assert_array_equal(
+            result.values,
+            empyrical.simulate_drawdowns(
+                self.returns, 60, n_paths=100, random_state=0,
+            ),
+        )
+
+
+class TestOutAndWorkspace(BaseTestCase):
+    """
+    Tests for the output buffers and workspaces of the statistics.
+    """
+    returns = rand.normal(0.0004, 0.012, (300, 3))
+    factor_returns = rand.normal(0.0004, 0.012, 300)
+
+    @parameterized.expand([
+        ('omega_ratio', {}),
+        ('tail_ratio', {}),
+        ('value_at_risk', {}),
+        ('conditional_value_at_risk', {}),
+        ('stability_of_timeseries', {}),
+        ('annual_return', {}),
+        ('cagr', {}),
+        ('calmar_ratio', {}),
+        ('cum_returns_final', {'starting_value': 100}),
+    ])
+    def test_scalar_out(self, name, kwargs):
+        function = getattr(empyrical, name)
+        returns = pd.Series(self.returns[:, 0])
+        returns[[3, 8]] = np.nan
+        if name in ('value_at_risk', 'conditional_value_at_risk'):
+            returns = returns.dropna()
+        out = np.empty(())
+        workspace = empyrical.raw.Workspace()
+        for _ in range(2):
+            if name == 'stability_of_timeseries':
+                result = function(returns, out=out, **kwargs)
+            else:
+                result = function(returns, out=out, workspace=workspace,
+                                  **kwargs)
+            expected = function(returns, **kwargs)
+            assert_almost_equal(result, expected, DECIMAL_PLACES)
+            assert_almost_equal(out, expected, DECIMAL_PLACES)
+
+    @parameterized.expand([
+        ('capture',),
+        ('up_capture',),
+        ('down_capture',),
+        ('up_down_capture',),
+    ])
+    def test_capture_out(self, name):
+        function = getattr(empyrical, name)
+        out = np.empty(())
+        result = function(
+            self.returns[:, 0],
+            self.factor_returns,
+            out=out,
+            workspace=empyrical.raw.Workspace(),
+        )
+        expected = function(self.returns[:, 0], self.factor_returns)
+        assert_almost_equal(result, expected, DECIMAL_PLACES)
+        assert_almost_equal(out, expected, DECIMAL_PLACES)
+
+    @parameterized.expand([
+        ('up_alpha_beta',),
+        ('down_alpha_beta',),
+    ])
+    def test_alpha_beta_out(self, name):
+        function = getattr(empyrical, name)
+        out = np.empty(2)
+        result = function(
+            self.returns[:, 0],
+            self.factor_returns,
+            0.0001,
+            out=out,
+            workspace=empyrical.raw.Workspace(),
+        )
+        self.assertIs(result, out)
+        assert_almost_equal(
+            out,
+            function(self.returns[:, 0], self.factor_returns,
+                     risk_free=0.0001),
+            DECIMAL_PLACES,
+        )
+
+    @parameterized.expand([
+        ('annual_return',),
+        ('calmar_ratio',),
+        ('cum_returns_final',),
+        ('value_at_risk',),
+        ('conditional_value_at_risk',),
+    ])
+    def test_columns(self, name):
+        function = getattr(empyrical, name)
+        returns = pd.DataFrame(self.returns, columns=['a', 'b', 'c'])
+        result = function(returns)
+        self.assertIsInstance(result, pd.Series)
+        assert_array_equal(result.index, returns.columns)
+        assert_almost_equal(
+            result.values,
+            [function(returns[column]) for column in returns],
+            DECIMAL_PLACES,
+        )
+
+    @parameterized.expand([
+        ('value_at_risk',),
+        ('conditional_value_at_risk',),
+    ])
+    def test_ndarray_columns(self, name):
+        function = getattr(empyrical, name)
+        returns = self.returns[:100]
+        expected = [function(column) for column in returns.T]
+        assert_almost_equal(function(returns), expected, DECIMAL_PLACES)
+
+        out = np.empty(3)
+        result = function(returns, out=out,
+                          workspace=empyrical.raw.Workspace())
+        self.assertIs(result, out)
+        assert_almost_equal(out, expected, DECIMAL_PLACES)
+
+    def test_roll_cagr(self):
+        result = empyrical.stats.roll_cagr(self.returns[:, 0], window=50)
+        assert_almost_equal(
+            result,
+            [
+                empyrical.cagr(self.returns[i - 50:i, 0])
+                for i in range(50, 301)
+            ],
+            DECIMAL_PLACES,
+        )
+
+    @parameterized.expand([
+        ('omega_ratio', False),
+        ('tail_ratio', False),
+        ('value_at_risk', False),
+        ('conditional_value_at_risk', False),
+        ('capture', True),
+        ('up_capture', True),
+        ('down_capture', True),
+        ('up_down_capture', True),
+    ])
+    def test_workspace_allocations(self, name, factor):
+        returns = np.tile(self.returns, (7, 60))
+        args = (returns, np.tile(self.factor_returns, 7)) if factor else (
+            returns.ravel() if name != 'omega_ratio' else returns,
+        )
+        function = getattr(empyrical, name)
+        workspace = empyrical.raw.Workspace()
+        out = np.empty(np.shape(function(*args)))
+
+        function(*args, out=out, workspace=workspace)
+        tracemalloc.start()
+        try:
+            function(*args, out=out, workspace=workspace)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Only temporaries the size of the benchmark or a column remain.
+        self.assertLess(peak, returns.nbytes // 10)
+
+    def test_workspace_not_cached(self):
+        workspace = empyrical.raw.Workspace()
+        with empyrical.cache() as results:
+            empyrical.sharpe_ratio(self.returns, workspace=workspace)
+            empyrical.sharpe_ratio(self.returns, workspace=workspace)
+        self.assertEqual(results.info().currsize, 0)
+
+
+class TestInferAnnualization(BaseTestCase):
+    """
+    Tests for the intraday periodicities and the inferred annualization.
+    """
+    days = pd.bdate_range('2019-01-02', periods=30)
+    session = np.concatenate([
+        pd.timedelta_range('09:31:00', '11:30:00', freq='1min'),
+        pd.timedelta_range('13:01:00', '15:00:00', freq='1min'),
+    ]).astype('timedelta64[ns]')
+    minutes = pd.DatetimeIndex(
+        (days.values[:, np.newaxis] + session).ravel(),
+        tz='Asia/Shanghai',
+    )
+
+    @parameterized.expand([
+        ('minutely', 1, empyrical.MINUTELY),
+        ('five_minutely', 5, empyrical.FIVE_MINUTELY),
+        ('hourly', 60, empyrical.HOURLY),
+    ])
+    def test_intraday(self, _, step, period):
+        index = self.minutes[step - 1::step]
+        self.assertEqual(
+            empyrical.utils.infer_annualization(index),
+            empyrical.periods.ANNUALIZATION_FACTORS[period],
+        )
+
+    @parameterized.expand([
+        ('daily', 'B', 252),
+        ('weekly', 'W', 52),
+        ('monthly', 'M', 12),
+        ('quarterly', 'Q', 4),
+        ('yearly', 'A', 1),
+    ])
+    def test_dates(self, _, freq, expected):
+        index = pd.date_range('2000-01-01', periods=40, freq=freq)
+        self.assertEqual(empyrical.utils.infer_annualization(index), expected)
+
+    def test_cached(self):
+        index = pd.DatetimeIndex(self.minutes.values)
+        factor = empyrical.utils.infer_annualization(index)
+        self.assertIn(id(index), empyrical.utils._annualization_cache)
+        self.assertEqual(empyrical.utils.infer_annualization(index), factor)
+
+        key = id(index)
+        del index
+        self.assertNotIn(key, empyrical.utils._annualization_cache)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            empyrical.utils.infer_annualization(pd.RangeIndex(10))
+        with self.assertRaises(ValueError):
+            empyrical.utils.infer_annualization(self.minutes[:1])
+        with self.assertRaises(ValueError):
+            empyrical.sharpe_ratio(
+                rand.normal(0, 0.001, 100),
+                period=empyrical.INFER,
+            )
+
+    def test_stats(self):
+        returns = pd.DataFrame(
+            rand.normal(0.00001, 0.001, (len(self.minutes), 2)),
+            index=self.minutes,
+        )
+        for name in ('sharpe_ratio', 'annual_volatility', 'sortino_ratio'):
+            function = getattr(empyrical, name)
+            assert_almost_equal(
+                np.asarray(function(returns, period=empyrical.INFER)),
+                np.asarray(function(returns, period=empyrical.MINUTELY)),
+                DECIMAL_PLACES,
+            )
+        assert_almost_equal(
+            empyrical.roll_sharpe_ratio(
+                returns[0].values,
+                window=240,
+                annualization=240 * 252,
+            ),
+            empyrical.roll_sharpe_ratio(
+                returns[0],
+                window=240,
+                period=empyrical.INFER,
+            ).values,
+            DECIMAL_PLACES,
+        )
+        assert_almost_equal(
+            empyrical.expanding_annual_return(returns.values,
+                                              period='minutely'),
+            empyrical.expanding_annual_return(returns, period='infer').values,
+            DECIMAL_PLACES,
+        )
+
+    @parameterized.expand([
+        ('roll_up_capture',),
+        ('roll_down_capture',),
+        ('roll_up_down_capture',),
+    ])
+    def test_roll_captures(self, name):
+        # Every window spans a fraction of a session, which on its own would
+        # infer fewer periods per year than the whole index.
+        index = self.minutes[:2400]
+        returns = pd.Series(rand.normal(0.00001, 0.001, 2400), index=index)
+        factor_returns = pd.Series(
+            rand.normal(0.00001, 0.001, 2400),
+            index=index,
+        )
+        function = getattr(empyrical, name)
+        assert_almost_equal(
+            function(returns, factor_returns, window=50,
+                     period=empyrical.INFER).values,
+            function(returns, factor_returns, window=50,
+                     period=empyrical.MINUTELY).values,
+            DECIMAL_PLACES,
+        )
+
+    def test_bootstrap(self):
+        returns = pd.Series(
+            rand.normal(0.00001, 0.001, len(self.minutes)),
+            index=self.minutes,
+        )
+        assert_almost_equal(
+            empyrical.bootstrap(empyrical.sharpe_ratio, returns,
+                                n_samples=20, random_state=1,
+                                period=empyrical.INFER),
+            empyrical.bootstrap(empyrical.sharpe_ratio, returns,
+                                n_samples=20, random_state=1,
+                                period=empyrical.MINUTELY),
+            DECIMAL_PLACES,
+        )
+
+
+class TestResampleReturns(BaseTestCase):
+    """
+    Tests for compounding returns into calendar periods.
+    """
+    index = pd.date_range(
+        '2019-12-30 09:30', periods=20000, freq='17min', tz='Asia/Shanghai',
+    )
+    returns = pd.DataFrame(
+        rand.normal(0, 0.001, (len(index), 3)),
+        index=index,
+        columns=['a', 'b', 'c'],
+    )
+    returns.iloc[[3, 500], 1] = np.nan
+    returns.iloc[40, 2] = -1.5
+
+    @parameterized.expand([
+        (empyrical.DAILY, 'D'),
+        (empyrical.WEEKLY, 'W'),
+        ('month', 'M'),
+        (empyrical.QUARTERLY, 'Q'),
+        ('year', 'A'),
+    ])
+    def test_resample_returns(self, to, freq):
+        grouped = self.returns.groupby(
+            self.index.tz_localize(None).to_period(freq),
+        )
+        expected = grouped.apply(lambda x: (1 + x.fillna(0)).prod() - 1)
+        last = grouped.apply(lambda x: x.index[-1])
+
+        result = empyrical.resample_returns(self.returns, to)
+        assert_almost_equal(result.values, expected.values, 10)
+        assert_index_equal(result.index, pd.DatetimeIndex(list(last)))
+        assert_index_equal(result.columns, self.returns.columns)
+
+        series = empyrical.resample_returns(self.returns['a'], to)
+        self.assertEqual(series.name, 'a')
+        assert_almost_equal(series.values, expected['a'].values, 10)
+
+        array = empyrical.resample_returns(
+            self.returns.values, to, index=self.index,
+        )
+        assert_almost_equal(array, expected.values, 10)
+
+    def test_unsorted(self):
+        shuffled = self.returns.sample(frac=1, random_state=0)
+        assert_almost_equal(
+            empyrical.resample_returns(shuffled, empyrical.DAILY).values,
+            empyrical.resample_returns(self.returns, empyrical.DAILY).values,
+            10,
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            empyrical.resample_returns(self.returns, 'hourly')
+        with self.assertRaises(ValueError):
+            empyrical.resample_returns(self.returns.values)
+        with self.assertRaises(ValueError):
+            empyrical.resample_returns(
+                self.returns.values, index=self.index[1:],
+            )
+
+
+class TestPriceReturns(BaseTestCase):
+    """
+    Tests for the returns of DataFrames of prices.
+    """
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rand.normal(0, 0.01, (100, 3)), axis=0),
+        index=pd.date_range('2000-01-03', periods=100),
+        columns=['a', 'b', 'c'],
+    )
+
+    def test_simple_returns(self):
+        assert_frame_equal(
+            empyrical.simple_returns(self.prices),
+            self.prices.pct_change().iloc[1:],
+        )
+
+    def test_missing_prices(self):
+        prices = self.prices.copy()
+        prices.iloc[[3, 4], 0] = np.nan
+        # Missing prices are padded, like by pct_change.
+        assert_frame_equal(
+            empyrical.simple_returns(prices),
+            prices.pct_change().iloc[1:],
+        )
+
+    def test_log_returns(self):
+        assert_frame_equal(
+            empyrical.log_returns(self.prices),
+            np.log(self.prices / self.prices.shift(1)).iloc[1:],
+        )
+
+    def test_cum_log_returns(self):
+        returns = empyrical.simple_returns(self.prices)
+        assert_frame_equal(
+            empyrical.cum_log_returns(returns),
+            np.log(self.prices.iloc[1:] / self.prices.iloc[0]),
+        )
+
+
+class TestOmegaRatio(BaseTestCase):
+    """
+    Tests for the Omega ratio of panels and its rolling windows.
+    """
+    returns = rand.normal(0.0005, 0.01, (300, 3))
+    returns[[4, 90], 1] = np.nan
+    risk_free = rand.uniform(0, 0.0001, 300)
+
+    def test_columns(self):
+        result = empyrical.omega_ratio(self.returns, risk_free=self.risk_free)
+        assert_almost_equal(
+            result,
+            [
+                empyrical.omega_ratio(column, risk_free=self.risk_free)
+                for column in self.returns.T
+            ],
+            DECIMAL_PLACES,
+        )
+        series = empyrical.omega_ratio(pd.DataFrame(self.returns))
+        self.assertIsInstance(series, pd.Series)
+        self.assertEqual(len(series), 3)
+
+    def test_time_varying_risk_free(self):
+        returns = self.returns[:, 0]
+        assert_almost_equal(
+            empyrical.omega_ratio(returns, risk_free=self.risk_free),
+            empyrical.omega_ratio(returns - self.risk_free),
+            DECIMAL_PLACES,
+        )
+
+    @parameterized.expand([
+        ('constant', 0.0, 0.1),
+        ('time_varying', risk_free, 0.0),
+    ])
+    def test_roll_omega_ratio(self, _, risk_free, required_return):
+        window = 40
+        result = empyrical.roll_omega_ratio(
+            self.returns,
+            window,
+            risk_free=risk_free,
+            required_return=required_return,
+        )
+        expected = [
+            empyrical.omega_ratio(
+                self.returns[i:i + window],
+                risk_free=np.asarray(risk_free)[i:i + window]
+                if np.ndim(risk_free) else risk_free,
+                required_return=required_return,
+            )
+            for i in range(len(self.returns) - window + 1)
+        ]
+        assert_almost_equal(result, expected, DECIMAL_PLACES)
+
+    def test_roll_omega_ratio_series(self):
+        returns = pd.Series(
+            self.returns[:, 0],
+            index=pd.date_range('2000-01-03', periods=300),
+        )
+        result = empyrical.roll_omega_ratio(returns, 40)
+        assert_index_equal(result.index, returns.index[39:])
+
+        windows = empyrical.roll_omega_ratio(returns, [20, 40])
+        assert_almost_equal(windows[40].values[20:], result.values, 10)
+
+    def test_roll_omega_ratio_no_losses(self):
+        result = empyrical.roll_omega_ratio(np.abs(self.returns[:, 0]), 10)
+        self.assertTrue(np.isnan(result).all())
+
+
+class TestUpDownStats(BaseTestCase):
+    """
+    Tests for the statistics of the up and down periods of a benchmark.
+    """
+    returns = rand.normal(0.0005, 0.01, (400, 3))
+    returns[[3, 50], 1] = np.nan
+    factor_returns = rand.normal(0.0004, 0.01, 400)
+    factor_returns[[7, 8]] = np.nan
+
+    def expected(self, returns):
+        up = self.factor_returns > 0
+        down = self.factor_returns < 0
+        up_capture = empyrical.capture(returns[up], self.factor_returns[up])
+        down_capture = empyrical.capture(
+            returns[down], self.factor_returns[down],
+        )
+        hit_rates = []
+        for mask in (up, down):
+            valid = mask & ~np.isnan(returns)
+            hit_rates.append(
+                np.mean(returns[valid] > self.factor_returns[valid]),
+            )
+        return np.r_[
+            up_capture,
+            down_capture,
+            up_capture / down_capture,
+            empyrical.alpha_beta_aligned(
+                returns[up], self.factor_returns[up], risk_free=0.0001,
+            ),
+            empyrical.alpha_beta_aligned(
+                returns[down], self.factor_returns[down], risk_free=0.0001,
+            ),
+            hit_rates,
+        ]
+
+    def test_up_down_stats(self):
+        result = empyrical.up_down_stats(
+            pd.DataFrame(self.returns, columns=['a', 'b', 'c']),
+            self.factor_returns,
+            risk_free=0.0001,
+        )
+        self.assertEqual(list(result.index), ['a', 'b', 'c'])
+        self.assertEqual(tuple(result.columns), empyrical.stats.UP_DOWN_STATS)
+        for values, column in zip(result.values, self.returns.T):
+            assert_almost_equal(values, self.expected(column), 10)
+
+        series = empyrical.up_down_stats(
+            self.returns[:, 1], self.factor_returns, risk_free=0.0001,
+        )
+        assert_almost_equal(series.values, self.expected(self.returns[:, 1]),
+                            10)
+
+    @parameterized.expand([
+        ('up_capture', 0),
+        ('down_capture', 1),
+        ('up_down_capture', 2),
+    ])
+    def test_captures(self, name, position):
+        result = getattr(empyrical, name)(self.returns, self.factor_returns)
+        assert_almost_equal(
+            result,
+            [self.expected(column)[position] for column in self.returns.T],
+            10,
+        )
+
+    def test_total_loss(self):
+        returns = self.returns[:, 0].copy()
+        returns[np.flatnonzero(self.factor_returns < 0)[0]] = -1
+        down = self.factor_returns < 0
+        assert_almost_equal(
+            empyrical.down_capture(returns, self.factor_returns),
+            empyrical.capture(returns[down], self.factor_returns[down]),
+            10,
+        )
+
+    @parameterized.expand([
+        ('up_capture', 0),
+        ('down_capture', 1),
+        ('up_down_capture', 2),
+    ])
+    def test_unaligned_factor(self, name, position):
+        index = pd.date_range('2000-01-03', periods=500, freq='B')
+        returns = pd.Series(self.returns[:, 0], index=index[50:450])
+        factor_returns = pd.Series(
+            rand.normal(0.0004, 0.01, 500),
+            index=index,
+        )
+        expected = self.expected(returns.values)
+        function = getattr(empyrical, name)
+
+        # A benchmark over a longer range, and in another order.
+        factor_returns.iloc[50:450] = self.factor_returns
+        for factor in (factor_returns, factor_returns.sample(frac=1.0)):
+            assert_almost_equal(
+                function(returns, factor), expected[position], 10,
+            )
+            assert_almost_equal(
+                empyrical.up_down_stats(returns, factor).iloc[position],
+                expected[position],
+                10,
+            )
+
+    def test_empty_regime(self):
+        result = empyrical.up_down_stats(
+            self.returns[:, 0], np.abs(self.factor_returns),
+        )
+        self.assertTrue(np.isnan(
+            result[['down_capture', 'down_alpha', 'down_beta']],
+        ).all())
+
+
 class ReturnTypeEmpyricalProxy(object):
     """
     A wrapper around the empyrical module which, on each function call, asserts
@@ -12,12 +12,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from datetime import datetime
-from functools import wraps
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial, wraps
+from multiprocessing import cpu_count
 from os import makedirs, environ
 from os.path import expanduser, join, getmtime, isdir
 import errno
+import re
 import warnings
+import weakref
 
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
@@ -31,6 +35,15 @@ from pandas.tseries.offsets import BDay
 #            "has been deprecated and will be removed in a later version.")
 #     warnings.warn(msg)
 from .deprecate import deprecated
+from .periods import (
+    ANNUALIZATION_FACTORS,
+    APPROX_BDAYS_PER_YEAR,
+    DAILY,
+    MONTHLY,
+    QUARTERLY,
+    WEEKLY,
+    YEARLY,
+)
 
 DATAREADER_DEPRECATION_WARNING = \
         ("Yahoo and Google Finance have suffered large API breaks with no "
@@ -88,8 +101,10 @@ def roll(*args, **kwargs):
         Benchmark return to compare returns against.
     function:
         the function to run for each rolling window.
-    window (keyword): int
-        the number of periods included in each calculation.
+    window (keyword): int or list of int
+        the number of periods included in each calculation. A list of
+        windows gives one column per window, see
+        :func:`~empyrical.stats.roll_sharpe_ratio`.
     (other keywords): other keywords that are required to be passed to the
         function in the 'function' argument may also be passed in.
 
@@ -98,7 +113,7 @@ def roll(*args, **kwargs):
     np.ndarray, pd.Series
         depends on input type
         ndarray(s) ==> ndarray
-        Series(s) ==> pd.Series
+        Series(s) ==> pd.Series, or pd.DataFrame for a list of windows
 
         A Series or ndarray of the results of the stat across the rolling
         window.
@@ -113,6 +128,8 @@ def roll(*args, **kwargs):
         if not isinstance(args[0], type(args[1])):
             raise ValueError("The two returns arguments are not the same.")
 
+    if isinstance(window, (list, tuple, np.ndarray, pd.Index)):
+        return _roll_windows(func, window, *args, **kwargs)
     if isinstance(args[0], np.ndarray):
         return _roll_ndarray(func, window, *args, **kwargs)
     return _roll_pandas(func, window, *args, **kwargs)
@@ -178,6 +195,27 @@ def _roll_ndarray(func, window, *args, **kwargs):
     return np.array(data)
 
 
+def _roll_windows(func, windows, *args, **kwargs):
+    """Roll over every window of ``windows``, one column per window. The
+    rows start at the end of the shortest window, and the rows before the
+    end of a longer window are NaN.
+    """
+    windows = list(windows)
+    n = len(args[0])
+    n_rows = max(n - min(windows) + 1, 0)
+    out = np.full((n_rows, len(windows)), np.nan)
+    for i, window in enumerate(windows):
+        if isinstance(args[0], np.ndarray):
+            result = _roll_ndarray(func, window, *args, **kwargs)
+        else:
+            result = _roll_pandas(func, window, *args, **kwargs)
+        if len(result):
+            out[n_rows - len(result):, i] = result
+    if isinstance(args[0], np.ndarray):
+        return out
+    return pd.DataFrame(out, index=args[0].index[n - n_rows:], columns=windows)
+
+
 def _roll_pandas(func, window, *args, **kwargs):
     data = {}
     index_values = []
@@ -189,6 +227,120 @@ def _roll_pandas(func, window, *args, **kwargs):
     return pd.Series(data, index=type(args[0].index)(index_values))
 
 
+# Smallest number of columns handed to a single task. Narrower blocks spend
+# more time in dispatch than in the reductions themselves and share cache
+# lines between workers.
+MIN_COLUMN_CHUNK = 16
+
+
+def _effective_n_jobs(n_jobs):
+    if isinstance(n_jobs, Executor):
+        return getattr(n_jobs, '_max_workers', None) or cpu_count()
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(cpu_count() + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def map_chunks(function, chunks, n_jobs=1):
+    """
+    Apply ``function`` to every item of ``chunks``, possibly concurrently.
+
+    Parameters
+    ----------
+    function : callable
+        The function to apply. It must be picklable when ``n_jobs`` is a
+        process based executor.
+    chunks : iterable
+        The arguments to call ``function`` with, one call per item.
+    n_jobs : int or concurrent.futures.Executor, optional
+        Number of worker threads to use. ``1`` evaluates serially in the
+        calling thread and negative values count back from the number of
+        cores, so ``-1`` uses all of them. An existing executor, e.g. a
+        ``ProcessPoolExecutor``, may be passed instead and is left running.
+
+    Returns
+    -------
+    results : list
+        The results of ``function`` in the order of ``chunks``.
+    """
+    if isinstance(n_jobs, Executor):
+        return list(n_jobs.map(function, chunks))
+
+    n_jobs = _effective_n_jobs(n_jobs)
+    if n_jobs == 1:
+        return [function(chunk) for chunk in chunks]
+
+    with ThreadPoolExecutor(n_jobs) as executor:
+        return list(executor.map(function, chunks))
+
+
+def _evaluate_column_chunk(function, arrays, kwargs, columns):
+    n_columns = arrays[0].shape[1]
+    chunk = [
+        a[:, columns] if a.ndim == 2 and a.shape[1] == n_columns else a
+        for a in arrays
+    ]
+    return function(*chunk, **kwargs)
+
+
+def parallel_columns(function, out, n_jobs, *arrays, **kwargs):
+    """
+    Evaluate a column-wise statistic over blocks of columns concurrently.
+
+    The columns of the first array are split into contiguous blocks which
+    are dispatched to ``n_jobs`` workers. Other 2-D arrays with the same
+    number of columns are split alongside it while anything else, e.g. a
+    single benchmark series, is passed whole to every block. The statistics
+    in this package spend their time in numpy and bottleneck reductions
+    which release the GIL, so a thread pool scales with the number of
+    cores.
+
+    Parameters
+    ----------
+    function : callable
+        The statistic to evaluate, e.g. :func:`~empyrical.sharpe_ratio`.
+    out : np.ndarray
+        Preallocated output whose first axis indexes the columns.
+    n_jobs : int or concurrent.futures.Executor
+        See :func:`map_chunks`.
+    *arrays : np.ndarray or pd.DataFrame
+        The positional arguments of ``function``.
+    chunk_size : int, optional
+        Number of columns per block. By default each worker receives about
+        four blocks to balance the load.
+    **kwargs
+        Forwarded to ``function``.
+
+    Returns
+    -------
+    out : np.ndarray
+        The output buffer filled with the statistic of every column.
+    """
+    chunk_size = kwargs.pop('chunk_size', None)
+    arrays = [np.asanyarray(a) for a in arrays]
+    n_columns = arrays[0].shape[1]
+
+    if chunk_size is None:
+        n_workers = _effective_n_jobs(n_jobs)
+        chunk_size = max(-(-n_columns // (4 * n_workers)), MIN_COLUMN_CHUNK)
+
+    blocks = [
+        slice(start, min(start + chunk_size, n_columns))
+        for start in range(0, n_columns, chunk_size)
+    ]
+    results = map_chunks(
+        partial(_evaluate_column_chunk, function, arrays, kwargs),
+        blocks,
+        n_jobs,
+    )
+    for block, result in zip(blocks, results):
+        out[block] = result
+
+    return out
+
+
 @deprecated(msg=DATAREADER_DEPRECATION_WARNING)
 def cache_dir(environ=environ):
     try:
@@ -573,3 +725,172 @@ def rolling_window(array, length, mutable=False):
     out = as_strided(array, new_shape, new_strides)
     out.setflags(write=mutable)
     return out
+
+
+# Calendar spans which have no fixed length, e.g. '6M' or '1Y'.
+_CALENDAR_WINDOW = re.compile(r'^\s*(\d+)\s*(M|Q|Y|A|y)\s*$')
+
+
+def is_time_window(window):
+    """
+    Is ``window`` a time span rather than a number of periods?
+    """
+    return isinstance(
+        window,
+        (str, timedelta, np.timedelta64, pd.DateOffset),
+    )
+
+
+def window_offset(window):
+    """
+    Convert a time-based window into an offset that can be subtracted from a
+    DatetimeIndex.
+
+    Parameters
+    ----------
+    window : str, timedelta or pd.DateOffset
+        The span of the window. Strings with a fixed length are anything
+        understood by ``pd.Timedelta``, e.g. '90D', '4H' or '30min'. Calendar
+        spans are written as a count of months ('6M'), quarters ('2Q') or
+        years ('1Y').
+
+    Returns
+    -------
+    offset : pd.Timedelta or pd.DateOffset
+    """
+    if isinstance(window, pd.DateOffset):
+        return window
+
+    if isinstance(window, str):
+        match = _CALENDAR_WINDOW.match(window)
+        if match is not None:
+            count, unit = int(match.group(1)), match.group(2).upper()
+            if unit == 'M':
+                return pd.DateOffset(months=count)
+            elif unit == 'Q':
+                return pd.DateOffset(months=3 * count)
+            return pd.DateOffset(years=count)
+
+    return pd.Timedelta(window)
+
+
+def _index_i8(index):
+    return np.asarray(index.values, dtype='datetime64[ns]').view('int64')
+
+
+def time_window_starts(index, window):
+    """
+    Locate the first row of the time-based window ending at every row.
+
+    The window ending at ``t`` covers the half-open span ``(t - window, t]``.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        The sorted index of the data.
+    window : str, timedelta or pd.DateOffset
+        The span of the window. See :func:`window_offset`.
+
+    Returns
+    -------
+    starts : np.ndarray[int64]
+        The position of the first row of each window.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError(
+            "Time-based windows require data with a DatetimeIndex, "
+            "got {}".format(type(index).__name__)
+        )
+
+    offset = window_offset(window)
+    stamps = _index_i8(index)
+    if isinstance(offset, pd.DateOffset):
+        lower = _index_i8(index - offset)
+    else:
+        lower = stamps - offset.value
+
+    return np.searchsorted(stamps, lower, side='right')
+
+
+_NS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+# Typical spacing in days of the dates of the periodicities of at most one
+# period per date.
+_PERIOD_SPACINGS = (
+    (DAILY, 1.0),
+    (WEEKLY, 7.0),
+    (MONTHLY, 365.25 / 12),
+    (QUARTERLY, 365.25 / 4),
+    (YEARLY, 365.25),
+)
+# id(index) -> (weak reference to the index, annualization factor)
+_annualization_cache = {}
+
+
+def _infer_annualization(index):
+    if len(index) < 2:
+        raise ValueError(
+            "Cannot infer the annualization from {} dates".format(len(index))
+        )
+    if index.tz is not None:
+        # Sessions are counted by local date.
+        index = index.tz_localize(None)
+    stamps = _index_i8(index)
+    if not index.is_monotonic_increasing:
+        stamps = np.sort(stamps)
+
+    # Number of periods on every date, from one binary search per date.
+    days = np.arange(stamps[0] // _NS_PER_DAY, stamps[-1] // _NS_PER_DAY + 2)
+    per_date = np.diff(np.searchsorted(stamps, days * _NS_PER_DAY))
+    per_session = np.median(per_date[per_date > 0])
+    if per_session > 1:
+        return int(round(per_session)) * APPROX_BDAYS_PER_YEAR
+
+    spacing = np.median(np.diff(stamps)) / _NS_PER_DAY
+    period = min(
+        _PERIOD_SPACINGS,
+        key=lambda item: abs(np.log(max(spacing, 1.0) / item[1])),
+    )[0]
+    return ANNUALIZATION_FACTORS[period]
+
+
+def infer_annualization(index):
+    """
+    Infer the number of periods per year from the dates of the periods.
+
+    Intraday data, with several periods on a date, has the median number of
+    periods per date times ``APPROX_BDAYS_PER_YEAR`` sessions per year, e.g.
+    240 * 252 for the one-minute bars of A-share sessions. Otherwise the
+    median spacing of the dates selects the closest of the daily, weekly,
+    monthly, quarterly and yearly periodicities.
+
+    The factor is cached per index object, so evaluating many statistics of
+    the same returns with ``period='infer'`` scans the index once. The cost
+    of the scan is linear in the number of periods.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        The dates of the returns.
+
+    Returns
+    -------
+    annualization : int
+        The number of periods per year.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError(
+            "Inferring the annualization requires a DatetimeIndex, "
+            "got {}".format(type(index).__name__)
+        )
+
+    key = id(index)
+    cached = _annualization_cache.get(key)
+    if cached is not None and cached[0]() is index:
+        return cached[1]
+
+    factor = _infer_annualization(index)
+    _annualization_cache[key] = (
+        weakref.ref(index, lambda _: _annualization_cache.pop(key, None)),
+        factor,
+    )
+    return factor